@@ -0,0 +1,126 @@
+import threading
+
+from django.conf import settings
+from django.db import connections, transaction, DEFAULT_DB_ALIAS
+from django.db.models import F
+
+
+class TicketNumberAllocator:
+    """
+    Hands out unique support ticket numbers without aggregating the support
+    tickets table.
+
+    Numbers are fetched from the database in blocks of block_size and handed
+    out from memory until the block runs out. With the default block size of
+    1 every ticket number comes straight from the database and numbers stay
+    sequential; larger blocks save a round trip per ticket at the cost of
+    gaps when a worker exits before using up its block.
+    """
+
+    def __init__(self, using=DEFAULT_DB_ALIAS, block_size=1):
+        self.using = using
+        self.block_size = max(int(block_size), 1)
+        self._numbers = []
+        self._lock = threading.Lock()
+
+    @property
+    def connection(self):
+        return connections[self.using]
+
+    def install(self):
+        """Create the database structures used by the allocator."""
+
+    def allocate(self):
+        """Return the next unique ticket number."""
+        with self._lock:
+            if not self._numbers:
+                self._numbers = self.fetch_block(self.block_size)
+            return self._numbers.pop(0)
+
+    def fetch_block(self, size):
+        """Reserve size ticket numbers in the database and return them."""
+        raise NotImplementedError
+
+
+class SequenceTicketNumberAllocator(TicketNumberAllocator):
+    """Ticket number allocator backed by a PostgreSQL sequence."""
+
+    sequence = "techsupport_ticket_number_seq"
+
+    def install(self):
+        from .models import SupportTicket
+
+        table = self.connection.ops.quote_name(SupportTicket._meta.db_table)
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"CREATE SEQUENCE IF NOT EXISTS {self.sequence}")
+            # Move the sequence past tickets numbered before it existed
+            cursor.execute(
+                f"SELECT setval('{self.sequence}', m) FROM "
+                f"(SELECT max(ticket_number) AS m FROM {table}) t "
+                f"WHERE m >= (SELECT last_value FROM {self.sequence})"
+            )
+
+    def fetch_block(self, size):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT nextval('{self.sequence}') FROM generate_series(1, %s)",
+                [size],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+
+class CounterTicketNumberAllocator(TicketNumberAllocator):
+    """
+    Ticket number allocator backed by a row in the TicketNumberCounter table.
+    The row is locked by the increment until the transaction ends, so
+    concurrent allocations are serialised on it.
+    """
+
+    def install(self):
+        from .models import SupportTicket, TicketNumberCounter
+
+        if not TicketNumberCounter.objects.using(self.using).filter(
+            name=TicketNumberCounter.TICKET_NUMBER
+        ).exists():
+            # Start after tickets numbered before the counter existed
+            last_number = (
+                SupportTicket.objects.using(self.using)
+                .order_by("-ticket_number")
+                .values_list("ticket_number", flat=True)
+                .first()
+            )
+            TicketNumberCounter.objects.using(self.using).get_or_create(
+                name=TicketNumberCounter.TICKET_NUMBER,
+                defaults={"value": last_number or 0},
+            )
+
+    def fetch_block(self, size):
+        from .models import TicketNumberCounter
+
+        counters = TicketNumberCounter.objects.using(self.using).filter(
+            name=TicketNumberCounter.TICKET_NUMBER
+        )
+        with transaction.atomic(using=self.using):
+            # Increment first so that the row stays locked while it is read
+            if not counters.update(value=F("value") + size):
+                self.install()
+                counters.update(value=F("value") + size)
+            last_number = counters.values_list("value", flat=True).get()
+        return list(range(last_number - size + 1, last_number + 1))
+
+
+_allocators = {}
+_allocators_lock = threading.Lock()
+
+
+def get_ticket_number_allocator(using=DEFAULT_DB_ALIAS):
+    """Return the per-process ticket number allocator for a database."""
+    with _allocators_lock:
+        if using not in _allocators:
+            block_size = getattr(settings, "TICKET_NUMBER_BLOCK_SIZE", 1)
+            if connections[using].vendor == "postgresql":
+                allocator_class = SequenceTicketNumberAllocator
+            else:
+                allocator_class = CounterTicketNumberAllocator
+            _allocators[using] = allocator_class(using, block_size=block_size)
+        return _allocators[using]
@@ -0,0 +1,86 @@
+# JSON key and field path of each ticket field the API can return
+API_FIELDS = {
+    "id": "id",
+    "ticket_number": "ticket_number",
+    "title": "title",
+    "description": "description",
+    "status": "status",
+    "priority": "priority",
+    "date_submitted": "date_submitted",
+    "date_resolved": "date_resolved",
+    "updated_at": "updated_at",
+    "country": "centre__region__country__name",
+    "region": "centre__region__name",
+    "centre": "centre__name",
+    "category": "category__name",
+    "subcategory": "subcategory__name",
+    "submitted_by": "submitted_by__username",
+    "assigned_to": "assigned_to__username",
+    "resolved_by": "resolved_by__username",
+    "resolution_notes": "resolution_notes",
+}
+
+# Fields returned when the request does not choose any
+DEFAULT_FIELDS = [
+    "id",
+    "ticket_number",
+    "title",
+    "status",
+    "priority",
+    "date_submitted",
+    "centre",
+    "submitted_by",
+]
+
+# The cursor of a page points at the date and id of its first or last ticket
+CURSOR_FIELDS = ["date_submitted", "id"]
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# Separators without spaces keep the responses small
+JSON_DUMPS_PARAMS = {"separators": (",", ":")}
+
+
+class InvalidFields(ValueError):
+    """Raised when the requested fields are not API fields."""
+
+
+def parse_fields(value):
+    """
+    Return the API field names requested in a comma separated list, or the
+    default fields when the list is empty.
+    """
+    if not value:
+        return list(DEFAULT_FIELDS)
+    fields = list(dict.fromkeys(name.strip() for name in value.split(",") if name.strip()))
+    unknown = [name for name in fields if name not in API_FIELDS]
+    if unknown:
+        raise InvalidFields(f"Unknown fields: {', '.join(unknown)}")
+    return fields or list(DEFAULT_FIELDS)
+
+
+def parse_page_size(value):
+    """Return the requested number of tickets per page within the allowed range."""
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        return DEFAULT_PAGE_SIZE
+    return min(max(size, 1), MAX_PAGE_SIZE)
+
+
+def project(tickets, fields):
+    """
+    Return the tickets as named rows holding the requested fields followed by
+    the cursor fields, read straight from the database without creating
+    model instances.
+    """
+    paths = [API_FIELDS[name] for name in fields]
+    paths += [path for path in CURSOR_FIELDS if path not in paths]
+    return tickets.values_list(*paths, named=True)
+
+
+def serialize_rows(rows, fields):
+    """Return a dictionary of the requested fields for each row."""
+    count = len(fields)
+    return [dict(zip(fields, row[:count])) for row in rows]
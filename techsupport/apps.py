@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class TechsupportConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'techsupport'
+
+    def ready(self):
+        # Register the signal handlers
+        from . import signals  # noqa: F401
@@ -0,0 +1,222 @@
+import threading
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from socketserver import StreamRequestHandler, ThreadingTCPServer
+
+from django.utils import timezone
+
+
+def format_summary(summary):
+    """Format a summary of timings in seconds as milliseconds."""
+    return ", ".join(f"{name} {value * 1000:.2f}ms" for name, value in summary.items())
+
+
+class Timer:
+    """Context manager measuring the wall clock time of a block."""
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        self.elapsed = None
+        return self
+
+    def __exit__(self, *exc_info):
+        self.elapsed = time.perf_counter() - self.start
+
+
+class Rollback(Exception):
+    """Raised to roll back the benchmark tickets."""
+
+
+def create_benchmark_tickets(count):
+    """
+    Insert count tickets, with the rows they refer to, for a benchmark, and
+    return their centre. Run it in a transaction that is rolled back.
+    """
+    from .models import Category, Centre, Country, Region, SubCategory, SupportTicket, User
+
+    country = Country.objects.create(name="Benchmark Country", code="BC")
+    region = Region.objects.create(name="Benchmark Region", country=country)
+    centre = Centre.objects.create(name="Benchmark Centre", acronym="BMC", region=region)
+    category = Category.objects.create(name="Benchmark Category", code="BMC")
+    subcategory = SubCategory.objects.create(name="Benchmark Subcategory", category=category)
+    user = User.objects.create(username="benchmark_coach", first_name="Bench", last_name="Mark")
+
+    last_number = (
+        SupportTicket.objects.order_by("-ticket_number")
+        .values_list("ticket_number", flat=True)
+        .first()
+    ) or 0
+    start = timezone.now() - timedelta(days=30)
+    SupportTicket.objects.bulk_create(
+        (
+            SupportTicket(
+                ticket_number=last_number + i,
+                date_submitted=start + timedelta(minutes=i),
+                status=SupportTicket.Status.RESOLVED if i % 3 else SupportTicket.Status.OPEN,
+                centre=centre,
+                submitted_by=user,
+                resolved_by=user if i % 3 else None,
+                assigned_to=user,
+                category=category,
+                subcategory=subcategory,
+                title=f"Benchmark {i}",
+                description="The tablet does not turn on after charging overnight. " * 2,
+                resolution_notes="Replaced the charger and updated Kolibri. " * 2,
+            )
+            for i in range(1, count + 1)
+        ),
+        batch_size=2000,
+    )
+    return centre
+
+
+class StubHTTPServer(ThreadingHTTPServer):
+    """
+    Local HTTP server answering every POST with 200 OK after an optional
+    delay. It counts the requests and connections it receives and the
+    largest number of requests it handled at once.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, delay=0, status=200):
+        super().__init__(("127.0.0.1", 0), StubRequestHandler)
+        self.delay = delay
+        self.status = status
+        self.requests = 0
+        self.connections = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.bodies = []
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/"
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps connections open between requests
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with server.lock:
+            server.requests += 1
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            server.bodies.append(body)
+        try:
+            if server.delay:
+                time.sleep(server.delay)
+            self.send_response(server.status)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+@contextmanager
+def stub_http_server(delay=0, status=200):
+    """Run a StubHTTPServer in a background thread for the duration of the block."""
+    server = StubHTTPServer(delay=delay, status=status)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+class StubSMTPServer(ThreadingTCPServer):
+    """
+    Local SMTP sink accepting every message without authentication. It
+    counts the messages and connections it receives. When drop_after is set,
+    each connection is closed after that many messages.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, drop_after=None):
+        super().__init__(("127.0.0.1", 0), StubSMTPHandler)
+        self.drop_after = drop_after
+        self.messages = []
+        self.connections = 0
+        self.lock = threading.Lock()
+
+    @property
+    def host(self):
+        return self.server_address[0]
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+
+class StubSMTPHandler(StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode("ascii"))
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        received = 0
+        self.reply("220 localhost stub SMTP")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode("ascii", "replace").strip().upper()
+            if command.startswith("EHLO"):
+                self.wfile.write(b"250-localhost\r\n250 8BITMIME\r\n")
+            elif command.startswith(("HELO", "MAIL", "RCPT", "RSET", "NOOP")):
+                self.reply("250 OK")
+            elif command == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                data = []
+                for data_line in self.rfile:
+                    if data_line in (b".\r\n", b".\n"):
+                        break
+                    data.append(data_line)
+                with server.lock:
+                    server.messages.append(b"".join(data))
+                self.reply("250 OK")
+                received += 1
+                if server.drop_after and received >= server.drop_after:
+                    return
+            elif command == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+
+@contextmanager
+def stub_smtp_server(drop_after=None):
+    """Run a StubSMTPServer in a background thread for the duration of the block."""
+    server = StubSMTPServer(drop_after=drop_after)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
@@ -0,0 +1,155 @@
+import hashlib
+import json
+import threading
+import time
+
+from django.core.cache import cache
+
+from . import visibility
+
+# Generation of the support ticket data, bumped whenever a ticket changes
+TICKETS = "tickets"
+
+# Seconds between checks of whether another process bumped a generation
+RECHECK_INTERVAL = 5
+
+# Seconds the dashboard data is kept in the cache. Renamed centres,
+# categories and users show their old names until it expires.
+DASHBOARD_CACHE_TIMEOUT = 5 * 60
+
+
+def _generation_key(name):
+    return f"techsupport:generation:{name}"
+
+
+def _centre_generation_key(centre_id):
+    return _generation_key(f"{TICKETS}:centre:{centre_id}")
+
+
+def get_generation(name):
+    """
+    Return the current generation of a set of data. Cache keys that include
+    the generation are invalidated all at once when it is bumped.
+    """
+    key = _generation_key(name)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, 1, None)
+        generation = cache.get(key, 1)
+    return generation
+
+
+def _bump(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, None)
+
+
+def bump_generation(name):
+    """Invalidate every cache key built on the generation of a set of data."""
+    _bump(_generation_key(name))
+
+
+class GenerationCachedValue:
+    """
+    A value kept in the memory of each process and reloaded by calling
+    loader(generation) after the generation called name is bumped. The
+    generation is checked at most every RECHECK_INTERVAL seconds.
+
+    Processes that do not share the cache never see the generation change,
+    so the value is also reloaded max_age seconds after it was loaded, which
+    bounds how long they keep a stale value.
+    """
+
+    def __init__(self, name, loader, max_age):
+        self.name = name
+        self.loader = loader
+        self.max_age = max_age
+        self._value = None
+        self._loaded = False
+        self._generation = None
+        self._checked_at = 0
+        self._loaded_at = 0
+        self._lock = threading.Lock()
+
+    def get(self):
+        with self._lock:
+            now = time.monotonic()
+            if not self._loaded or now - self._checked_at >= RECHECK_INTERVAL:
+                generation = get_generation(self.name)
+                if generation != self._generation or now - self._loaded_at >= self.max_age:
+                    self._loaded = False
+                    self._generation = generation
+                self._checked_at = now
+
+            if not self._loaded:
+                self._value = self.loader(self._generation)
+                self._loaded = True
+                self._loaded_at = now
+            return self._value
+
+    def clear(self):
+        """Forget the value in this process only."""
+        with self._lock:
+            self._value = None
+            self._loaded = False
+
+    def invalidate(self):
+        """Forget the value in every process."""
+        self.clear()
+        bump_generation(self.name)
+
+
+def bump_ticket_generations(centre_ids):
+    """
+    Invalidate the data cached from the tickets of the given centres, and
+    from the tickets of every centre.
+    """
+    bump_generation(TICKETS)
+    for centre_id in set(centre_ids):
+        if centre_id is not None:
+            _bump(_centre_generation_key(centre_id))
+
+
+def get_scope_version(centre_ids):
+    """
+    Return the version of the ticket data visible in a scope, either
+    ALL_CENTRES or a list of centre ids. It changes whenever a ticket of one
+    of the centres changes, and only then.
+    """
+    if centre_ids == visibility.ALL_CENTRES:
+        return f"{visibility.ALL_CENTRES}:{get_generation(TICKETS)}"
+
+    keys = [_centre_generation_key(centre_id) for centre_id in sorted(map(str, centre_ids))]
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            cache.add(key, 1, None)
+            generations[key] = cache.get(key, 1)
+    return ".".join(str(generations[key]) for key in keys)
+
+
+def get_dashboard_cache_key(centre_ids, params):
+    """
+    Return the cache key of the dashboard data for a visibility scope and
+    the request's filter, search and cursor parameters. Users with the same
+    scope share the key.
+    """
+    key = {
+        "scope": centre_ids if centre_ids == visibility.ALL_CENTRES else sorted(map(str, centre_ids)),
+        "version": get_scope_version(centre_ids),
+        "hierarchy": visibility.get_generation(),
+        "params": sorted(params.lists()),
+    }
+    digest = hashlib.sha256(json.dumps(key, sort_keys=True).encode("utf-8")).hexdigest()
+    return f"techsupport:dashboard:{digest}"
+
+
+def get_ticket_widgets_cache_key():
+    """
+    Return the cache key of the dashboard widgets summing the tickets of every
+    centre, such as the ticket trends. Unlike the rest of the dashboard data,
+    it changes whenever any ticket changes.
+    """
+    return f"techsupport:dashboard:widgets:{get_generation(TICKETS)}"
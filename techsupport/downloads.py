@@ -0,0 +1,61 @@
+import os
+import re
+
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+
+# Size of the blocks a requested byte range is read and sent in
+RANGE_BLOCK_SIZE = 64 * 1024
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _iter_file_range(path, start, length):
+    with open(path, "rb") as f:
+        f.seek(start)
+        while length > 0:
+            block = f.read(min(RANGE_BLOCK_SIZE, length))
+            if not block:
+                break
+            length -= len(block)
+            yield block
+
+
+def ranged_file_response(request, path, content_type, filename, etag=None):
+    """
+    Serve a file as an attachment, honouring a single "Range: bytes=..."
+    request header so that interrupted downloads can be resumed. Requests for
+    several ranges, or with an If-Range that does not match the etag, get the
+    whole file.
+    """
+    size = os.path.getsize(path)
+    match = RANGE_RE.match(request.META.get("HTTP_RANGE", "").strip())
+    if_range = request.META.get("HTTP_IF_RANGE")
+    if match is None or not any(match.groups()) or (if_range and if_range != etag):
+        response = FileResponse(
+            open(path, "rb"), content_type=content_type, as_attachment=True, filename=filename
+        )
+    else:
+        first, last = match.groups()
+        if first:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+        else:
+            # A suffix range asks for the last bytes of the file
+            start = max(size - int(last), 0)
+            end = size - 1
+        if start >= size or start > end:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+
+        response = StreamingHttpResponse(
+            _iter_file_range(path, start, end - start + 1), status=206, content_type=content_type
+        )
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response["Content-Length"] = str(end - start + 1)
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+
+    response["Accept-Ranges"] = "bytes"
+    if etag:
+        response["ETag"] = etag
+    return response
@@ -0,0 +1,107 @@
+import logging
+import smtplib
+import threading
+import time
+
+from django.core.mail import get_connection
+
+logger = logging.getLogger(__name__)
+
+# Errors after which the connection is reopened and the message sent again
+CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+
+
+class EmailDispatcher:
+    """
+    Sends email messages over a persistent mail backend connection.
+
+    The connection from get_connection() is opened on the first message and
+    kept open between batches, so the SMTP/TLS handshake and login are paid
+    once rather than per message. When the server drops the connection it is
+    reopened and the message is sent again.
+    """
+
+    def __init__(self, **connection_kwargs):
+        self.connection_kwargs = connection_kwargs
+        self.connection = None
+        self.sent = 0
+        self.errors = 0
+        self.connections_opened = 0
+        self.sending_time = 0.0
+        self._lock = threading.Lock()
+
+    def open(self):
+        if self.connection is None:
+            connection = get_connection(fail_silently=False, **self.connection_kwargs)
+            connection.open()
+            self.connection = connection
+            self.connections_opened += 1
+        return self.connection
+
+    def close(self):
+        """Close the backend connection; the next message opens a new one."""
+        if self.connection is not None:
+            try:
+                self.connection.close()
+            except (smtplib.SMTPException, OSError) as e:
+                logger.warning(f"Failed to close the email connection cleanly: {e}")
+            self.connection = None
+
+    def _send(self, message):
+        try:
+            self.open().send_messages([message])
+        except CONNECTION_ERRORS as e:
+            logger.warning(f"Email connection dropped, reconnecting: {e}")
+            self.close()
+            self.open().send_messages([message])
+
+    def send_many(self, messages):
+        """
+        Send a batch of EmailMessage objects over the shared connection.
+        Returns the exception raised for each message, or None when it was
+        sent, in the order of the messages.
+        """
+        errors = []
+        with self._lock:
+            start = time.perf_counter()
+            for message in messages:
+                try:
+                    self._send(message)
+                except Exception as e:
+                    errors.append(e)
+                    self.errors += 1
+                    if isinstance(e, CONNECTION_ERRORS):
+                        self.close()
+                else:
+                    errors.append(None)
+                    self.sent += 1
+            self.sending_time += time.perf_counter() - start
+        return errors
+
+    @property
+    def messages_per_second(self):
+        """Return the number of messages sent per second spent sending."""
+        if not self.sending_time:
+            return 0.0
+        return self.sent / self.sending_time
+
+    def stats(self):
+        return {
+            "sent": self.sent,
+            "errors": self.errors,
+            "connections_opened": self.connections_opened,
+            "messages_per_second": self.messages_per_second,
+        }
+
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_email_dispatcher():
+    """Return the per-process email dispatcher for the configured mail backend."""
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = EmailDispatcher()
+        return _dispatcher
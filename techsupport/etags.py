@@ -0,0 +1,90 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+
+from . import caching, reference, visibility
+
+# Generation of the users, bumped whenever a user changes
+USERS = "users"
+
+# Ticket ages are shown to the minute, so dashboard ETags change every minute
+AGE_RESOLUTION = 60
+
+
+def _etag(*parts):
+    return hashlib.sha1(":".join(map(str, parts)).encode("utf-8")).hexdigest()
+
+
+def _page_parts(request):
+    """
+    Return what every rendered page depends on besides its data: the user,
+    their CSRF cookie and the reference data.
+    """
+    return (
+        request.user.pk,
+        request.COOKIES.get(settings.CSRF_COOKIE_NAME, ""),
+        caching.get_generation(reference.REFERENCE_DATA),
+    )
+
+
+def _has_messages(request):
+    # Counting the messages does not mark them as shown
+    return len(get_messages(request)) > 0
+
+
+def dashboard_etag(request):
+    """
+    Return the ETag of the dashboard, made of the cache keys of its data. They
+    change with the user's visibility scope, the tickets in it and the
+    request's parameters, and with the tickets of every centre, which the
+    ticket trends and insights sum.
+    """
+    if _has_messages(request):
+        return None
+    centre_ids = visibility.get_visible_centre_ids(request.user)
+    return _etag(
+        caching.get_dashboard_cache_key(centre_ids, request.GET),
+        caching.get_ticket_widgets_cache_key(),
+        int(time.time() // AGE_RESOLUTION),
+        *_page_parts(request),
+    )
+
+
+def _ticket_updated_at(request, ticket_id):
+    """Return when a ticket visible to the user was last modified, once per request."""
+    from .models import SupportTicket
+
+    if not hasattr(request, "_ticket_updated_at"):
+        request._ticket_updated_at = (
+            SupportTicket.objects.visible_to(request.user)
+            .filter(id=ticket_id)
+            .values_list("updated_at", flat=True)
+            .first()
+        )
+    return request._ticket_updated_at
+
+
+def ticket_etag(request, ticket_id):
+    if _has_messages(request):
+        return None
+    updated_at = _ticket_updated_at(request, ticket_id)
+    if updated_at is None:
+        return None
+    # The page lists the technicians and shows who the ticket is assigned to
+    return _etag(
+        ticket_id, updated_at.isoformat(), caching.get_generation(USERS), *_page_parts(request)
+    )
+
+
+def ticket_last_modified(request, ticket_id):
+    if _has_messages(request):
+        return None
+    return _ticket_updated_at(request, ticket_id)
+
+
+def subcategories_etag(request):
+    return _etag(
+        request.GET.get("category_id", ""), caching.get_generation(reference.REFERENCE_DATA)
+    )
@@ -0,0 +1,324 @@
+import csv
+import datetime
+import re
+import zipfile
+from collections import namedtuple
+from xml.sax.saxutils import escape
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+# Exports are sent in chunks of about this many bytes
+CHUNK_SIZE = 64 * 1024
+
+STRING = "string"
+NUMBER = "number"
+DATETIME = "datetime"
+
+ExportColumn = namedtuple("ExportColumn", ["header", "key", "field", "type"])
+
+# Header, JSON key, field path and type of each exported column. The related
+# names are joined in SQL rather than loaded per row.
+EXPORT_COLUMNS = [
+    ExportColumn("Ticket Number", "ticket_number", "ticket_number", NUMBER),
+    ExportColumn("Date Submitted", "date_submitted", "date_submitted", DATETIME),
+    ExportColumn("Status", "status", "status", STRING),
+    ExportColumn("Priority", "priority", "priority", STRING),
+    ExportColumn("Centre", "centre", "centre__name", STRING),
+    ExportColumn("Submitted By", "submitted_by", "submitted_by__username", STRING),
+    ExportColumn("Category", "category", "category__name", STRING),
+    ExportColumn("Subcategory", "subcategory", "subcategory__name", STRING),
+    ExportColumn("Description", "description", "description", STRING),
+    ExportColumn("Title", "title", "title", STRING),
+    ExportColumn("Resolution Notes", "resolution_notes", "resolution_notes", STRING),
+    ExportColumn("Assigned To", "assigned_to", "assigned_to__username", STRING),
+]
+
+
+def _chunked(pieces):
+    """
+    Join the small pieces of an export into chunks of about CHUNK_SIZE bytes.
+    The first piece is sent on its own so that the download starts at once.
+    """
+    pieces = iter(pieces)
+    for piece in pieces:
+        yield piece
+        break
+
+    buffer, size = [], 0
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= CHUNK_SIZE:
+            yield b"".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+class ExportFormat:
+    """
+    Base class for the export formats.
+
+    A format encodes the rows of the export, tuples of values in the order of
+    the columns, one at a time as they are read, so no format holds the
+    whole export in memory.
+    """
+
+    name = None
+    label = None
+    extension = None
+    content_type = None
+    # Whether background export files are gzip-compressed
+    compress = True
+
+    def __init__(self, columns=EXPORT_COLUMNS):
+        self.columns = columns
+
+    def iter_pieces(self, rows):
+        """Yield the encoded export of rows in small pieces."""
+        raise NotImplementedError
+
+    def iter_bytes(self, rows):
+        """Yield the encoded export of rows in chunks of about CHUNK_SIZE bytes."""
+        return _chunked(self.iter_pieces(rows))
+
+
+class Echo:
+    """File-like object returning what is written to it instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+class CSVFormat(ExportFormat):
+    name = "csv"
+    label = "CSV"
+    extension = "csv"
+    content_type = "text/csv"
+
+    def iter_pieces(self, rows):
+        writer = csv.writer(Echo())
+        yield writer.writerow([column.header for column in self.columns]).encode("utf-8")
+        for row in rows:
+            yield writer.writerow(row).encode("utf-8")
+
+
+class JSONLinesFormat(ExportFormat):
+    name = "jsonl"
+    label = "JSON Lines"
+    extension = "jsonl"
+    content_type = "application/x-ndjson"
+
+    def iter_pieces(self, rows):
+        keys = [column.key for column in self.columns]
+        encoder = DjangoJSONEncoder(ensure_ascii=False)
+        for row in rows:
+            yield (encoder.encode(dict(zip(keys, row))) + "\n").encode("utf-8")
+
+
+class ZipStream:
+    """
+    Unseekable file collecting the output of a ZipFile until it is drained,
+    so that the archive can be sent while it is being written.
+    """
+
+    def __init__(self):
+        self._buffer = []
+        self._position = 0
+
+    def write(self, data):
+        self._buffer.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self._buffer)
+        self._buffer = []
+        return data
+
+
+# Characters that are not allowed in XML documents
+ILLEGAL_XML_CHARACTERS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+# Day zero of the dates stored in spreadsheets
+EXCEL_EPOCH = datetime.datetime(1899, 12, 30)
+
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+SPREADSHEET_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+RELATIONSHIPS_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+DOCUMENT_RELATIONSHIP = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
+XLSX_STYLES = (
+    f'{XML_DECLARATION}<styleSheet xmlns="{SPREADSHEET_NS}">'
+    '<numFmts count="1"><numFmt numFmtId="164" formatCode="yyyy-mm-dd hh:mm:ss"/></numFmts>'
+    '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="3"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    "</styleSheet>"
+)
+
+XLSX_ROOT_RELATIONSHIPS = (
+    f'{XML_DECLARATION}<Relationships xmlns="{RELATIONSHIPS_NS}">'
+    f'<Relationship Id="rId1" Type="{DOCUMENT_RELATIONSHIP}/officeDocument" '
+    'Target="xl/workbook.xml"/></Relationships>'
+)
+
+
+class XLSXFormat(ExportFormat):
+    """
+    Office Open XML spreadsheet written as a zip stream. Rows are written to
+    the worksheet as inline strings, numbers and dates, so no shared string
+    table has to be kept in memory. Exports with more rows than a worksheet
+    can hold continue on further worksheets.
+
+    The streaming writers of spreadsheet libraries only build the zip from
+    their temporary files when the workbook is closed, so a download could
+    not start before the last row is read. The few parts written here are
+    checked against openpyxl in the tests.
+    """
+
+    name = "xlsx"
+    label = "Excel (XLSX)"
+    extension = "xlsx"
+    content_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    compress = False
+
+    # Rows in a worksheet, including the header row
+    max_rows = 1048576
+
+    # Style index of the header cells and the date cells in XLSX_STYLES
+    HEADER_STYLE = 2
+    DATE_STYLE = 1
+
+    @staticmethod
+    def _text(value):
+        return escape(ILLEGAL_XML_CHARACTERS.sub("", str(value)))
+
+    def _cell(self, value, column_type):
+        if value is None or value == "":
+            return "<c/>"
+        if column_type == NUMBER:
+            return f"<c><v>{value}</v></c>"
+        if column_type == DATETIME:
+            if timezone.is_aware(value):
+                value = timezone.make_naive(value)
+            days = (value - EXCEL_EPOCH) / datetime.timedelta(days=1)
+            return f'<c s="{self.DATE_STYLE}"><v>{days}</v></c>'
+        return f'<c t="inlineStr"><is><t xml:space="preserve">{self._text(value)}</t></is></c>'
+
+    def _header_row(self):
+        cells = "".join(
+            f'<c s="{self.HEADER_STYLE}" t="inlineStr"><is><t>{self._text(column.header)}</t></is></c>'
+            for column in self.columns
+        )
+        return f"<row>{cells}</row>".encode("utf-8")
+
+    def _row(self, row, types):
+        cells = "".join(self._cell(value, column_type) for value, column_type in zip(row, types))
+        return f"<row>{cells}</row>".encode("utf-8")
+
+    def _workbook_parts(self, sheet_count):
+        sheets = range(1, sheet_count + 1)
+        content_types = (
+            f'{XML_DECLARATION}<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/styles.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+            + "".join(
+                f'<Override PartName="/xl/worksheets/sheet{i}.xml" '
+                'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+                for i in sheets
+            )
+            + "</Types>"
+        )
+        workbook = (
+            f'{XML_DECLARATION}<workbook xmlns="{SPREADSHEET_NS}" xmlns:r="{DOCUMENT_RELATIONSHIP}"><sheets>'
+            + "".join(
+                f'<sheet name="Support Tickets{f" {i}" if i > 1 else ""}" sheetId="{i}" r:id="rId{i}"/>'
+                for i in sheets
+            )
+            + "</sheets></workbook>"
+        )
+        workbook_relationships = (
+            f'{XML_DECLARATION}<Relationships xmlns="{RELATIONSHIPS_NS}">'
+            + "".join(
+                f'<Relationship Id="rId{i}" Type="{DOCUMENT_RELATIONSHIP}/worksheet" '
+                f'Target="worksheets/sheet{i}.xml"/>'
+                for i in sheets
+            )
+            + f'<Relationship Id="rId{sheet_count + 1}" Type="{DOCUMENT_RELATIONSHIP}/styles" '
+            'Target="styles.xml"/></Relationships>'
+        )
+        return [
+            ("[Content_Types].xml", content_types),
+            ("_rels/.rels", XLSX_ROOT_RELATIONSHIPS),
+            ("xl/workbook.xml", workbook),
+            ("xl/_rels/workbook.xml.rels", workbook_relationships),
+            ("xl/styles.xml", XLSX_STYLES),
+        ]
+
+    def _open_sheet(self, archive, number):
+        sheet = archive.open(f"xl/worksheets/sheet{number}.xml", "w", force_zip64=True)
+        sheet.write(f'{XML_DECLARATION}<worksheet xmlns="{SPREADSHEET_NS}"><sheetData>'.encode("utf-8"))
+        sheet.write(self._header_row())
+        return sheet
+
+    def _close_sheet(self, sheet):
+        sheet.write(b"</sheetData></worksheet>")
+        sheet.close()
+
+    def iter_pieces(self, rows):
+        types = [column.type for column in self.columns]
+        stream = ZipStream()
+        archive = zipfile.ZipFile(stream, "w", compression=zipfile.ZIP_DEFLATED)
+        sheet_count = 1
+        sheet = self._open_sheet(archive, sheet_count)
+        rows_in_sheet = 1
+        yield stream.drain()
+
+        for row in rows:
+            if rows_in_sheet == self.max_rows:
+                self._close_sheet(sheet)
+                sheet_count += 1
+                sheet = self._open_sheet(archive, sheet_count)
+                rows_in_sheet = 1
+            sheet.write(self._row(row, types))
+            rows_in_sheet += 1
+            data = stream.drain()
+            if data:
+                yield data
+
+        # The workbook lists the worksheets, so it is written once they are known
+        self._close_sheet(sheet)
+        for name, content in self._workbook_parts(sheet_count):
+            archive.writestr(name, content)
+        archive.close()
+        yield stream.drain()
+
+
+EXPORT_FORMATS = {
+    export_format.name: export_format
+    for export_format in (CSVFormat, JSONLinesFormat, XLSXFormat)
+}
+
+
+def get_export_format(name):
+    """Return the export format with the given name, defaulting to CSV."""
+    return EXPORT_FORMATS.get(name, CSVFormat)()
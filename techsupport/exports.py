@@ -0,0 +1,192 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .caching import TICKETS, get_generation
+from .export_formats import EXPORT_COLUMNS, get_export_format
+from .models import ExportJob, SupportTicket
+from .visibility import get_visible_centre_ids
+
+logger = logging.getLogger(__name__)
+
+# Number of rows fetched from the database at a time while exporting
+EXPORT_CHUNK_SIZE = 2000
+
+# Running jobs are claimed again if their worker stops renewing the claim for
+# this many seconds, such as when it dies
+CLAIM_TIMEOUT = 5 * 60
+
+def get_export_queryset(user, start_date, end_date):
+    """Return the tickets submitted in the date range that the user can see."""
+    return (
+        SupportTicket.objects.visible_to(user)
+        .filter(date_submitted__range=(start_date, end_date))
+        .order_by("date_submitted", "id")
+    )
+
+
+def get_export_rows(user, start_date, end_date):
+    """
+    Return an iterator over the exported values of the tickets submitted in
+    the date range that the user is allowed to see. Rows are streamed from
+    the database in chunks, so memory use does not grow with the date range.
+    """
+    tickets = get_export_queryset(user, start_date, end_date)
+    return tickets.values_list(*[column.field for column in EXPORT_COLUMNS]).iterator(
+        chunk_size=EXPORT_CHUNK_SIZE
+    )
+
+
+def _hash(value):
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def get_visibility_key(user):
+    """Return a hash of the centres whose tickets the user can see."""
+    return _hash(get_visible_centre_ids(user))
+
+
+def request_export(user, start_date, end_date, export_format="csv"):
+    """
+    Return the background export job for the tickets the user can see in the
+    date range. An unfinished or recently finished job for the same
+    parameters, format, visible centres and ticket data is reused rather than
+    exporting the tickets again.
+    """
+    export_format = get_export_format(export_format).name
+    visibility_key = get_visibility_key(user)
+    params_hash = _hash(
+        {
+            "start_date": str(start_date),
+            "end_date": str(end_date),
+            "format": export_format,
+            "visibility": visibility_key,
+            "generation": get_generation(TICKETS),
+        }
+    )
+
+    cutoff = timezone.now() - timedelta(seconds=settings.EXPORT_CACHE_TIMEOUT)
+    job = (
+        ExportJob.objects.filter(params_hash=params_hash, created_at__gte=cutoff)
+        .exclude(status=ExportJob.Status.FAILED)
+        .order_by("-created_at")
+        .first()
+    )
+    if job is not None and (
+        job.status != ExportJob.Status.FINISHED or job.file.storage.exists(job.file.name)
+    ):
+        return job
+
+    return ExportJob.objects.create(
+        requested_by=user,
+        start_date=start_date,
+        end_date=end_date,
+        format=export_format,
+        params_hash=params_hash,
+        visibility_key=visibility_key,
+    )
+
+
+def claim_job():
+    """
+    Claim the oldest pending export job for this worker, or a running job
+    whose worker stopped renewing its claim, if there is one.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        jobs = ExportJob.objects.filter(
+            Q(status=ExportJob.Status.PENDING)
+            | Q(
+                status=ExportJob.Status.RUNNING,
+                claimed_at__lt=now - timedelta(seconds=CLAIM_TIMEOUT),
+            )
+        ).order_by("created_at")
+        if connection.features.has_select_for_update_skip_locked:
+            jobs = jobs.select_for_update(skip_locked=True)
+        job = jobs.first()
+        if job is not None:
+            job.status = ExportJob.Status.RUNNING
+            job.started_at = job.claimed_at = now
+            job.rows_written = 0
+            job.save(update_fields=["status", "started_at", "claimed_at", "rows_written"])
+    return job
+
+
+def _track_progress(job, rows):
+    """
+    Pass rows through, recording the number of rows written on the job and
+    renewing its claim.
+    """
+    rows_written = 0
+    for rows_written, row in enumerate(rows, 1):
+        yield row
+        if rows_written % EXPORT_CHUNK_SIZE == 0:
+            job.rows_written = rows_written
+            job.claimed_at = timezone.now()
+            job.save(update_fields=["rows_written", "claimed_at"])
+    job.rows_written = rows_written
+
+
+def run_job(job):
+    """
+    Write the export of a job to a file under MEDIA_ROOT, gzip-compressed
+    unless the format is compressed already, recording its progress after
+    every chunk of rows.
+    """
+    export_format = get_export_format(job.format)
+    name = f"exports/{job.id}.{export_format.extension}"
+    if export_format.compress:
+        name += ".gz"
+    path = os.path.join(settings.MEDIA_ROOT, name)
+    partial_path = f"{path}.part"
+    try:
+        queryset = get_export_queryset(job.requested_by, job.start_date, job.end_date)
+        job.total_rows = queryset.count()
+        job.save(update_fields=["total_rows"])
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        rows = _track_progress(
+            job, get_export_rows(job.requested_by, job.start_date, job.end_date)
+        )
+        open_file = gzip.open if export_format.compress else open
+        with open_file(partial_path, "wb") as f:
+            for chunk in export_format.iter_bytes(rows):
+                f.write(chunk)
+        os.replace(partial_path, path)
+    except Exception as e:
+        logger.exception(f"Export job {job.id} failed")
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        job.status = ExportJob.Status.FAILED
+        job.error = str(e)
+    else:
+        job.file.name = name
+        job.status = ExportJob.Status.FINISHED
+    job.finished_at = timezone.now()
+    job.save()
+    return job
+
+
+def purge_expired_jobs():
+    """
+    Delete the export jobs and files older than EXPORT_RETENTION seconds,
+    except running jobs whose worker still renews its claim.
+    """
+    now = timezone.now()
+    cutoff = now - timedelta(seconds=settings.EXPORT_RETENTION)
+    jobs = ExportJob.objects.filter(created_at__lt=cutoff).exclude(
+        status=ExportJob.Status.RUNNING,
+        claimed_at__gte=now - timedelta(seconds=CLAIM_TIMEOUT),
+    )
+    for job in jobs:
+        if job.file:
+            job.file.delete(save=False)
+    return jobs.delete()[0]
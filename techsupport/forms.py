@@ -1,6 +1,7 @@
 from django import forms
 from django.core.validators import ValidationError
 from django.shortcuts import get_object_or_404
+from . import reference
 from .models import (
     Country,
     Region,
@@ -13,6 +14,15 @@ from .models import (
 )
 
 
+def reference_choices(field, objects):
+    """
+    Return the choices of a model choice field built from cached reference
+    data, so that rendering the field does not query its queryset.
+    """
+    choices = [] if field.empty_label is None else [("", field.empty_label)]
+    return choices + [(obj.pk, field.label_from_instance(obj)) for obj in objects]
+
+
 class SupportTicketForm(forms.ModelForm):
     class Meta:
         model = SupportTicket
@@ -32,7 +42,14 @@ class SupportTicketForm(forms.ModelForm):
         if user.centres.count() == 1:
             self.fields["centre"].queryset = user.centres.all()
             self.fields["centre"].initial = user.centres.first()
-            
+        else:
+            self.fields["centre"].choices = reference_choices(
+                self.fields["centre"], reference.get_centres()
+            )
+        self.fields["category"].choices = reference_choices(
+            self.fields["category"], reference.get_categories()
+        )
+
         if user.role == ['technician','admin']:
             self.fields["priority"].initial = "medium"
         else:
@@ -84,6 +101,56 @@ class TicketAssignmentForm(forms.Form):
     )
 
 
+class BulkTicketUpdateForm(forms.Form):
+    """Form for assigning, re-prioritising or changing the status of many tickets."""
+
+    # Tickets changed by a single request
+    MAX_TICKETS = 500
+
+    # The ticket field set by each action
+    ACTION_FIELDS = {
+        "assign": "assigned_to",
+        "priority": "priority",
+        "status": "status",
+    }
+
+    action = forms.ChoiceField(
+        choices=[("assign", "Assign"), ("priority", "Change priority"), ("status", "Change status")]
+    )
+    tickets = forms.ModelMultipleChoiceField(queryset=SupportTicket.objects.none())
+    assigned_to = forms.ModelChoiceField(
+        queryset=User.objects.filter(role="technician"), required=False
+    )
+    priority = forms.ChoiceField(choices=SupportTicket.Priority.choices, required=False)
+    status = forms.ChoiceField(choices=SupportTicket.Status.choices, required=False)
+
+    def __init__(self, *args, **kwargs):
+        user = kwargs.pop("user")
+        super().__init__(*args, **kwargs)
+        # Tickets outside the user's scope are rejected as invalid choices
+        self.fields["tickets"].queryset = SupportTicket.objects.visible_to(user)
+
+    def clean_tickets(self):
+        tickets = self.cleaned_data["tickets"]
+        if len(self.data.getlist("tickets")) > self.MAX_TICKETS:
+            raise forms.ValidationError(
+                f"At most {self.MAX_TICKETS} tickets can be changed at once."
+            )
+        return tickets
+
+    def clean(self):
+        cleaned_data = super().clean()
+        action = cleaned_data.get("action")
+        if action and not cleaned_data.get(self.ACTION_FIELDS[action]):
+            self.add_error(self.ACTION_FIELDS[action], "This field is required.")
+        return cleaned_data
+
+    def save(self, user):
+        """Apply the change and return the number of tickets changed."""
+        field = self.ACTION_FIELDS[self.cleaned_data["action"]]
+        return self.cleaned_data["tickets"].bulk_change(field, self.cleaned_data[field], user)
+
+
 # Form for updating the description of a support ticket
 class SupportTicketUpdateForm(forms.ModelForm):
     class Meta:
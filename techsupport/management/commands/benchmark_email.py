@@ -0,0 +1,62 @@
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand
+from techsupport.benchmark import Timer, stub_smtp_server
+from techsupport.emails import EmailDispatcher
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark email throughput against a local SMTP sink, opening a new "
+        "connection per message and reusing one through the email dispatcher"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--messages", type=int, default=200, help="Number of emails to send")
+
+    def handle(self, *args, **options):
+        count = options["messages"]
+
+        with stub_smtp_server() as server:
+            connection_kwargs = self.get_connection_kwargs(server)
+            with Timer() as timer:
+                for message in self.get_messages(count):
+                    # Like send_mail(), every message opens its own connection
+                    message.connection = get_connection(fail_silently=False, **connection_kwargs)
+                    message.send()
+            self.report("Connection per message", count, timer.elapsed, server)
+
+        with stub_smtp_server() as server:
+            dispatcher = EmailDispatcher(**self.get_connection_kwargs(server))
+            with Timer() as timer:
+                dispatcher.send_many(self.get_messages(count))
+                dispatcher.close()
+            self.report("Dispatcher", count, timer.elapsed, server)
+
+    @staticmethod
+    def get_connection_kwargs(server):
+        return {
+            "backend": "django.core.mail.backends.smtp.EmailBackend",
+            "host": server.host,
+            "port": server.port,
+            "username": "",
+            "password": "",
+            "use_tls": False,
+            "use_ssl": False,
+        }
+
+    @staticmethod
+    def get_messages(count):
+        return [
+            EmailMessage(
+                f"Support Ticket #{i} Created",
+                "Benchmark email",
+                "support@example.com",
+                ["user@example.com"],
+            )
+            for i in range(count)
+        ]
+
+    def report(self, label, count, elapsed, server):
+        self.stdout.write(
+            f"{label}: {count / elapsed:.1f} messages/s over {server.connections} connections"
+        )
@@ -0,0 +1,99 @@
+import multiprocessing
+import random
+import resource
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.utils import timezone
+from techsupport.benchmark import Timer
+from techsupport.export_formats import EXPORT_COLUMNS, EXPORT_FORMATS, get_export_format
+from techsupport.models import SupportTicket
+
+
+def synthetic_rows(count):
+    """Yield count rows shaped like the ticket export, generated on the fly."""
+    rng = random.Random(count)
+    start = timezone.now() - timedelta(days=365)
+    statuses = SupportTicket.Status.values
+    priorities = SupportTicket.Priority.values
+    for number in range(1, count + 1):
+        yield (
+            number,
+            start + timedelta(seconds=number * 30),
+            rng.choice(statuses),
+            rng.choice(priorities),
+            f"Centre {rng.randrange(500)}",
+            f"coach{rng.randrange(2000)}",
+            "Hardware",
+            "Tablet Issues",
+            "The tablet does not turn on after charging overnight, " * 3,
+            f"Tablet {number} not working",
+            "Replaced the charger" if number % 3 else "",
+            f"technician{rng.randrange(50)}" if number % 4 else None,
+        )
+
+
+def database_rows(count):
+    """Yield up to count rows of the ticket export from the tickets table."""
+    tickets = SupportTicket.objects.order_by("date_submitted", "id")[:count]
+    return tickets.values_list(*[column.field for column in EXPORT_COLUMNS]).iterator(
+        chunk_size=2000
+    )
+
+
+def measure(format_name, count, source):
+    """Export count rows in a format and return the time, size and peak RSS."""
+    rows = database_rows(count) if source == "database" else synthetic_rows(count)
+    export_format = get_export_format(format_name)
+    size = 0
+    with Timer() as timer:
+        for chunk in export_format.iter_bytes(rows):
+            size += len(chunk)
+    # ru_maxrss is reported in kilobytes on Linux
+    return timer.elapsed, size, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+class Command(BaseCommand):
+    help = "Benchmark the rows per second and peak memory of each export format"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            nargs="+",
+            default=[100000, 1000000],
+            help="Numbers of rows to export",
+        )
+        parser.add_argument(
+            "--formats",
+            nargs="+",
+            choices=list(EXPORT_FORMATS),
+            default=list(EXPORT_FORMATS),
+            help="Export formats to benchmark",
+        )
+        parser.add_argument(
+            "--source",
+            choices=["synthetic", "database"],
+            default="synthetic",
+            help="Export generated rows, or rows read from the tickets table",
+        )
+
+    def handle(self, *args, **options):
+        # Every run happens in a fresh process so that its peak RSS is its own
+        connections.close_all()
+        context = multiprocessing.get_context("fork")
+        baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        self.stdout.write(f"Baseline RSS: {baseline / 1024:.1f} MB")
+
+        for count in options["rows"]:
+            for format_name in options["formats"]:
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                    elapsed, size, peak_rss = executor.submit(
+                        measure, format_name, count, options["source"]
+                    ).result()
+                self.stdout.write(
+                    f"{format_name:>5} {count:>9} rows: {count / elapsed:10.0f} rows/s, "
+                    f"{size / 1024 / 1024:8.1f} MB written, peak RSS {peak_rss / 1024:.1f} MB"
+                )
@@ -0,0 +1,64 @@
+import json
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import RequestFactory
+from django.urls import reverse
+from techsupport import api
+from techsupport.benchmark import Rollback, Timer, create_benchmark_tickets
+from techsupport.models import User
+from techsupport.views import api_tickets
+
+
+def fetch_all(user, params):
+    """Page through the ticket API and return the number of tickets and bytes read."""
+    factory = RequestFactory()
+    url = f"{reverse('api_tickets')}?{params.urlencode()}"
+    rows = size = 0
+    while url:
+        request = factory.get(url)
+        request.user = user
+        response = api_tickets(request)
+        size += len(response.content)
+        page = json.loads(response.content)
+        rows += len(page["results"])
+        url = page["next"]
+    return rows, size
+
+
+class Command(BaseCommand):
+    help = "Benchmark the rows per second and response size of the ticket API"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows", type=int, default=10000, help="Number of tickets to page through"
+        )
+        parser.add_argument(
+            "--limit", type=int, default=api.MAX_PAGE_SIZE, help="Tickets per page"
+        )
+
+    def handle(self, *args, **options):
+        count = options["rows"]
+        field_sets = {
+            "id,status": "id,status",
+            "default": "",
+            "all": ",".join(api.API_FIELDS),
+        }
+        # The tickets are created in a transaction that is rolled back at the end
+        try:
+            with transaction.atomic():
+                centre = create_benchmark_tickets(count)
+                user = User.objects.create(username="benchmark_admin", role="super_admin")
+                for name, fields in field_sets.items():
+                    params = {"centre": centre.name, "limit": options["limit"], "fields": fields}
+                    query = RequestFactory().get("/", params).GET
+                    with Timer() as timer:
+                        rows, size = fetch_all(user, query)
+                    self.stdout.write(
+                        f"{name:>10}: {rows} tickets in {timer.elapsed * 1000:7.1f}ms, "
+                        f"{rows / timer.elapsed:8.0f} rows/s, {size / 1024:8.1f} KB "
+                        f"({size / max(rows, 1):.0f} bytes per ticket)"
+                    )
+                raise Rollback
+        except Rollback:
+            pass
@@ -0,0 +1,83 @@
+import gc
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from techsupport.benchmark import Rollback, Timer, create_benchmark_tickets
+from techsupport.models import SupportTicket
+
+
+def render_models(tickets):
+    """Read what the list templates show from model instances."""
+    return [
+        (t.id, t.ticket_number, t.title, t.status, t.priority, str(t.centre),
+         t.submitted_by.username, t.ticket_age())
+        for t in tickets
+    ]
+
+
+def render_rows(rows):
+    """Read what the list templates show from ticket rows."""
+    return [
+        (r.id, r.ticket_number, r.title, r.status, r.priority, r.centre,
+         r.submitted_by, r.ticket_age)
+        for r in rows
+    ]
+
+
+def measure(load, render):
+    """Return the load time, render time and memory held by the loaded objects."""
+    # Tracing allocations slows Python down, so the timings come from an
+    # untraced run
+    gc.collect()
+    with Timer() as load_timer:
+        objects = load()
+    with Timer() as render_timer:
+        render(objects)
+    del objects
+
+    gc.collect()
+    tracemalloc.start()
+    objects = load()
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return load_timer.elapsed, render_timer.elapsed, held
+
+
+class Command(BaseCommand):
+    help = "Benchmark ticket list rows against model instances"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows", type=int, default=10000, help="Number of tickets to load"
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=3, help="Runs per variant; the best is reported"
+        )
+
+    def handle(self, *args, **options):
+        count = options["rows"]
+        # The tickets are created in a transaction that is rolled back at the end
+        try:
+            with transaction.atomic():
+                centre = create_benchmark_tickets(count)
+                tickets = SupportTicket.objects.filter(centre=centre).order_by(
+                    "-date_submitted", "-id"
+                )
+                variants = {
+                    "models": (lambda: list(tickets.list_projection()), render_models),
+                    "rows": (lambda: list(tickets.list_rows()), render_rows),
+                }
+                for name, (load, render) in variants.items():
+                    runs = [measure(load, render) for _ in range(options["repeat"])]
+                    load_time = min(run[0] for run in runs)
+                    render_time = min(run[1] for run in runs)
+                    held = min(run[2] for run in runs)
+                    self.stdout.write(
+                        f"{name:>6}: {count} tickets loaded in {load_time * 1000:7.1f}ms, "
+                        f"rendered in {render_time * 1000:6.1f}ms, "
+                        f"{held / 1024 / 1024:6.1f} MB held ({held / count:.0f} bytes per ticket)"
+                    )
+                raise Rollback
+        except Rollback:
+            pass
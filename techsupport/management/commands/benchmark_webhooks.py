@@ -0,0 +1,58 @@
+import json
+
+import requests
+from django.core.management.base import BaseCommand
+from techsupport.benchmark import Timer, format_summary, stub_http_server
+from techsupport.stats import summarize
+from techsupport.webhooks import WebhookTransport
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark webhook throughput against a local stub server, posting with "
+        "a fresh connection per request and with the pooled webhook transport"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200, help="Number of webhooks to post")
+        parser.add_argument(
+            "--delay",
+            type=float,
+            default=0.005,
+            help="Seconds the stub server waits before answering each request",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=4,
+            help="Number of webhooks the pooled transport sends at once",
+        )
+
+    def handle(self, *args, **options):
+        body = json.dumps({"text": "Benchmark webhook"})
+
+        with stub_http_server(delay=options["delay"]) as server:
+            latencies = []
+            with Timer() as timer:
+                for _ in range(options["requests"]):
+                    with Timer() as request_timer:
+                        requests.post(server.url, data=body).raise_for_status()
+                    latencies.append(request_timer.elapsed)
+            self.report("Unpooled", options["requests"], timer.elapsed, summarize(latencies), server)
+
+        with stub_http_server(delay=options["delay"]) as server:
+            transport = WebhookTransport(max_concurrency=options["concurrency"])
+            with Timer() as timer:
+                errors = transport.send_many([(server.url, body)] * options["requests"])
+            transport.close()
+            if any(errors):
+                self.stderr.write(f"{sum(1 for e in errors if e)} pooled requests failed")
+            stats = transport.stats()
+            summary = {name: stats[name] for name in ("mean", "p50", "p95", "max") if name in stats}
+            self.report("Pooled", options["requests"], timer.elapsed, summary, server)
+
+    def report(self, label, count, elapsed, summary, server):
+        self.stdout.write(
+            f"{label}: {count / elapsed:.1f} webhooks/s over {server.connections} "
+            f"connections ({format_summary(summary)})"
+        )
@@ -0,0 +1,51 @@
+import time
+from django.core.management.base import BaseCommand
+from techsupport.emails import get_email_dispatcher
+from techsupport.outbox import DEFAULT_BATCH_SIZE, DEFAULT_MAX_ATTEMPTS, deliver_messages
+
+
+class Command(BaseCommand):
+    help = "Deliver the email and webhook notifications waiting in the outbox"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="Number of messages to deliver per batch",
+        )
+        parser.add_argument(
+            "--max-attempts",
+            type=int,
+            default=DEFAULT_MAX_ATTEMPTS,
+            help="Number of delivery attempts before a message is marked as failed",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep polling the outbox instead of exiting once it is empty",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5,
+            help="Seconds to wait between polls of an empty outbox when looping",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            while True:
+                results = deliver_messages(options["batch_size"], options["max_attempts"])
+                if results["claimed"]:
+                    self.stdout.write(
+                        self.style.SUCCESS(
+                            f"Delivered {results['sent']} notifications, "
+                            f"{results['retried']} to retry, {results['failed']} failed"
+                        )
+                    )
+                elif options["loop"]:
+                    time.sleep(options["interval"])
+                else:
+                    break
+        finally:
+            get_email_dispatcher().close()
@@ -1,42 +1,138 @@
 import csv
+import time
+from collections import Counter, defaultdict
+from itertools import islice
+
 from django.core.management.base import BaseCommand
-from techsupport.models import Country, Region, Centre
+from django.db import transaction
+from django.utils import timezone
+from techsupport import reference, visibility
+from techsupport.models import Centre, Country, Region
+from techsupport.search import get_search_backend
+
+
+def read_batches(csvfile, size):
+    """Yield lists of at most size CSV rows, or all rows at once when size is None."""
+    reader = csv.DictReader(csvfile)
+    if size is None:
+        yield list(reader)
+        return
+    while True:
+        batch = list(islice(reader, size))
+        if not batch:
+            break
+        yield batch
+
 
 class Command(BaseCommand):
     help = "Generate Countries, Regions and Centres for the application"
 
     def add_arguments(self, parser):
-        parser.add_argument('csv_file', type=str, help='Path to the CSV file')
+        parser.add_argument("csv_file", type=str, help="Path to the CSV file")
+        parser.add_argument(
+            "--stream",
+            action="store_true",
+            help="Read and apply the CSV in batches instead of loading it all at once",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=1000, help="CSV rows per batch with --stream"
+        )
 
     def handle(self, *args, **options):
-        csv_file = options['csv_file']
-
-        with open(csv_file, newline='') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                self.generate_country_from_csv(row)
-                self.generate_region_from_csv(row)
-                self.generate_centre_from_csv(row)
-
-    def generate_country_from_csv(self, data):
-        country, created = Country.objects.get_or_create(name=data['country_name'], code=data['country_code'])
-        if created:
-            self.stdout.write(self.style.SUCCESS(f"Successfully generated Country: {country.name}"))
-
-    def generate_region_from_csv(self, data):
-        try:
-            country = Country.objects.get(code=data['country_code'])
-            region, created = Region.objects.get_or_create(name=data['region_name'], country=country)
-            if created:
-                self.stdout.write(self.style.SUCCESS(f"Successfully generated Region: {region.name}"))
-        except Country.DoesNotExist:
-            raise Exception("Country with code not found")
-
-    def generate_centre_from_csv(self, data):
-        try:
-            region = Region.objects.get(name=data['region_name'])
-            centre, created = Centre.objects.get_or_create(name=data['centre_name'], acronym=data['centre_acronym'], region=region)
-            if created:
-                self.stdout.write(self.style.SUCCESS(f"Successfully generated Centre: {centre.name}"))
-        except Region.DoesNotExist:
-            raise Exception("Region not found")
+        self.verbosity = options["verbosity"]
+        self.counts = Counter()
+        self.changed_ids = defaultdict(list)
+        # Countries and regions are few, so their ids are kept across batches
+        self.country_ids = {}
+        self.region_ids = {}
+
+        start = time.perf_counter()
+        rows = 0
+        with open(options["csv_file"], newline="") as csvfile, transaction.atomic():
+            batch_size = options["batch_size"] if options["stream"] else None
+            for batch in read_batches(csvfile, batch_size):
+                self.import_rows(batch)
+                rows += len(batch)
+                if options["stream"]:
+                    self.stdout.write(f"Read {rows} rows")
+            # Bulk queries send no signals, so the search index and the caches
+            # built from the hierarchy are updated here. Only the centres are
+            # reindexed, as countries are not searchable and regions are
+            # matched by name, so their names never change.
+            get_search_backend().reindex_related(Centre, self.changed_ids[Centre])
+            transaction.on_commit(reference.invalidate)
+            transaction.on_commit(visibility.bump_generation)
+        elapsed = time.perf_counter() - start
+
+        for model in [Country, Region, Centre]:
+            name = model._meta.verbose_name_plural.capitalize()
+            self.stdout.write(
+                f"{name}: {self.counts[model, 'created']} created, "
+                f"{self.counts[model, 'updated']} updated, "
+                f"{self.counts[model, 'unchanged']} unchanged"
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Successfully imported {rows} rows in {elapsed:.2f}s "
+                f"({rows / max(elapsed, 1e-9):.0f} rows/s)"
+            )
+        )
+
+    def import_rows(self, rows):
+        """
+        Create or update the countries, regions and centres of a batch of rows.
+        The first row naming a country, region or centre decides its values.
+        """
+        countries, regions, centres = {}, {}, {}
+        for row in rows:
+            if row["country_code"] not in self.country_ids:
+                countries.setdefault(row["country_code"], {"name": row["country_name"]})
+        self.country_ids.update(self.sync(Country, "code", countries))
+
+        for row in rows:
+            if row["region_name"] not in self.region_ids:
+                regions.setdefault(
+                    row["region_name"], {"country_id": self.country_ids[row["country_code"]]}
+                )
+        self.region_ids.update(self.sync(Region, "name", regions))
+
+        for row in rows:
+            centres.setdefault(
+                row["centre_name"],
+                {"acronym": row["centre_acronym"], "region_id": self.region_ids[row["region_name"]]},
+            )
+        self.sync(Centre, "name", centres)
+
+    def sync(self, model, key, wanted):
+        """
+        Diff the wanted field values, keyed by a unique field, against the
+        existing rows and apply the difference with one bulk insert and one
+        bulk update. Return the id of every wanted row.
+        """
+        existing = model.objects.in_bulk(list(wanted), field_name=key)
+        fields = list(next(iter(wanted.values()), {}))
+        new_objects, changed_objects = [], []
+        now = timezone.now()
+
+        for value, values in wanted.items():
+            obj = existing.get(value)
+            if obj is None:
+                new_objects.append(model(**{key: value}, **values))
+            elif any(getattr(obj, field) != values[field] for field in fields):
+                for field, field_value in values.items():
+                    setattr(obj, field, field_value)
+                obj.updated_at = now
+                changed_objects.append(obj)
+            else:
+                self.counts[model, "unchanged"] += 1
+
+        model.objects.bulk_create(new_objects)
+        model.objects.bulk_update(changed_objects, [*fields, "updated_at"])
+        self.counts[model, "created"] += len(new_objects)
+        self.counts[model, "updated"] += len(changed_objects)
+        self.changed_ids[model] += [obj.pk for obj in changed_objects]
+        if self.verbosity > 1:
+            for obj in new_objects:
+                self.stdout.write(f"Generated {model._meta.verbose_name}: {getattr(obj, key)}")
+
+        return {getattr(obj, key): obj.pk for obj in [*existing.values(), *new_objects]}
@@ -1,6 +1,17 @@
 import random
+import time
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, time as datetime_time, timedelta
+from itertools import islice
+
 from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+from techsupport import caching, etags, reference, synthetic, visibility
+from techsupport.allocators import get_ticket_number_allocator
 from techsupport.models import (
     Country,
     Region,
@@ -8,25 +19,77 @@ from techsupport.models import (
     Category,
     SubCategory,
     SupportTicket,
+    TicketRollup,
 )
+from techsupport.search import get_search_backend
 from django.contrib.auth.models import Group
 
 User = get_user_model()
 
+# Password of the generated coaches and technicians. It is hashed once and
+# shared, as hashing a password per user would take longer than the tickets.
+SYNTHETIC_PASSWORD = "coach"
+
+# Share of the generated users who are technicians
+TECHNICIAN_SHARE = 0.02
+
+# Generated centres per generated region
+CENTRES_PER_REGION = 20
+
 
 class Command(BaseCommand):
     help = "Generate dummy data for the application"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tickets", type=int, default=20, help="Number of support tickets to generate"
+        )
+        parser.add_argument(
+            "--centres",
+            type=int,
+            default=0,
+            help="Generate centres until there are this many",
+        )
+        parser.add_argument(
+            "--users", type=int, default=0, help="Generate users until there are this many"
+        )
+        parser.add_argument(
+            "--seed", type=int, default=0, help="Seed making the generated data reproducible"
+        )
+        parser.add_argument(
+            "--days", type=int, default=365, help="Days over which the tickets are spread"
+        )
+        parser.add_argument(
+            "--until",
+            type=datetime.fromisoformat,
+            default=None,
+            help="Tickets are generated up to the start of this day, YYYY-MM-DD (default: today)",
+        )
+        parser.add_argument(
+            "--chunk-size", type=int, default=5000, help="Tickets inserted per batch"
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Processes generating the tickets while this one inserts them",
+        )
+
     def handle(self, *args, **options):
+        self.options = options
+        self.random = random.Random(options["seed"])
         self.generate_dummy_data()
 
     def generate_dummy_data(self):
-        self.generate_countries()
-        self.generate_regions()
-        self.generate_centres()
-        self.generate_users()
-        self.generate_categories()
-        self.generate_subcategories()
+        if not Country.objects.exists():
+            self.generate_countries()
+            self.generate_regions()
+            self.generate_centres()
+            self.generate_users()
+            self.generate_categories()
+            self.generate_subcategories()
+        self.generate_more_centres(self.options["centres"])
+        self.generate_more_users(self.options["users"])
         self.generate_support_tickets()
 
     def generate_countries(self):
@@ -282,47 +345,211 @@ class Command(BaseCommand):
                 )
             )
 
+
+    def generate_more_centres(self, total):
+        """Generate centres, twenty to a region, until there are total centres."""
+        first = Centre.objects.count()
+        if total <= first:
+            return
+        countries = list(Country.objects.order_by("code"))
+        region_names = {
+            number // CENTRES_PER_REGION: f"Region {number // CENTRES_PER_REGION:04d}"
+            for number in range(first, total)
+        }
+        regions = Region.objects.in_bulk(list(region_names.values()), field_name="name")
+        Region.objects.bulk_create(
+            [
+                Region(name=name, country=countries[index % len(countries)])
+                for index, name in region_names.items()
+                if name not in regions
+            ]
+        )
+        regions = Region.objects.in_bulk(list(region_names.values()), field_name="name")
+        Centre.objects.bulk_create(
+            [
+                Centre(
+                    name=f"Centre {number:05d}",
+                    acronym=f"{number:05d}",
+                    region=regions[region_names[number // CENTRES_PER_REGION]],
+                )
+                for number in range(first, total)
+            ],
+            batch_size=self.options["chunk_size"],
+        )
+        # Bulk inserts send no signals, so the caches of the hierarchy are
+        # invalidated here
+        reference.invalidate()
+        visibility.bump_generation()
+        self.stdout.write(
+            self.style.SUCCESS(f"Sucessfully generated {total - first} dummy Centres!")
+        )
+
+    def generate_more_users(self, total):
+        """
+        Generate technicians and coaches, each coach at one centre, until
+        there are total users.
+        """
+        first = User.objects.count()
+        if total <= first:
+            return
+        count = total - first
+        technicians = max(1, round(count * TECHNICIAN_SHARE))
+        password = make_password(SYNTHETIC_PASSWORD)
+        centre_ids = list(Centre.objects.order_by("name").values_list("id", flat=True))
+        groups = {
+            role: Group.objects.get_or_create(name=role)[0]
+            for role in [User.RoleType.TECHNICIAN, User.RoleType.USER]
+        }
+
+        users = []
+        for number in range(first, total):
+            role = User.RoleType.TECHNICIAN if number - first < technicians else User.RoleType.USER
+            users.append(
+                User(
+                    username=f"{role}{number:06d}",
+                    first_name=role.label,
+                    last_name=f"{number:06d}",
+                    email=f"{role}{number:06d}@example.com",
+                    role=role,
+                    password=password,
+                )
+            )
+
+        chunk_size = self.options["chunk_size"]
+        for start in range(0, count, chunk_size):
+            chunk = users[start : start + chunk_size]
+            User.objects.bulk_create(chunk)
+            # Not every database returns the ids of bulk created rows
+            user_ids = dict(
+                User.objects.filter(username__in=[user.username for user in chunk]).values_list(
+                    "username", "id"
+                )
+            )
+            User.groups.through.objects.bulk_create(
+                [
+                    User.groups.through(user_id=user_ids[user.username], group=groups[user.role])
+                    for user in chunk
+                ]
+            )
+            User.centres.through.objects.bulk_create(
+                [
+                    User.centres.through(
+                        user_id=user_ids[user.username], centre_id=self.random.choice(centre_ids)
+                    )
+                    for user in chunk
+                    if user.role == User.RoleType.USER
+                ]
+            )
+        # Bulk inserts send no signals, so the caches built from users are
+        # invalidated here
+        visibility.bump_generation()
+        caching.bump_generation(etags.USERS)
+        self.stdout.write(self.style.SUCCESS(f"Sucessfully generated {count} dummy Users!"))
+
+    def get_ticket_plan(self):
+        """Return what the tickets are drawn from, with centres and subcategories skewed."""
+        until = self.options["until"]
+        end = timezone.make_aware(
+            datetime.combine(until.date() if until else timezone.localdate(), datetime_time())
+        )
+
+        # A few centres and subcategories account for most of the tickets
+        centres = list(Centre.objects.order_by("name").values_list("id", flat=True))
+        self.random.shuffle(centres)
+        subcategories = list(
+            SubCategory.objects.order_by("name").values_list("id", "category_id")
+        )
+        self.random.shuffle(subcategories)
+
+        users = User.objects.order_by("username")
+        coach_ids = list(users.filter(role=User.RoleType.USER).values_list("id", flat=True))
+        technician_ids = list(
+            users.filter(role=User.RoleType.TECHNICIAN).values_list("id", flat=True)
+        )
+        all_user_ids = list(users.values_list("id", flat=True))
+        coaches_by_centre = defaultdict(list)
+        for centre_id, user_id in (
+            User.centres.through.objects.filter(user__role=User.RoleType.USER)
+            .order_by("user__username")
+            .values_list("centre_id", "user_id")
+        ):
+            coaches_by_centre[centre_id].append(user_id)
+
+        return synthetic.TicketPlan(
+            # Running the command again adds different tickets rather than
+            # repeating the ones it generated before
+            seed=f"{self.options['seed']}:{SupportTicket.objects.count()}",
+            start=end - timedelta(days=self.options["days"]),
+            end=end,
+            centre_ids=centres,
+            centre_weights=synthetic.zipf_weights(len(centres), exponent=0.8),
+            coaches_by_centre=dict(coaches_by_centre),
+            coach_ids=coach_ids or all_user_ids,
+            technician_ids=technician_ids or all_user_ids,
+            subcategories=subcategories,
+            subcategory_weights=synthetic.zipf_weights(len(subcategories)),
+        )
+
+    def generate_ticket_chunks(self, plan, sizes):
+        """
+        Yield the values of each chunk of tickets in order. With several
+        workers the chunks are generated in other processes, a few ahead of
+        the chunk being inserted.
+        """
+        workers = self.options["workers"]
+        if workers <= 1:
+            for index, size in enumerate(sizes):
+                yield synthetic.generate_tickets(plan, index, size)
+            return
+
+        chunks = iter(enumerate(sizes))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = deque(
+                executor.submit(synthetic.generate_tickets, plan, index, size)
+                for index, size in islice(chunks, workers * 2)
+            )
+            while pending:
+                tickets = pending.popleft().result()
+                for index, size in islice(chunks, 1):
+                    pending.append(executor.submit(synthetic.generate_tickets, plan, index, size))
+                yield tickets
+
     def generate_support_tickets(self):
-        centres = Centre.objects.all()
-        users = User.objects.all()
-        categories = Category.objects.all()
-        subcategories = SubCategory.objects.all()
-        statuses = [
-            SupportTicket.Status.OPEN,
-            SupportTicket.Status.RESOLVED,
-            SupportTicket.Status.IN_PROGRESS,
-        ]
-        priorities = [
-            SupportTicket.Priority.LOW,
-            SupportTicket.Priority.MEDIUM,
-            SupportTicket.Priority.HIGH,
-        ]
+        count = self.options["tickets"]
+        if count <= 0:
+            return
+        plan = self.get_ticket_plan()
+        chunk_size = self.options["chunk_size"]
+        sizes = [min(chunk_size, count - start) for start in range(0, count, chunk_size)]
+        allocator = get_ticket_number_allocator()
 
-        try:
-            for i in range(20):
-                centre = random.choice(centres)
-                user = random.choice(users)
-                category = random.choice(categories)
-                subcategory = random.choice(subcategories)
-                status = random.choice(statuses)
-                priority = random.choice(priorities)
-
-                SupportTicket.objects.create(
-                    status=status,
-                    priority=priority,
-                    centre=centre,
-                    submitted_by=user,
-                    category=category,
-                    subcategory=subcategory,
-                    description=f"Support Ticket {i + 1}",
-                    title=f"Ticket-{i + 1}",
+        start = time.perf_counter()
+        created = 0
+        for tickets in self.generate_ticket_chunks(plan, sizes):
+            numbers = allocator.fetch_block(len(tickets))
+            objects = [
+                SupportTicket(ticket_number=number, **dict(zip(synthetic.FIELDS, values)))
+                for number, values in zip(numbers, tickets)
+            ]
+            # Bulk inserts skip save(), which keeps the rollups up to date, so
+            # each chunk counts its own tickets in the same transaction
+            with transaction.atomic():
+                SupportTicket.objects.bulk_create(objects)
+                TicketRollup.objects.add_counts(
+                    Counter(ticket.get_rollup_key() for ticket in objects)
                 )
+            created += len(tickets)
+            elapsed = time.perf_counter() - start
             self.stdout.write(
-                self.style.SUCCESS("Sucessfully generated dummy SupportTickets!")
+                f"Inserted {created}/{count} tickets ({created / elapsed:.0f} tickets/s)"
             )
-        except Exception as e:
-            self.stderr.write(
-                self.style.ERROR(
-                    f"An error occurred in generating dummy SupportTickets: {e}"
-                )
+
+        # save() would also have updated the search index and the caches
+        get_search_backend().rebuild()
+        caching.bump_ticket_generations(plan.centre_ids)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Sucessfully generated {count} dummy SupportTickets "
+                f"in {time.perf_counter() - start:.1f}s!"
             )
+        )
@@ -1,86 +1,241 @@
 import csv
+import os
 import secrets
 import string
-from django.core.management.base import BaseCommand
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import django
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import Group
-from techsupport.models import Country, Region, Centre, UserProfile
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from techsupport import caching, etags, visibility
+from techsupport.models import Centre, Country, Region, UserProfile
 
 User = get_user_model()
 
+# Adjust the password length as needed
+PASSWORD_LENGTH = 5
+PASSWORD_CHARACTERS = string.ascii_letters + string.digits + string.punctuation
+
+USER_FIELDS = ["first_name", "last_name", "email", "role"]
+UPDATE_FIELDS = [*USER_FIELDS, "password", "is_superuser", "country", "region"]
+
+
+class DryRun(Exception):
+    """Raised to roll back an import made with --dry-run."""
+
+
+def generate_password():
+    """Return a random password."""
+    return "".join(secrets.choice(PASSWORD_CHARACTERS) for _ in range(PASSWORD_LENGTH))
+
+
+def hash_chunk(passwords):
+    """Return the hashes of a list of passwords."""
+    return [make_password(password) for password in passwords]
+
+
+def hash_passwords(passwords, workers):
+    """
+    Return an iterator of the password hashes, computed in a pool of worker
+    processes while the caller writes the users that are already hashed,
+    along with the pool and its pending work. Without workers the hashes are
+    computed in this process as they are read.
+    """
+    if workers <= 1:
+        return map(make_password, passwords), None, []
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=django.setup)
+    size = max(1, len(passwords) // (workers * 4))
+    futures = [executor.submit(hash_chunk, chunk) for chunk in chunked(passwords, size)]
+    hashes = (password for future in futures for password in future.result())
+    return hashes, executor, futures
+
+
+def chunked(items, size):
+    """Split a list into lists of at most size items."""
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
 
 class Command(BaseCommand):
     help = "Generate users for the application"
 
     def add_arguments(self, parser):
         parser.add_argument("csv_file", type=str, help="Path to the CSV file")
+        parser.add_argument(
+            "--chunk-size", type=int, default=500, help="Users written per batch of queries"
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Processes hashing the passwords; 1 hashes them in this process",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Run the whole import and roll it back at the end",
+        )
 
     def handle(self, *args, **options):
-        csv_file = options["csv_file"]
-
-        with open(csv_file, newline="") as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                self.generate_user_from_csv(row)
-
-    def generate_user_from_csv(self, data):
-        user_data = {
-            "first_name": data["first_name"],
-            "last_name": data["last_name"],
-            "username": data["username"],
-            "email": data["email"],
-            "role": data["role"],
+        with open(options["csv_file"], newline="") as csvfile:
+            rows = list(csv.DictReader(csvfile))
+        # The same username further down the file overrides earlier rows
+        rows = list({row["username"]: row for row in rows}.values())
+
+        self.load_locations()
+        self.groups = {group.name: group for group in Group.objects.all()}
+        self.created = self.updated = 0
+
+        start = time.perf_counter()
+        hashes, executor, futures = hash_passwords(
+            [generate_password() for _ in rows], options["workers"]
+        )
+        try:
+            with transaction.atomic():
+                for chunk in chunked(rows, options["chunk_size"]):
+                    self.import_users(chunk, [next(hashes) for _ in chunk])
+                    elapsed = time.perf_counter() - start
+                    done = self.created + self.updated
+                    self.stdout.write(
+                        f"Imported {done}/{len(rows)} users ({done / elapsed:.0f} users/s)"
+                    )
+                # Bulk queries send no signals, so the caches built from users
+                # are invalidated here
+                transaction.on_commit(self.invalidate_caches)
+                if options["dry_run"]:
+                    raise DryRun
+        except DryRun:
+            pass
+        finally:
+            if executor is not None:
+                # Stop hashing the rest when the import failed part way
+                for future in futures:
+                    future.cancel()
+                executor.shutdown()
+
+        elapsed = time.perf_counter() - start
+        summary = (
+            f"{self.created} users created and {self.updated} updated in {elapsed:.1f}s "
+            f"({len(rows) / max(elapsed, 1e-9):.0f} users/s)"
+        )
+        if options["dry_run"]:
+            self.stdout.write(self.style.WARNING(f"Dry run, nothing was saved: {summary}"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Successfully imported users: {summary}"))
+
+    def load_locations(self):
+        """Read the countries, regions and centres managers can be placed in."""
+        self.countries = {country.code: country for country in Country.objects.all()}
+        self.regions = {
+            (region.country_id, region.name): region for region in Region.objects.all()
+        }
+        self.centres = {
+            (centre.region_id, centre.name): centre for centre in Centre.objects.all()
         }
 
-        user, created = User.objects.get_or_create(username=data["username"])
-        user.__dict__.update(**user_data)
-
-        # Adjust the password length as needed
-        password_length = 5
-        
-        # Generate a random password
-        password_characters = string.ascii_letters + string.digits + string.punctuation
-        password = ''.join(secrets.choice(password_characters) for i in range(password_length))
-
-
-        user.set_password(password)
-        user.save()
-
-        # Create a user profile and link it to the user
-        profile, created = UserProfile.objects.get_or_create(user=user)
-        profile.bio = f"{user.first_name} {user.last_name}"
-        profile.save()
-
-        groups = data["groups"].split(",")
-        for group_name in groups:
-            group, _ = Group.objects.get_or_create(name=group_name.strip())
-            user.groups.add(group)
-
-        if data['role'] in ['admin', 'technician']:
-            # Admin and technician roles have access to all countries and regions
-            user.is_superuser = True
-            user.save()
-            self.stdout.write(self.style.SUCCESS(f"Successfully created admin/technician user: {user.username}"))
-        elif data['role'] == 'manager':
-            # Managers have access to one country and its regions
-            if data['country_code'] and data['region_name'] and data['centre_name']:
-                try:
-                    country = Country.objects.get(code=data['country_code'])
-                    region = Region.objects.get(name=data['region_name'])
-                    centre = Centre.objects.get(name=data['centre_name'], region=region)
-                    user.country = country
-                    user.region = region
-                    user.centres.add(centre)
-                    user.save()
-                    self.stdout.write(self.style.SUCCESS(f"Successfully created manager user: {user.username}"))
-
-                    # Create or update user profile
-                    profile, _ = UserProfile.objects.get_or_create(user=user)
-                    profile.save()
-                    self.stdout.write(self.style.SUCCESS(f"Successfully created user profile for: {user.username}"))
-                except (Country.DoesNotExist, Region.DoesNotExist, Centre.DoesNotExist):
-                    self.stderr.write(self.style.ERROR(f"Country, Region, or Centre not found for user: {user.username}"))
+    def get_location(self, data):
+        """Return the country, region and centre of a manager, or None if one is missing."""
+        if not (data["country_code"] and data["region_name"] and data["centre_name"]):
+            self.stderr.write(self.style.ERROR(f"Invalid manager data for user: {data['username']}"))
+            return None
+        country = self.countries.get(data["country_code"])
+        region = country and self.regions.get((country.pk, data["region_name"]))
+        centre = region and self.centres.get((region.pk, data["centre_name"]))
+        if centre is None:
+            self.stderr.write(
+                self.style.ERROR(f"Country, Region, or Centre not found for user: {data['username']}")
+            )
+            return None
+        return country, region, centre
+
+    def get_groups(self, names):
+        """Return the groups with the given names, creating the missing ones once."""
+        groups = []
+        for name in filter(None, (name.strip() for name in names.split(","))):
+            if name not in self.groups:
+                self.groups[name], _ = Group.objects.get_or_create(name=name)
+            groups.append(self.groups[name])
+        return groups
+
+    def import_users(self, rows, password_hashes):
+        """Create or update the users of one chunk of rows with a fixed number of queries."""
+        existing = User.objects.in_bulk([row["username"] for row in rows], field_name="username")
+        new_users, changed_users = [], []
+        user_centres, user_groups = {}, {}
+
+        for data, password in zip(rows, password_hashes):
+            user = existing.get(data["username"]) or User(username=data["username"])
+            for field in USER_FIELDS:
+                setattr(user, field, data[field])
+            user.password = password
+
+            if data["role"] in ["admin", "technician"]:
+                # Admin and technician roles have access to all countries and regions
+                user.is_superuser = True
+            elif data["role"] == "manager":
+                # Managers have access to one country and its regions
+                location = self.get_location(data)
+                if location:
+                    user.country, user.region, user_centres[user.username] = location
             else:
-                self.stderr.write(self.style.ERROR(f"Invalid manager data for user: {user.username}"))
-        else:
-            self.stderr.write(self.style.ERROR(f"Invalid role for user: {user.username}"))
+                self.stderr.write(self.style.ERROR(f"Invalid role for user: {user.username}"))
+
+            user_groups[user.username] = self.get_groups(data["groups"])
+            (changed_users if user.pk else new_users).append(user)
+
+        User.objects.bulk_create(new_users)
+        User.objects.bulk_update(changed_users, UPDATE_FIELDS)
+        self.created += len(new_users)
+        self.updated += len(changed_users)
+
+        # Not every database returns the ids of bulk created rows
+        user_ids = dict(
+            User.objects.filter(username__in=[row["username"] for row in rows]).values_list(
+                "username", "id"
+            )
+        )
+        self.save_profiles(new_users + changed_users, user_ids)
+        User.centres.through.objects.bulk_create(
+            [
+                User.centres.through(user_id=user_ids[username], centre_id=centre.pk)
+                for username, centre in user_centres.items()
+            ],
+            ignore_conflicts=True,
+        )
+        User.groups.through.objects.bulk_create(
+            [
+                User.groups.through(user_id=user_ids[username], group_id=group.pk)
+                for username, groups in user_groups.items()
+                for group in groups
+            ],
+            ignore_conflicts=True,
+        )
+
+    def save_profiles(self, users, user_ids):
+        """Create or update the profile of each user with its full name as the bio."""
+        profiles = {
+            profile.user_id: profile
+            for profile in UserProfile.objects.filter(user_id__in=user_ids.values())
+        }
+        now = timezone.now()
+        new_profiles, changed_profiles = [], []
+        for user in users:
+            user_id = user_ids[user.username]
+            bio = f"{user.first_name} {user.last_name}"
+            if user_id in profiles:
+                profile = profiles[user_id]
+                profile.bio, profile.updated_at = bio, now
+                changed_profiles.append(profile)
+            else:
+                new_profiles.append(UserProfile(user_id=user_id, bio=bio))
+        UserProfile.objects.bulk_create(new_profiles)
+        UserProfile.objects.bulk_update(changed_profiles, ["bio", "updated_at"])
+
+    def invalidate_caches(self):
+        visibility.bump_generation()
+        caching.bump_generation(etags.USERS)
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from techsupport.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index for all support tickets"
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        backend.install()
+        backend.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Successfully rebuilt the search index using {backend.__class__.__name__}"
+            )
+        )
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from techsupport.models import TicketRollup
+
+
+class Command(BaseCommand):
+    help = "Rebuild the daily ticket rollups from the support tickets table"
+
+    def handle(self, *args, **options):
+        TicketRollup.objects.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Successfully rebuilt {TicketRollup.objects.count()} ticket rollup rows"
+            )
+        )
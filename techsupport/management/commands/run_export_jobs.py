@@ -0,0 +1,40 @@
+import time
+from django.core.management.base import BaseCommand
+from techsupport.exports import claim_job, purge_expired_jobs, run_job
+
+
+class Command(BaseCommand):
+    help = "Run the background ticket export jobs"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep polling for export jobs instead of exiting once there are none",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5,
+            help="Seconds to wait between polls when looping",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            job = claim_job()
+            if job is not None:
+                run_job(job)
+                if job.status == job.Status.FINISHED:
+                    self.stdout.write(
+                        self.style.SUCCESS(f"Exported {job.rows_written} tickets for job {job.id}")
+                    )
+                else:
+                    self.stderr.write(f"Export job {job.id} failed: {job.error}")
+                continue
+
+            purged = purge_expired_jobs()
+            if purged:
+                self.stdout.write(f"Deleted {purged} expired export jobs")
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from techsupport import reference
+
+
+class Command(BaseCommand):
+    help = "Load the countries, regions, centres and categories into the cache"
+
+    def handle(self, *args, **options):
+        data = reference.warm_up()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Cached {len(data.countries)} countries, {len(data.regions)} regions, "
+                f"{len(data.centres)} centres, {len(data.categories)} categories and "
+                f"{len(data.subcategories)} subcategories"
+            )
+        )
@@ -0,0 +1,321 @@
+# Generated by Django 4.2.30 on 2026-10-18 16:04
+
+from django.conf import settings
+import django.contrib.auth.models
+import django.contrib.auth.validators
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+import smart_selects.db_fields
+import techsupport.models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='User',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('password', models.CharField(max_length=128, verbose_name='password')),
+                ('last_login', models.DateTimeField(blank=True, null=True, verbose_name='last login')),
+                ('is_superuser', models.BooleanField(default=False, help_text='Designates that this user has all permissions without explicitly assigning them.', verbose_name='superuser status')),
+                ('username', models.CharField(error_messages={'unique': 'A user with that username already exists.'}, help_text='Required. 150 characters or fewer. Letters, digits and @/./+/-/_ only.', max_length=150, unique=True, validators=[django.contrib.auth.validators.UnicodeUsernameValidator()], verbose_name='username')),
+                ('first_name', models.CharField(blank=True, max_length=150, verbose_name='first name')),
+                ('last_name', models.CharField(blank=True, max_length=150, verbose_name='last name')),
+                ('email', models.EmailField(blank=True, max_length=254, verbose_name='email address')),
+                ('is_staff', models.BooleanField(default=False, help_text='Designates whether the user can log into this admin site.', verbose_name='staff status')),
+                ('is_active', models.BooleanField(default=True, help_text='Designates whether this user should be treated as active. Unselect this instead of deleting accounts.', verbose_name='active')),
+                ('date_joined', models.DateTimeField(default=django.utils.timezone.now, verbose_name='date joined')),
+                ('role', models.CharField(choices=[('super_admin', 'Super Admin'), ('admin', 'Admin'), ('manager', 'Manager'), ('technician', 'Technician'), ('user', 'User')], default='user', max_length=30, verbose_name='role')),
+            ],
+            options={
+                'verbose_name': 'user',
+                'verbose_name_plural': 'users',
+                'abstract': False,
+            },
+            bases=(techsupport.models.RolePermissionMixin, models.Model),
+            managers=[
+                ('objects', django.contrib.auth.models.UserManager()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Category',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='date created')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='date modified')),
+                ('name', models.CharField(max_length=30, unique=True, verbose_name='name')),
+                ('code', models.CharField(max_length=5, unique=True, verbose_name='code')),
+                ('modified_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='%(class)s_modified', to=settings.AUTH_USER_MODEL, verbose_name='modified by')),
+            ],
+            options={
+                'verbose_name_plural': 'categories',
+            },
+        ),
+        migrations.CreateModel(
+            name='Centre',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='date created')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='date modified')),
+                ('name', models.CharField(max_length=30, unique=True, verbose_name='name')),
+                ('acronym', models.CharField(max_length=5, unique=True, verbose_name='acronym')),
+                ('modified_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='%(class)s_modified', to=settings.AUTH_USER_MODEL, verbose_name='modified by')),
+            ],
+            options={
+                'verbose_name_plural': 'centres',
+            },
+        ),
+        migrations.CreateModel(
+            name='Country',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='date created')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='date modified')),
+                ('name', models.CharField(max_length=30, unique=True, verbose_name='name')),
+                ('code', models.CharField(max_length=2, unique=True, verbose_name='code')),
+                ('modified_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='%(class)s_modified', to=settings.AUTH_USER_MODEL, verbose_name='modified by')),
+            ],
+            options={
+                'verbose_name_plural': 'countries',
+            },
+        ),
+        migrations.CreateModel(
+            name='SubCategory',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='date created')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='date modified')),
+                ('name', models.CharField(max_length=30, unique=True, verbose_name='name')),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='subcategories', to='techsupport.category', verbose_name='category')),
+                ('modified_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='%(class)s_modified', to=settings.AUTH_USER_MODEL, verbose_name='modified by')),
+            ],
+            options={
+                'verbose_name_plural': 'subcategories',
+            },
+        ),
+        migrations.CreateModel(
+            name='TicketNumberCounter',
+            fields=[
+                ('name', models.CharField(max_length=30, primary_key=True, serialize=False, verbose_name='name')),
+                ('value', models.BigIntegerField(default=0, verbose_name='value')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='UserProfile',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, primary_key=True, serialize=False)),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='date modified')),
+                ('bio', models.TextField(blank=True, verbose_name='biography')),
+                ('avatar', models.ImageField(blank=True, upload_to='avatars/', verbose_name='avatar')),
+                ('date_of_birth', models.DateField(blank=True, null=True, verbose_name='date of birth')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('modified_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='%(class)s_modified', to=settings.AUTH_USER_MODEL, verbose_name='modified by')),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='profile', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='TicketRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='date')),
+                ('status', models.CharField(choices=[('Open', 'Open'), ('In Progress', 'In Progress'), ('Resolved', 'Resolved'), ('Closed', 'Closed')], max_length=30, verbose_name='status')),
+                ('ticket_count', models.IntegerField(default=0, verbose_name='ticket count')),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ticket_rollups', to='techsupport.category')),
+                ('centre', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ticket_rollups', to='techsupport.centre')),
+                ('subcategory', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ticket_rollups', to='techsupport.subcategory')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SupportTicket',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='date created')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='date modified')),
+                ('ticket_number', models.PositiveIntegerField(editable=False, unique=True, verbose_name='ticket number')),
+                ('date_submitted', models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='date submitted')),
+                ('date_resolved', models.DateTimeField(blank=True, null=True, verbose_name='date resolved')),
+                ('status', models.CharField(choices=[('Open', 'Open'), ('In Progress', 'In Progress'), ('Resolved', 'Resolved'), ('Closed', 'Closed')], max_length=30, verbose_name='status')),
+                ('priority', models.CharField(choices=[('Low', 'Low'), ('Medium', 'Medium'), ('High', 'High')], default='Medium', max_length=30, verbose_name='priority')),
+                ('description', models.TextField(help_text='Describe the issue', max_length=100, verbose_name='description')),
+                ('title', models.CharField(blank=True, max_length=20, null=True, verbose_name='title')),
+                ('resolution_notes', models.TextField(blank=True)),
+                ('assigned_to', models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='assigned_tickets', to=settings.AUTH_USER_MODEL, verbose_name='assigned to')),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='support_issues', to='techsupport.category', verbose_name='category')),
+                ('centre', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='support_tickets', to='techsupport.centre')),
+                ('modified_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='%(class)s_modified', to=settings.AUTH_USER_MODEL, verbose_name='modified by')),
+                ('resolved_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='resolved_issues', to=settings.AUTH_USER_MODEL, verbose_name='resolved by')),
+                ('subcategory', smart_selects.db_fields.ChainedForeignKey(auto_choose=True, chained_field='category', chained_model_field='category', on_delete=django.db.models.deletion.CASCADE, related_name='support_issues', to='techsupport.subcategory', verbose_name='subcategory')),
+                ('submitted_by', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='submitted_issues', to=settings.AUTH_USER_MODEL, verbose_name='submitted by')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Settings',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='date created')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='date modified')),
+                ('dark_mode_enabled', models.BooleanField(default=False)),
+                ('modified_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='%(class)s_modified', to=settings.AUTH_USER_MODEL, verbose_name='modified by')),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Region',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='date created')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='date modified')),
+                ('name', models.CharField(max_length=30, unique=True, verbose_name='name')),
+                ('country', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='regions', to='techsupport.country', verbose_name='country')),
+                ('modified_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='%(class)s_modified', to=settings.AUTH_USER_MODEL, verbose_name='modified by')),
+            ],
+            options={
+                'verbose_name_plural': 'regions',
+            },
+        ),
+        migrations.CreateModel(
+            name='OutboxMessage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('channel', models.CharField(choices=[('email', 'Email'), ('webhook', 'Webhook')], max_length=10)),
+                ('recipient', models.TextField()),
+                ('subject', models.TextField(blank=True)),
+                ('body', models.TextField()),
+                ('status', models.CharField(choices=[('Pending', 'Pending'), ('Sent', 'Sent'), ('Failed', 'Failed')], default='Pending', max_length=10)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('claimed_at', models.DateTimeField(blank=True, null=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('group_key', models.CharField(blank=True, max_length=100)),
+                ('events', models.JSONField(default=list)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='outbox_due_idx'), models.Index(condition=models.Q(('claimed_at__isnull', True)), fields=['recipient', 'group_key'], name='outbox_unclaimed_group_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='Notification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('notification_type', models.TextField()),
+                ('recipient', models.TextField()),
+                ('notification_status', models.CharField(choices=[('Pending', 'Pending'), ('Successful', 'Successful'), ('Failed', 'Failed')], max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('outbox_message', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='notifications', to='techsupport.outboxmessage')),
+                ('ticket', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='techsupport.supportticket')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ExportJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, primary_key=True, serialize=False)),
+                ('start_date', models.DateField()),
+                ('end_date', models.DateField()),
+                ('format', models.CharField(choices=[('csv', 'CSV'), ('jsonl', 'JSON Lines'), ('xlsx', 'Excel (XLSX)')], default='csv', max_length=10)),
+                ('params_hash', models.CharField(max_length=64)),
+                ('visibility_key', models.CharField(max_length=64)),
+                ('status', models.CharField(choices=[('Pending', 'Pending'), ('Running', 'Running'), ('Finished', 'Finished'), ('Failed', 'Failed')], default='Pending', max_length=10)),
+                ('total_rows', models.PositiveIntegerField(blank=True, null=True)),
+                ('rows_written', models.PositiveIntegerField(default=0)),
+                ('file', models.FileField(blank=True, upload_to='exports/')),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('claimed_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('requested_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='export_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='centre',
+            name='region',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='centres', to='techsupport.region', verbose_name='region'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='centres',
+            field=models.ManyToManyField(related_name='users', to='techsupport.centre'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='country',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='techsupport.country', verbose_name='country'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='groups',
+            field=models.ManyToManyField(blank=True, help_text='The groups this user belongs to. A user will get all permissions granted to each of their groups.', related_name='user_set', related_query_name='user', to='auth.group', verbose_name='groups'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='region',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='techsupport.region', verbose_name='region'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='user_permissions',
+            field=models.ManyToManyField(blank=True, help_text='Specific permissions for this user.', related_name='user_set', related_query_name='user', to='auth.permission', verbose_name='user permissions'),
+        ),
+        migrations.AddConstraint(
+            model_name='ticketrollup',
+            constraint=models.UniqueConstraint(fields=('date', 'centre', 'category', 'subcategory', 'status'), name='unique_ticket_rollup'),
+        ),
+        migrations.AddIndex(
+            model_name='supportticket',
+            index=models.Index(fields=['-date_submitted', '-id'], name='ticket_date_submitted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='supportticket',
+            index=models.Index(fields=['status', '-date_submitted', '-id'], name='ticket_status_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='supportticket',
+            index=models.Index(fields=['centre', 'status', '-date_submitted', '-id'], name='ticket_centre_status_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='supportticket',
+            index=models.Index(fields=['centre', '-date_submitted', '-id'], name='ticket_centre_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='supportticket',
+            index=models.Index(fields=['assigned_to', 'status'], name='ticket_assigned_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='supportticket',
+            index=models.Index(fields=['submitted_by', '-date_submitted'], name='ticket_submitter_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='supportticket',
+            index=models.Index(condition=models.Q(('status', 'Open')), fields=['-date_submitted', '-id'], name='ticket_open_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='supportticket',
+            index=models.Index(condition=models.Q(('status', 'In Progress')), fields=['-date_submitted', '-id'], name='ticket_in_progress_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='exportjob',
+            index=models.Index(fields=['params_hash', 'created_at'], name='export_params_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='exportjob',
+            index=models.Index(fields=['status', 'created_at'], name='export_status_idx'),
+        ),
+    ]
@@ -1,16 +1,35 @@
 from django.utils import timezone
-from django.db import models
+from django.db import connection, connections, models, router, transaction, IntegrityError
+from django.db.models.functions import TruncDate
 from django.contrib.auth.models import Permission, AbstractUser
 from django.utils.translation import gettext_lazy as _
 from django.utils.timezone import now
 from smart_selects.db_fields import ChainedForeignKey
+import functools
+from collections import defaultdict
 import uuid
 import json
-import logging
-from django.core.mail import send_mail
+from datetime import timedelta
 from django.conf import settings
-import requests
-from .notifications import EMAIL_MESSAGES, WEBHOOK_MESSAGES
+from .notifications import (
+    EMAIL_MESSAGES,
+    WEBHOOK_MESSAGES,
+    EMAIL_UPDATES,
+    EMAIL_DIGEST,
+    WEBHOOK_UPDATES,
+    WEBHOOK_DIGEST,
+)
+from .allocators import get_ticket_number_allocator
+from .caching import bump_ticket_generations
+from .export_formats import EXPORT_FORMATS
+from .permissions import get_role_permissions
+from .rows import TicketRow, TicketRowIterable, format_ticket_age
+from .search import get_search_backend
+from .visibility import ALL_CENTRES, get_visible_centre_ids
+
+if connection.vendor == "postgresql":
+    from django.contrib.postgres.indexes import GinIndex
+    from django.contrib.postgres.search import SearchVectorField
 
 
 # from django.contrib.postgres.fields import ArrayField
@@ -48,16 +67,16 @@ class RolePermissionMixin:
         return f"{self.__class__.__name__.lower()}_{permission_name}"
 
     def get_role_permissions(self):
-        """Get permissions for the user's role."""
+        """
+        Get the names ("app_label.codename") of the permissions of the user's
+        role as a frozenset. They are cached per process, so this runs no
+        queries once the cache is warm.
+        """
         try:
             role = self.role
         except AttributeError:
-            return []
-        permissions = self.PERMISSIONS.get(role, {})
-        return [
-            Permission.objects.get(codename=self._get_permission_codename(p))
-            for p in permissions.keys()
-        ]
+            return frozenset()
+        return get_role_permissions(self.__class__, role)
 
     def has_perm(self, perm, obj=None):
         """Check if the user has the specified permission."""
@@ -77,9 +96,7 @@ class BaseModel(models.Model):
     created_at = models.DateTimeField(
         default=now, editable=False, verbose_name=_("date created")
     )
-    updated_at = models.DateTimeField(
-        default=now, editable=False, verbose_name=_("date modified")
-    )
+    updated_at = models.DateTimeField(auto_now=True, verbose_name=_("date modified"))
     modified_by = models.ForeignKey(
         "User",
         verbose_name=_("modified by"),
@@ -92,6 +109,13 @@ class BaseModel(models.Model):
     class Meta:
         abstract = True
 
+    def save(self, *args, **kwargs):
+        # Saving only some of the fields still marks the object as modified
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "updated_at" not in update_fields:
+            kwargs["update_fields"] = [*update_fields, "updated_at"]
+        super().save(*args, **kwargs)
+
 
 class Country(BaseModel):
     """Model representing a country."""
@@ -143,7 +167,7 @@ class Centre(BaseModel):
         verbose_name_plural = "centres"
 
 
-class User(AbstractUser, RolePermissionMixin):
+class User(RolePermissionMixin, AbstractUser):
     """Custom user model that inherits from AbstractUser model"""
 
     class RoleType(models.TextChoices):
@@ -291,6 +315,118 @@ class SubCategory(BaseModel):
         verbose_name_plural = "subcategories"
 
 
+class SupportTicketQuerySet(models.QuerySet):
+    """Custom queryset for support tickets."""
+
+    def visible_to(self, user):
+        """
+        Return the tickets the user is allowed to see according to their role,
+        filtered on the cached ids of their visible centres.
+        """
+        centre_ids = get_visible_centre_ids(user)
+        if centre_ids == ALL_CENTRES:
+            return self.all()
+        return self.filter(centre_id__in=centre_ids)
+
+    def list_projection(self):
+        """
+        Return the tickets with every relation rendered by the ticket detail
+        page joined in, so that displaying them takes a constant number of
+        queries.
+        """
+        return self.select_related(
+            "centre__region__country",
+            "category",
+            "subcategory",
+            "submitted_by",
+            "resolved_by",
+            "assigned_to",
+        )
+
+    def list_rows(self):
+        """
+        Return the tickets as compact TicketRow objects with only the columns
+        shown by the ticket lists, rather than as model instances.
+        """
+        queryset = self.values_list(*TicketRow.FIELDS)
+        queryset._iterable_class = TicketRowIterable
+        return queryset
+
+    def ticket_statistics(self):
+        """
+        Return the total number of tickets and the number of tickets per status
+        for this queryset using a single conditional aggregation query.
+        """
+        Status = self.model.Status
+        return self.aggregate(
+            total=models.Count("pk"),
+            open=models.Count("pk", filter=models.Q(status=Status.OPEN)),
+            in_progress=models.Count("pk", filter=models.Q(status=Status.IN_PROGRESS)),
+            resolved=models.Count("pk", filter=models.Q(status=Status.RESOLVED)),
+            closed=models.Count("pk", filter=models.Q(status=Status.CLOSED)),
+        )
+
+    def bulk_change(self, field, value, user):
+        """
+        Set the assigned_to, priority or status field of the tickets to value
+        with a single UPDATE ... WHERE id IN (...), and queue the notifications
+        of the change as one batch. Tickets whose field already has the value
+        are left alone. Returns the number of tickets changed.
+        """
+        if field not in ("assigned_to", "priority", "status"):
+            raise ValueError(f"Tickets cannot be changed in bulk on {field}")
+
+        Status = self.model.Status
+        updates = {field: value, "updated_at": timezone.now()}
+        if field == "status" and value == Status.RESOLVED:
+            updates.update(resolved_by=user, date_resolved=updates["updated_at"])
+
+        with transaction.atomic(using=self.db):
+            changed = self.exclude(**{field: value})
+            if connections[self.db].features.has_select_for_update:
+                changed = changed.select_for_update()
+            ticket_ids = list(changed.values_list("id", flat=True))
+            if not ticket_ids:
+                return 0
+            tickets = self.model.objects.using(self.db).filter(id__in=ticket_ids)
+
+            # Count the tickets leaving each rollup row before their status changes
+            moved_rollups = []
+            if field == "status":
+                moved_rollups = list(
+                    tickets.annotate(date=TruncDate("date_submitted"))
+                    .values_list("date", "centre_id", "category_id", "subcategory_id", "status")
+                    .annotate(ticket_count=models.Count("pk"))
+                    .order_by()
+                )
+
+            tickets.update(**updates)
+
+            for *rollup_key, count in moved_rollups:
+                TicketRollup.objects.increment(rollup_key, -count)
+                TicketRollup.objects.increment([*rollup_key[:-1], value], count)
+
+            tickets = list(tickets.list_projection())
+            centre_ids = {ticket.centre_id for ticket in tickets}
+            bump_ticket_generations(centre_ids)
+            transaction.on_commit(
+                functools.partial(bump_ticket_generations, centre_ids), using=self.db
+            )
+
+            # Queue the notifications ticket_details sends for the same change,
+            # which sends none for status changes other than resolving
+            MessageType = Notification.MessageType
+            if field == "assigned_to":
+                Notification.send_bulk_notifications(tickets, MessageType.ASSIGNMENT, user)
+            elif field == "priority":
+                Notification.send_bulk_notifications(
+                    tickets, MessageType.STATUS_CHANGE, user, email=False
+                )
+            elif value == Status.RESOLVED:
+                Notification.send_bulk_notifications(tickets, MessageType.RESOLUTION, user)
+        return len(tickets)
+
+
 class SupportTicket(BaseModel):
     """Model representing a support ticket submitted by a coach."""
 
@@ -323,16 +459,20 @@ class SupportTicket(BaseModel):
         choices=Priority.choices,
         default=Priority.MEDIUM,
     )
+    # The composite indexes in Meta lead with the centre, submitted_by and
+    # assigned_to columns, so those foreign keys need no index of their own.
     centre = models.ForeignKey(
         Centre,
         on_delete=models.CASCADE,
         related_name="support_tickets",
+        db_index=False,
     )
     submitted_by = models.ForeignKey(
         User,
         verbose_name=_("submitted by"),
         on_delete=models.CASCADE,
         related_name="submitted_issues",
+        db_index=False,
     )
     resolved_by = models.ForeignKey(
         User,
@@ -378,8 +518,58 @@ class SupportTicket(BaseModel):
         null=True,
         blank=True,
         related_name="assigned_tickets",
+        db_index=False,
     )
 
+    if connection.vendor == "postgresql":
+        # Searchable text of the ticket, kept up to date by the PostgreSQL
+        # search backend. Other databases index it outside the ticket table.
+        search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = SupportTicketQuerySet.as_manager()
+
+    # Fields that decide which TicketRollup row a ticket is counted in
+    ROLLUP_FIELDS = ("date_submitted", "centre_id", "category_id", "subcategory_id", "status")
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember which rollup row the ticket is counted in, so that saves
+        # can move it to another row without querying the old values
+        if not instance.get_deferred_fields().intersection(cls.ROLLUP_FIELDS):
+            instance._rollup_key = instance.get_rollup_key()
+        return instance
+
+    @staticmethod
+    def make_rollup_key(date_submitted, centre_id, category_id, subcategory_id, status):
+        """Return the TicketRollup row key for the given ticket values."""
+        return (
+            timezone.localdate(date_submitted),
+            centre_id,
+            category_id,
+            subcategory_id,
+            status,
+        )
+
+    def get_rollup_key(self):
+        """Return the key of the TicketRollup row this ticket is counted in."""
+        return self.make_rollup_key(
+            *(getattr(self, field) for field in self.ROLLUP_FIELDS)
+        )
+
+    def _get_saved_rollup_key(self):
+        """Return the rollup key of the ticket as currently stored."""
+        if self._state.adding:
+            return None
+        if not hasattr(self, "_rollup_key"):
+            values = (
+                SupportTicket.objects.filter(pk=self.pk)
+                .values_list(*self.ROLLUP_FIELDS)
+                .first()
+            )
+            return self.make_rollup_key(*values) if values else None
+        return self._rollup_key
+
     def save(self, *args, **kwargs):
         """
         Override the save method to set the ticket number and support description.
@@ -389,38 +579,230 @@ class SupportTicket(BaseModel):
             **kwargs: Keyword arguments passed to the superclass method.
         """
         if not self.ticket_number:
-            max_ticket_number = SupportTicket.objects.aggregate(
-                max_ticket_number=models.Max("ticket_number")
-            )["max_ticket_number"]
-            self.ticket_number = (max_ticket_number or 0) + 1
+            using = kwargs.get("using") or router.db_for_write(SupportTicket, instance=self)
+            self.ticket_number = get_ticket_number_allocator(using).allocate()
 
         if not self.title:
             self.title = f"{self.ticket_number}-{self.category.code}-{self.subcategory.code}-{self.description[:20]}"
-        super().save(*args, **kwargs)
+
+        with transaction.atomic():
+            saved_rollup_key = self._get_saved_rollup_key()
+            super().save(*args, **kwargs)
+
+            # Move the ticket between rollup rows when it is created or when
+            # its status, centre or category changes
+            rollup_key = self.get_rollup_key()
+            if rollup_key != saved_rollup_key:
+                if saved_rollup_key is not None:
+                    TicketRollup.objects.increment(saved_rollup_key, -1)
+                TicketRollup.objects.increment(rollup_key, 1)
+            self._rollup_key = rollup_key
+
+            # Keep the full-text search index in sync with the ticket
+            get_search_backend(self._state.db).index_ticket(self)
+
+            # Invalidate the dashboard data cached for the ticket's centres, and
+            # again on commit in case a concurrent request has cached the old
+            # data under the new generation in the meantime
+            centre_ids = [self.centre_id]
+            if saved_rollup_key is not None:
+                centre_ids.append(saved_rollup_key[1])
+            bump_ticket_generations(centre_ids)
+            transaction.on_commit(
+                functools.partial(bump_ticket_generations, centre_ids), using=self._state.db
+            )
 
     def ticket_age(self):
         """
         Method that returns the difference between the current time and the time
         the support ticket was submitted.
         """
-        now = timezone.now()
-        age = now - self.date_submitted
-
-        if age.days >= 1:
-            days = age.days
-            hours, remainder = divmod(age.seconds, 3600)
-            minutes, _ = divmod(remainder, 60)
-            if hours > 0:
-                return f"{days} days ago"
-            else:
-                return f"{days} days ago"
-        else:
-            hours, remainder = divmod(age.seconds, 3600)
-            minutes, _ = divmod(remainder, 60)
-            if hours > 0:
-                return f"{hours} hrs ago"
-            else:
-                return f"{minutes} mins ago"
+        return format_ticket_age(self.date_submitted, timezone.now())
+
+    class Meta:
+        indexes = [
+            # Keyset pagination and date range exports
+            models.Index(
+                fields=["-date_submitted", "-id"], name="ticket_date_submitted_idx"
+            ),
+            # Status filters and the status list pages
+            models.Index(
+                fields=["status", "-date_submitted", "-id"], name="ticket_status_date_idx"
+            ),
+            # Dashboards scoped to a user's centres
+            models.Index(
+                fields=["centre", "status", "-date_submitted", "-id"],
+                name="ticket_centre_status_date_idx",
+            ),
+            models.Index(
+                fields=["centre", "-date_submitted", "-id"],
+                name="ticket_centre_date_idx",
+            ),
+            # Tickets assigned to or submitted by a user
+            models.Index(
+                fields=["assigned_to", "status"], name="ticket_assigned_status_idx"
+            ),
+            models.Index(
+                fields=["submitted_by", "-date_submitted"],
+                name="ticket_submitter_date_idx",
+            ),
+            # Small partial indexes over the tickets that still need work
+            models.Index(
+                fields=["-date_submitted", "-id"],
+                name="ticket_open_date_idx",
+                condition=models.Q(status="Open"),
+            ),
+            models.Index(
+                fields=["-date_submitted", "-id"],
+                name="ticket_in_progress_date_idx",
+                condition=models.Q(status="In Progress"),
+            ),
+        ]
+        if connection.vendor == "postgresql":
+            indexes.append(GinIndex(fields=["search_vector"], name="ticket_search_gin"))
+
+
+class TicketNumberCounter(models.Model):
+    """
+    Model holding named counters, such as the last allocated support ticket
+    number on databases without sequences.
+    """
+
+    TICKET_NUMBER = "ticket_number"
+
+    name = models.CharField(max_length=30, primary_key=True, verbose_name=_("name"))
+    value = models.BigIntegerField(default=0, verbose_name=_("value"))
+
+    def __str__(self):
+        return f"{self.name}: {self.value}"
+
+
+class TicketRollupQuerySet(models.QuerySet):
+    """Custom queryset for the daily ticket rollups."""
+
+    # Rows incremented per UPDATE by add_counts, which keeps the statements
+    # under the query parameter limit of SQLite
+    ADD_COUNTS_BATCH_SIZE = 300
+
+    def increment(self, key, delta):
+        """
+        Add delta to the ticket count of the rollup row with the given key,
+        creating the row if it does not exist yet.
+        """
+        date, centre_id, category_id, subcategory_id, status = key
+        lookup = {
+            "date": date,
+            "centre_id": centre_id,
+            "category_id": category_id,
+            "subcategory_id": subcategory_id,
+            "status": status,
+        }
+        updated = self.filter(**lookup).update(
+            ticket_count=models.F("ticket_count") + delta
+        )
+        if updated:
+            return
+        try:
+            with transaction.atomic():
+                self.create(ticket_count=delta, **lookup)
+        except IntegrityError:
+            # Another request created the row first
+            self.filter(**lookup).update(ticket_count=models.F("ticket_count") + delta)
+
+    def add_counts(self, counts):
+        """
+        Add the ticket counts of a mapping of rollup keys to deltas, such as
+        the tickets of a bulk insert. Missing rows are inserted with a zero
+        count, then every count is incremented in the database, so concurrent
+        writers neither lose increments nor collide on the unique key.
+        """
+        counts = {tuple(key): delta for key, delta in counts.items() if delta}
+        if not counts:
+            return
+        fields = ["date", "centre_id", "category_id", "subcategory_id", "status"]
+        with transaction.atomic():
+            self.bulk_create(
+                [self.model(ticket_count=0, **dict(zip(fields, key))) for key in counts],
+                batch_size=1000,
+                ignore_conflicts=True,
+            )
+            rows = self.filter(
+                date__in={key[0] for key in counts}, centre_id__in={key[1] for key in counts}
+            ).values_list("pk", *fields)
+            deltas = {pk: counts[tuple(key)] for pk, *key in rows if tuple(key) in counts}
+
+            pks = list(deltas)
+            for start in range(0, len(pks), self.ADD_COUNTS_BATCH_SIZE):
+                batch = pks[start : start + self.ADD_COUNTS_BATCH_SIZE]
+                delta = models.Case(
+                    *[models.When(pk=pk, then=models.Value(deltas[pk])) for pk in batch],
+                    output_field=models.IntegerField(),
+                )
+                self.filter(pk__in=batch).update(ticket_count=models.F("ticket_count") + delta)
+
+    def rebuild(self):
+        """Recompute every rollup row from the support tickets table."""
+        rows = (
+            SupportTicket.objects.annotate(date=TruncDate("date_submitted"))
+            .values("date", "centre_id", "category_id", "subcategory_id", "status")
+            .annotate(ticket_count=models.Count("pk"))
+            .order_by()
+        )
+        with transaction.atomic():
+            self.all().delete()
+            self.bulk_create(
+                (self.model(**row) for row in rows.iterator()), batch_size=1000
+            )
+
+    def top(self, field, limit=5):
+        """
+        Return the values of field with the most tickets, e.g. "category__name",
+        along with their ticket_count.
+        """
+        return (
+            self.values(field)
+            .annotate(ticket_count=models.Sum("ticket_count"))
+            .filter(ticket_count__gt=0)
+            .order_by("-ticket_count")[:limit]
+        )
+
+
+class TicketRollup(models.Model):
+    """
+    Model holding the number of support tickets submitted per day, centre,
+    category, subcategory and status. It is kept up to date incrementally
+    when tickets are saved and deleted, so dashboard insights can be read
+    from it instead of aggregating the whole support tickets table.
+    """
+
+    date = models.DateField(verbose_name=_("date"))
+    centre = models.ForeignKey(
+        Centre, on_delete=models.CASCADE, related_name="ticket_rollups"
+    )
+    category = models.ForeignKey(
+        Category, on_delete=models.CASCADE, related_name="ticket_rollups"
+    )
+    subcategory = models.ForeignKey(
+        SubCategory, on_delete=models.CASCADE, related_name="ticket_rollups"
+    )
+    status = models.CharField(
+        max_length=30, verbose_name=_("status"), choices=SupportTicket.Status.choices
+    )
+    ticket_count = models.IntegerField(verbose_name=_("ticket count"), default=0)
+
+    objects = TicketRollupQuerySet.as_manager()
+
+    def __str__(self):
+        return f"{self.date} {self.centre_id} {self.status}: {self.ticket_count}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["date", "centre", "category", "subcategory", "status"],
+                name="unique_ticket_rollup",
+            )
+        ]
+
 
 class Notification(models.Model):
     """Model to represent notifications sent via email and webhook."""
@@ -428,7 +810,7 @@ class Notification(models.Model):
     # Notification details
     notification_type = models.TextField()
     recipient = models.TextField()
-    notification_status = models.CharField(max_length=20, choices=[('Successful', 'Successful'), ('Failed', 'Failed')])
+    notification_status = models.CharField(max_length=20, choices=[('Pending', 'Pending'), ('Successful', 'Successful'), ('Failed', 'Failed')])
     created_at = models.DateTimeField(auto_now_add=True)
 
     # Enum for notification types
@@ -442,97 +824,383 @@ class Notification(models.Model):
     ticket = models.ForeignKey('SupportTicket', on_delete=models.CASCADE, null=True, blank=True)
     user = models.ForeignKey('User', on_delete=models.CASCADE, null=True, blank=True)
 
+    # Delivery of the notification, shared with any events merged into it
+    outbox_message = models.ForeignKey(
+        'OutboxMessage', on_delete=models.SET_NULL, null=True, blank=True, related_name='notifications'
+    )
+
     @classmethod
     def send_email_notification(cls, support_ticket, message_type):
+        """
+        Queue an email notification to the submitter of the ticket. The email is
+        written to the outbox in the current transaction and delivered by the
+        deliver_notifications worker.
+        """
         notification = cls.objects.create(
             notification_type=message_type,
             recipient=support_ticket.submitted_by.email,
-            notification_status='Successful',
+            notification_status='Pending',
             ticket=support_ticket  # Add this line to associate the notification with the ticket
         )
 
-        subject, message = cls._get_email_content(support_ticket, message_type)
-
-        # Replace {ticket_number} with the actual ticket number in the subject
-        subject = subject.format(ticket_number=support_ticket.ticket_number)
-
-        send_mail(subject, message, settings.EMAIL_HOST_USER, [notification.recipient], fail_silently=True)
+        context = cls._get_email_context(support_ticket, message_type)
+        if context is None:
+            notification.notification_status = 'Failed'
+            notification.save(update_fields=['notification_status'])
+            return notification
 
+        OutboxMessage.objects.enqueue(
+            notification, OutboxMessage.Channel.EMAIL, support_ticket, message_type, context
+        )
+        return notification
 
     @classmethod
     def send_webhook_notification(cls, support_ticket, message_type, user):
+        """
+        Queue a webhook notification about the ticket. The message is written to
+        the outbox in the current transaction and delivered by the
+        deliver_notifications worker.
+        """
         notification = cls.objects.create(
             notification_type=message_type,
             recipient=settings.WEB_HOOK_URL,
-            notification_status='Successful'
+            notification_status='Pending',
+            ticket=support_ticket,
+            user=user,
         )
 
-        webhook_message = cls._get_webhook_content(support_ticket, message_type, user)
-
-        headers = {"Content-Type": "application/json; charset=UTF-8"}
-
-        try:
-            response = requests.post(
-                url=notification.recipient,
-                headers=headers,
-                data=json.dumps(webhook_message),
-            )
-            response.raise_for_status()
-        except requests.exceptions.RequestException as e:
+        context = cls._get_webhook_context(support_ticket, message_type, user)
+        if context is None:
             notification.notification_status = 'Failed'
-            notification.save()
-            logger = logging.getLogger(__name__)
-            logger.error(f"Failed to send webhook notification: {str(e)}")
+            notification.save(update_fields=['notification_status'])
+            return notification
 
+        OutboxMessage.objects.enqueue(
+            notification, OutboxMessage.Channel.WEBHOOK, support_ticket, message_type, context
+        )
+        return notification
+
+    @classmethod
+    def send_bulk_notifications(cls, support_tickets, message_type, user, email=True):
+        """
+        Queue the notifications about a change made to many tickets at once.
+        The emails to each submitter are merged into one outbox message, and
+        so are the webhooks.
+        """
+        notifications = []
+        batches = defaultdict(lambda: ([], []))
+        for support_ticket in support_tickets:
+            channels = [OutboxMessage.Channel.WEBHOOK]
+            if email:
+                channels.insert(0, OutboxMessage.Channel.EMAIL)
+            for channel in channels:
+                if channel == OutboxMessage.Channel.EMAIL:
+                    notification = cls(
+                        notification_type=message_type,
+                        recipient=support_ticket.submitted_by.email,
+                        notification_status='Pending',
+                        ticket=support_ticket,
+                    )
+                    context = cls._get_email_context(support_ticket, message_type)
+                else:
+                    notification = cls(
+                        notification_type=message_type,
+                        recipient=settings.WEB_HOOK_URL,
+                        notification_status='Pending',
+                        ticket=support_ticket,
+                        user=user,
+                    )
+                    context = cls._get_webhook_context(support_ticket, message_type, user)
+                notifications.append(notification)
+                if context is None:
+                    notification.notification_status = 'Failed'
+                    continue
+                batch = batches[channel, notification.recipient]
+                batch[0].append(notification)
+                batch[1].append({'type': message_type, 'context': context})
+
+        for (channel, recipient), (batch_notifications, events) in batches.items():
+            message = OutboxMessage.objects.enqueue_many(channel, recipient, events)
+            for notification in batch_notifications:
+                notification.outbox_message = message
+        cls.objects.bulk_create(notifications)
+        return notifications
 
     @staticmethod
-    def _get_email_content(support_ticket, message_type):
-        """Get email content based on message type."""
-        message = EMAIL_MESSAGES.get(message_type)
-        if message:
-            subject = message['subject']
-            body = message['message'].format(
-                user_name=support_ticket.submitted_by.get_full_name(),
-                ticket_number=support_ticket.ticket_number,
-                centre=support_ticket.centre,
-                title=support_ticket.title,
-                category=support_ticket.category,
-                subcategory=support_ticket.subcategory,
-            )
-            return subject, body
-        else:
-            print(f"Invalid message_type: {message_type}")  
+    def _get_email_context(support_ticket, message_type):
+        """Get the values substituted into the email messages."""
+        if message_type not in EMAIL_MESSAGES:
+            print(f"Invalid message_type: {message_type}")
             print(f"Valid message_types: {', '.join(EMAIL_MESSAGES.keys())}")
-        return '', ''
+            return None
+        return {
+            'user_name': support_ticket.submitted_by.get_full_name(),
+            'ticket_number': support_ticket.ticket_number,
+            'centre': str(support_ticket.centre),
+            'title': support_ticket.title,
+            'category': str(support_ticket.category),
+            'subcategory': str(support_ticket.subcategory),
+            'status': support_ticket.status,
+            'assigned_to': str(support_ticket.assigned_to or ''),
+        }
 
     @staticmethod
-    def _get_webhook_content(support_ticket, message_type, user):
-        """Get webhook content based on message type."""
+    def _get_webhook_context(support_ticket, message_type, user):
+        """Get the values substituted into the webhook messages."""
+        if message_type not in WEBHOOK_MESSAGES:
+            print(f"Invalid message_type: {message_type}")
+            print(f"Valid message_types: {', '.join(WEBHOOK_MESSAGES.keys())}")
+            return None
         # Ensure that required attributes are present in the support_ticket object
-        centre = getattr(support_ticket, 'centre', '')
-        title = getattr(support_ticket, 'title', '')
-        category = getattr(support_ticket, 'category', '')
-        subcategory = getattr(support_ticket, 'subcategory', '')
-        priority = getattr(support_ticket, 'priority', '')
-        ticket_number = getattr(support_ticket, 'ticket_number', '')
-        status = getattr(support_ticket, 'status', '')
-
-        message = WEBHOOK_MESSAGES.get(message_type)
-        if message:
-            webhook_message = {
-                'text': message['text'].format(
-                    centre=centre,
-                    title=title,
-                    category=category,
-                    subcategory=subcategory,
-                    priority=priority,
-                    ticket_number=ticket_number,
-                    status=status,
-                    user=user,
+        return {
+            'centre': str(getattr(support_ticket, 'centre', '')),
+            'title': str(getattr(support_ticket, 'title', '')),
+            'category': str(getattr(support_ticket, 'category', '')),
+            'subcategory': str(getattr(support_ticket, 'subcategory', '')),
+            'priority': str(getattr(support_ticket, 'priority', '')),
+            'ticket_number': getattr(support_ticket, 'ticket_number', ''),
+            'status': str(getattr(support_ticket, 'status', '')),
+            'assigned_to': str(getattr(support_ticket, 'assigned_to', None) or ''),
+            'user': str(user),
+        }
+
+
+class OutboxMessageQuerySet(models.QuerySet):
+    """Custom queryset for the notification outbox."""
+
+    def _merge_events(self, message, events):
+        """
+        Add events to a pending message with a conditional update, so that
+        a message claimed by a worker since it was read is left alone.
+        Return whether the events were added.
+        """
+        message.events.extend(events)
+        message.render()
+        return bool(
+            self.filter(pk=message.pk, claimed_at__isnull=True).update(
+                events=message.events, subject=message.subject, body=message.body
+            )
+        )
+
+    def enqueue(self, notification, channel, support_ticket, message_type, context):
+        """
+        Add a notification event to the outbox.
+
+        With a digest interval configured, events for the same recipient are
+        merged into one message sent at the end of the interval. Otherwise
+        events for the same ticket and recipient within the coalescing window
+        are merged into one message. Events are only merged into messages that
+        no worker has claimed yet.
+        """
+        digest_interval = getattr(settings, 'NOTIFICATION_DIGEST_INTERVAL', 0)
+        coalesce_window = getattr(settings, 'NOTIFICATION_COALESCE_WINDOW', 0)
+        if digest_interval > 0:
+            group_key, window = OutboxMessage.DIGEST, digest_interval
+        elif coalesce_window > 0:
+            group_key, window = f'ticket:{support_ticket.pk}', coalesce_window
+        else:
+            group_key, window = '', 0
+
+        event = {'type': message_type, 'context': context}
+        message = None
+        if group_key:
+            message = (
+                self.select_for_update()
+                .filter(
+                    channel=channel,
+                    recipient=notification.recipient,
+                    group_key=group_key,
+                    status=OutboxMessage.Status.PENDING,
+                    claimed_at__isnull=True,
                 )
-            }
-            return webhook_message
+                .order_by('created_at')
+                .first()
+            )
+
+        if message is None or not self._merge_events(message, [event]):
+            message = self.model(
+                channel=channel,
+                recipient=notification.recipient,
+                group_key=group_key,
+                events=[event],
+                next_attempt_at=timezone.now() + timedelta(seconds=window),
+            )
+            message.render()
+            message.save()
+
+        notification.outbox_message = message
+        notification.save(update_fields=['outbox_message'])
+        return message
+
+    def enqueue_many(self, channel, recipient, events):
+        """
+        Add the events of a change made to many tickets at once to the outbox
+        as a single message to the recipient. With a digest interval
+        configured, the events are merged into the recipient's digest.
+        """
+        digest_interval = getattr(settings, 'NOTIFICATION_DIGEST_INTERVAL', 0)
+        message = None
+        if digest_interval > 0:
+            message = (
+                self.select_for_update()
+                .filter(
+                    channel=channel,
+                    recipient=recipient,
+                    group_key=OutboxMessage.DIGEST,
+                    status=OutboxMessage.Status.PENDING,
+                    claimed_at__isnull=True,
+                )
+                .order_by('created_at')
+                .first()
+            )
+
+        if message is None or not self._merge_events(message, events):
+            message = self.model(
+                channel=channel,
+                recipient=recipient,
+                group_key=OutboxMessage.DIGEST if digest_interval > 0 or len(events) > 1 else '',
+                events=list(events),
+                next_attempt_at=timezone.now() + timedelta(seconds=max(digest_interval, 0)),
+            )
+            message.render()
+            message.save()
+        return message
+
+
+class OutboxMessage(models.Model):
+    """
+    Model representing a notification message waiting to be delivered. Rows
+    are written in the same transaction as the ticket change that triggers
+    them and delivered by the deliver_notifications worker.
+    """
+
+    class Channel(models.TextChoices):
+        EMAIL = 'email', _('Email')
+        WEBHOOK = 'webhook', _('Webhook')
+
+    class Status(models.TextChoices):
+        PENDING = 'Pending', _('Pending')
+        SENT = 'Sent', _('Sent')
+        FAILED = 'Failed', _('Failed')
+
+    # Group key of the messages merging several events into one
+    DIGEST = 'digest'
+
+    channel = models.CharField(max_length=10, choices=Channel.choices)
+    recipient = models.TextField()
+    subject = models.TextField(blank=True)
+    body = models.TextField()
+    status = models.CharField(
+        max_length=10, choices=Status.choices, default=Status.PENDING
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    # The events merged into the message, and the key of the ticket or digest
+    # they are merged by
+    group_key = models.CharField(max_length=100, blank=True)
+    events = models.JSONField(default=list)
+
+    objects = OutboxMessageQuerySet.as_manager()
+
+    def __str__(self):
+        return f"{self.channel} to {self.recipient} ({self.status})"
+
+    def render(self):
+        """Render the subject and body of the message from its events."""
+        context = self.events[0]['context']
+        if self.channel == self.Channel.EMAIL:
+            messages, field = EMAIL_MESSAGES, 'message'
+            merged = EMAIL_DIGEST if self.group_key == self.DIGEST else EMAIL_UPDATES
         else:
-            print(f"Invalid message_type: {message_type}")
-            print(f"Valid message_types: {', '.join(WEBHOOK_MESSAGES.keys())}")
-        return {}
+            messages, field = WEBHOOK_MESSAGES, 'text'
+            merged = WEBHOOK_DIGEST if self.group_key == self.DIGEST else WEBHOOK_UPDATES
+
+        if len(self.events) == 1:
+            message = messages[self.events[0]['type']]
+            subject = message.get('subject', '').format(**context)
+            body = message[field].format(**context)
+        else:
+            prefix = '            - ' if self.channel == self.Channel.EMAIL else '- '
+            updates = '\n'.join(
+                prefix + messages[event['type']]['summary'].format(**event['context'])
+                for event in self.events
+            )
+            subject = merged.get('subject', '').format(count=len(self.events), **context)
+            body = merged[field].format(updates=updates, count=len(self.events), **context)
+
+        self.subject = subject
+        self.body = body if self.channel == self.Channel.EMAIL else json.dumps({'text': body})
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outbox_due_idx'),
+            # Pending messages that events can still be merged into
+            models.Index(
+                fields=['recipient', 'group_key'],
+                condition=models.Q(claimed_at__isnull=True),
+                name='outbox_unclaimed_group_idx',
+            ),
+        ]
+
+
+class ExportJob(models.Model):
+    """
+    Model representing a ticket export run in the background by the
+    run_export_jobs worker. The export is written gzip-compressed under
+    MEDIA_ROOT and can be downloaded in ranges.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = 'Pending', _('Pending')
+        RUNNING = 'Running', _('Running')
+        FINISHED = 'Finished', _('Finished')
+        FAILED = 'Failed', _('Failed')
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4)
+    requested_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='export_jobs')
+    start_date = models.DateField()
+    end_date = models.DateField()
+    format = models.CharField(
+        max_length=10,
+        choices=[(name, export_format.label) for name, export_format in EXPORT_FORMATS.items()],
+        default='csv',
+    )
+
+    # Hash of the export parameters, the centres visible to the requester
+    # and the ticket data generation, used to reuse finished exports
+    params_hash = models.CharField(max_length=64)
+    visibility_key = models.CharField(max_length=64)
+
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    total_rows = models.PositiveIntegerField(null=True, blank=True)
+    rows_written = models.PositiveIntegerField(default=0)
+    file = models.FileField(upload_to='exports/', blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    # Renewed by the worker running the job after every chunk of rows
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Export {self.start_date} to {self.end_date} ({self.status})"
+
+    @property
+    def progress(self):
+        """Return the percentage of rows written so far."""
+        if self.status == self.Status.FINISHED:
+            return 100
+        if not self.total_rows:
+            return 0
+        return min(int(self.rows_written * 100 / self.total_rows), 100)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['params_hash', 'created_at'], name='export_params_idx'),
+            models.Index(fields=['status', 'created_at'], name='export_status_idx'),
+        ]
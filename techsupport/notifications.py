@@ -1,6 +1,7 @@
 # Definitions for email messages
 EMAIL_MESSAGES = {
     'Ticket Creation': {
+        'summary': "Support Ticket #{ticket_number} was received.",
         'subject': "Support Ticket #{ticket_number} Received",
         'message': """
             Dear {user_name},
@@ -28,6 +29,7 @@ EMAIL_MESSAGES = {
         """
     },
     'Status Change': {
+        'summary': "The status of Support Ticket #{ticket_number} was changed to {status}.",
         'subject': "Support Ticket #{ticket_number} Status Change",
         'message': """
             Dear {user_name},
@@ -50,6 +52,7 @@ EMAIL_MESSAGES = {
         """
     },
     'Resolution': {
+        'summary': "Support Ticket #{ticket_number} was resolved.",
         'subject': "Support Ticket #{ticket_number} Resolved",
         'message': """
             Dear {user_name},
@@ -72,6 +75,7 @@ EMAIL_MESSAGES = {
         """
     },
     'Assignment': {
+        'summary': "Support Ticket #{ticket_number} was assigned to {assigned_to}.",
         'subject': "Support Ticket #{ticket_number} Assigned",
         'message': """
             Dear {user_name},
@@ -98,6 +102,7 @@ EMAIL_MESSAGES = {
 # Definitions for webhook messages
 WEBHOOK_MESSAGES = {
     'Ticket Creation': {
+        'summary': "Support Ticket *#{ticket_number}* was created at *{centre}* by {user}",
         'text': "A Support Ticket has been created at *{centre}*\n"
                 "*Title:* {title}\n"
                 "*Category:* {category}\n"
@@ -107,19 +112,81 @@ WEBHOOK_MESSAGES = {
                 "*by:* {user}"
     },
     'Status Change': {
+        'summary': "The status of Support Ticket *#{ticket_number}* was changed to *{status}* by {user}",
         'text': "The status of Support Ticket *#{ticket_number}* has been changed to *{status}*.\n"
                 "*Title:* {title}\n"
                 "*Centre:* {centre}\n"
                 "*by:* {user}"
     },
     'Resolution': {
+        'summary': "Support Ticket *#{ticket_number}* was resolved by {user}",
         'text': "Support Ticket *#{ticket_number}* has been resolved.\n"
                 "*Title:* {title}\n"
                 "*Centre:* {centre}\n"
                 "*by:* {user}"
     },
     'Assignment': {
+        'summary': "Support Ticket *#{ticket_number}* was assigned to {assigned_to} by {user}",
         'text': "A Support Ticket *Title:* \"{title}\" at *{centre}* has been assigned to {assigned_to}.\n"
                 "*by:* {user}"
     },
 }
+
+# Definitions for messages merging several events: the updates to one ticket
+# within the coalescing window, or a recipient's updates within a digest
+# interval. {updates} lists the summary of each event.
+EMAIL_UPDATES = {
+    'subject': "Support Ticket #{ticket_number} Updated",
+    'message': """
+            Dear {user_name},
+
+            There have been several updates to your Support Ticket #{ticket_number}:
+
+{updates}
+
+            - Centre: {centre}
+            - Title: {title}
+            - Category: {category}
+            - Subcategory: {subcategory}
+
+            Thank you for your patience during this process.
+
+            Sincerely,
+            
+            Edulution
+            Technical Support Team
+            techsupport@edulution.org
+            +260 96 9929538 / +260 96 1255558
+        """
+}
+
+EMAIL_DIGEST = {
+    'subject': "Support Ticket Updates ({count})",
+    'message': """
+            Dear {user_name},
+
+            Here is a summary of the latest updates to your Support Tickets:
+
+{updates}
+
+            Thank you for your patience during this process.
+
+            Sincerely,
+            
+            Edulution
+            Technical Support Team
+            techsupport@edulution.org
+            +260 96 9929538 / +260 96 1255558
+        """
+}
+
+WEBHOOK_UPDATES = {
+    'text': "Support Ticket *#{ticket_number}* at *{centre}* has been updated\n"
+            "*Title:* {title}\n"
+            "{updates}"
+}
+
+WEBHOOK_DIGEST = {
+    'text': "*{count} Support Ticket updates*\n"
+            "{updates}"
+}
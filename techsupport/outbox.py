@@ -0,0 +1,115 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .emails import get_email_dispatcher
+from .models import Notification, OutboxMessage
+from .webhooks import get_webhook_transport
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_MAX_ATTEMPTS = 5
+
+# Failed deliveries are retried after 30s, 1m, 2m, ... up to an hour
+RETRY_BASE_DELAY = 30
+RETRY_MAX_DELAY = 60 * 60
+
+# Claimed messages become due again if a worker dies before delivering them
+CLAIM_TIMEOUT = 5 * 60
+
+
+def get_retry_delay(attempts):
+    """Return the number of seconds to wait before the next delivery attempt."""
+    return min(RETRY_BASE_DELAY * 2 ** (attempts - 1), RETRY_MAX_DELAY)
+
+
+def claim_messages(batch_size):
+    """
+    Claim a batch of due outbox messages for this worker by pushing back their
+    next attempt, so that concurrent workers do not deliver them twice. Once
+    claimed, no more events are merged into a message.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        due_messages = OutboxMessage.objects.filter(
+            status=OutboxMessage.Status.PENDING, next_attempt_at__lte=now
+        ).order_by("next_attempt_at", "id")
+        if connection.features.has_select_for_update_skip_locked:
+            due_messages = due_messages.select_for_update(skip_locked=True)
+        messages = list(due_messages[:batch_size])
+        OutboxMessage.objects.filter(pk__in=[message.pk for message in messages]).update(
+            next_attempt_at=now + timedelta(seconds=CLAIM_TIMEOUT), claimed_at=now
+        )
+    return messages
+
+
+def record_success(message):
+    message.status = OutboxMessage.Status.SENT
+    message.attempts += 1
+    message.sent_at = timezone.now()
+    message.last_error = ""
+    message.save(update_fields=["status", "attempts", "sent_at", "last_error"])
+    Notification.objects.filter(outbox_message=message).update(
+        notification_status="Successful"
+    )
+
+
+def record_failure(message, error, max_attempts):
+    """Schedule a retry of the message, or give up after max_attempts."""
+    message.attempts += 1
+    message.last_error = str(error)
+    if message.attempts >= max_attempts:
+        message.status = OutboxMessage.Status.FAILED
+        Notification.objects.filter(outbox_message=message).update(
+            notification_status="Failed"
+        )
+    else:
+        message.next_attempt_at = timezone.now() + timedelta(
+            seconds=get_retry_delay(message.attempts)
+        )
+    message.save(update_fields=["status", "attempts", "last_error", "next_attempt_at"])
+    return message.status == OutboxMessage.Status.FAILED
+
+
+def deliver_messages(batch_size=DEFAULT_BATCH_SIZE, max_attempts=DEFAULT_MAX_ATTEMPTS):
+    """
+    Deliver one batch of due outbox messages and record the results.
+
+    Returns a dictionary with the number of messages claimed, sent, scheduled
+    for a retry and failed for good.
+    """
+    messages = claim_messages(batch_size)
+    results = {"claimed": len(messages), "sent": 0, "retried": 0, "failed": 0}
+
+    emails = [m for m in messages if m.channel == OutboxMessage.Channel.EMAIL]
+    webhooks = [m for m in messages if m.channel == OutboxMessage.Channel.WEBHOOK]
+
+    # Emails go out over the persistent connection of the email dispatcher
+    errors = get_email_dispatcher().send_many(
+        EmailMessage(message.subject, message.body, settings.EMAIL_HOST_USER, [message.recipient])
+        for message in emails
+    )
+    outcomes = list(zip(emails, errors))
+
+    # Webhooks go out concurrently over the shared pooled transport
+    errors = get_webhook_transport().send_many(
+        (message.recipient, message.body) for message in webhooks
+    )
+    outcomes.extend(zip(webhooks, errors))
+
+    for message, error in outcomes:
+        if error is None:
+            record_success(message)
+            results["sent"] += 1
+            continue
+        logger.error(f"Failed to deliver {message}: {error}")
+        if record_failure(message, error, max_attempts):
+            results["failed"] += 1
+        else:
+            results["retried"] += 1
+    return results
@@ -0,0 +1,144 @@
+import base64
+import json
+import uuid
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+
+class InvalidCursor(Exception):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+class CursorPage:
+    """A single page of results returned by the CursorPaginator."""
+
+    def __init__(self, object_list, paginator, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __repr__(self):
+        return f"<CursorPage of {len(self)} objects>"
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """
+    Keyset paginator for support tickets ordered newest first.
+
+    Pages are seeked with a WHERE clause on (date_submitted, id) instead of an
+    OFFSET, so every page costs the same no matter how deep it is. Cursors are
+    opaque url-safe tokens that point at the first or last row of a page.
+    When with_count is False the total number of rows is never computed, so
+    page latency stays flat as the table grows.
+    """
+
+    def __init__(self, queryset, per_page, with_count=True):
+        self.queryset = queryset.order_by("-date_submitted", "-id")
+        self.per_page = int(per_page)
+        self.with_count = with_count
+        self._count = None
+
+    @property
+    def count(self):
+        """Return the total number of rows, or None when counting is disabled."""
+        if not self.with_count:
+            return None
+        if self._count is None:
+            self._count = self.queryset.count()
+        return self._count
+
+    @staticmethod
+    def encode_cursor(obj, reverse=False):
+        """Return an opaque token pointing at the given object."""
+        position = {
+            "d": obj.date_submitted.isoformat(),
+            "i": str(obj.id),
+            "r": reverse,
+        }
+        token = base64.urlsafe_b64encode(json.dumps(position).encode("utf-8"))
+        return token.decode("ascii").rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor):
+        """Return the (date_submitted, id, reverse) position of a token."""
+        try:
+            padding = "=" * (-len(cursor) % 4)
+            position = json.loads(base64.urlsafe_b64decode(cursor + padding))
+            date_submitted = parse_datetime(position["d"])
+            if date_submitted is None:
+                raise ValueError("Invalid date in cursor")
+            ticket_id = uuid.UUID(position["i"])
+            return date_submitted, ticket_id, bool(position["r"])
+        except (TypeError, ValueError, KeyError, AttributeError) as e:
+            raise InvalidCursor(str(e))
+
+    def page(self, cursor=None):
+        """
+        Return the page that starts after the given cursor, or the first page
+        when no cursor is given.
+        """
+        if not cursor:
+            return self._page_after(None)
+
+        date_submitted, ticket_id, reverse = self.decode_cursor(cursor)
+        if reverse:
+            return self._page_before(date_submitted, ticket_id)
+        return self._page_after((date_submitted, ticket_id))
+
+    def _page_after(self, position):
+        queryset = self.queryset
+        if position is not None:
+            date_submitted, ticket_id = position
+            queryset = queryset.filter(
+                Q(date_submitted__lt=date_submitted)
+                | Q(date_submitted=date_submitted, id__lt=ticket_id)
+            )
+
+        # Fetch one extra row to find out whether there is a next page
+        rows = list(queryset[: self.per_page + 1])
+        has_next = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+
+        next_cursor = self.encode_cursor(rows[-1]) if has_next else None
+        previous_cursor = None
+        if position is not None and rows:
+            previous_cursor = self.encode_cursor(rows[0], reverse=True)
+        return CursorPage(rows, self, next_cursor, previous_cursor)
+
+    def _page_before(self, date_submitted, ticket_id):
+        queryset = self.queryset.filter(
+            Q(date_submitted__gt=date_submitted)
+            | Q(date_submitted=date_submitted, id__gt=ticket_id)
+        ).reverse()
+
+        # Fetch one extra row to find out whether there is a previous page
+        rows = list(queryset[: self.per_page + 1])
+        has_previous = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        rows.reverse()
+
+        next_cursor = self.encode_cursor(rows[-1]) if rows else None
+        previous_cursor = None
+        if has_previous:
+            previous_cursor = self.encode_cursor(rows[0], reverse=True)
+        return CursorPage(rows, self, next_cursor, previous_cursor)
@@ -0,0 +1,59 @@
+from . import caching
+
+# Generation of the permissions, bumped whenever a permission changes
+PERMISSIONS = "permissions"
+
+# Seconds after which each process reloads the permissions
+PERMISSIONS_CACHE_TIMEOUT = 5 * 60
+
+
+def _load_role_permissions(model):
+    """
+    Resolve the permissions defined for every role in model.PERMISSIONS into
+    a frozenset of permission names ("app_label.codename"), with one query
+    for all roles.
+    """
+    from django.contrib.auth.models import Permission
+
+    prefix = f"{model.__name__.lower()}_"
+    codenames = {
+        role: {prefix + name for name in permissions}
+        for role, permissions in model.PERMISSIONS.items()
+    }
+    all_codenames = set().union(*codenames.values())
+    roles = [role for role, _ in model.RoleType.choices]
+
+    role_permissions = {role: set() for role in roles}
+    defined = Permission.objects.filter(codename__in=all_codenames).values_list(
+        "content_type__app_label", "codename"
+    )
+    for app_label, codename in defined:
+        for role, role_codenames in codenames.items():
+            if codename in role_codenames:
+                role_permissions.setdefault(role, set()).add(f"{app_label}.{codename}")
+
+    return {role: frozenset(permissions) for role, permissions in role_permissions.items()}
+
+
+# Role permissions of each model with a PERMISSIONS mapping, filled as the
+# models are first used
+_role_permissions = caching.GenerationCachedValue(
+    PERMISSIONS, lambda generation: {}, PERMISSIONS_CACHE_TIMEOUT
+)
+
+
+def get_role_permissions(model, role):
+    """
+    Return the frozenset of permission names of a role. The permissions of
+    every role are loaded once per process and reloaded after a permission
+    changes, or PERMISSIONS_CACHE_TIMEOUT seconds after loading.
+    """
+    role_permissions = _role_permissions.get()
+    if model not in role_permissions:
+        role_permissions[model] = _load_role_permissions(model)
+    return role_permissions[model].get(role, frozenset())
+
+
+def invalidate():
+    """Forget the role permissions in every process."""
+    _role_permissions.invalidate()
@@ -0,0 +1,105 @@
+from collections import namedtuple
+
+from django.core.cache import cache
+
+from . import caching
+
+# Generation of the reference data, bumped whenever a country, region,
+# centre, category or subcategory changes
+REFERENCE_DATA = "reference_data"
+
+# Seconds after which reference data is dropped from the cache and from the
+# memory of each process
+REFERENCE_CACHE_TIMEOUT = 5 * 60
+
+ReferenceData = namedtuple(
+    "ReferenceData",
+    ["countries", "regions", "centres", "categories", "subcategories", "subcategories_by_category"],
+)
+
+def _cache_key(generation):
+    return f"techsupport:reference_data:{generation}"
+
+
+def load_reference_data():
+    """
+    Load the countries, regions, centres, categories and subcategories with
+    one query per model, sorted by name.
+    """
+    from .models import Category, Centre, Country, Region, SubCategory
+
+    subcategories = tuple(SubCategory.objects.order_by("name"))
+    subcategories_by_category = {}
+    for subcategory in subcategories:
+        subcategories_by_category.setdefault(str(subcategory.category_id), []).append(
+            subcategory
+        )
+    return ReferenceData(
+        countries=tuple(Country.objects.order_by("name")),
+        regions=tuple(Region.objects.select_related("country").order_by("name")),
+        centres=tuple(Centre.objects.select_related("region__country").order_by("name")),
+        categories=tuple(Category.objects.order_by("name")),
+        subcategories=subcategories,
+        subcategories_by_category=subcategories_by_category,
+    )
+
+
+def _get_cached_reference_data(generation):
+    key = _cache_key(generation)
+    data = cache.get(key)
+    if data is None:
+        data = load_reference_data()
+        cache.set(key, data, REFERENCE_CACHE_TIMEOUT)
+    return data
+
+
+_reference_data = caching.GenerationCachedValue(
+    REFERENCE_DATA, _get_cached_reference_data, REFERENCE_CACHE_TIMEOUT
+)
+
+
+def get_reference_data():
+    """
+    Return the reference data. It is kept in memory by every process and
+    loaded from the shared cache, or from the database by the first process
+    that needs it, after it changes or expires.
+    """
+    return _reference_data.get()
+
+
+def warm_up():
+    """Load the reference data into the shared cache ahead of the first request."""
+    generation = caching.get_generation(REFERENCE_DATA)
+    cache.set(_cache_key(generation), load_reference_data(), REFERENCE_CACHE_TIMEOUT)
+    _reference_data.clear()
+    return _reference_data.get()
+
+
+def invalidate():
+    """Forget the reference data in every process."""
+    _reference_data.invalidate()
+
+
+def get_regions(country_id=None):
+    """Return the regions, optionally only those of a country."""
+    regions = get_reference_data().regions
+    if country_id is not None:
+        regions = tuple(region for region in regions if region.country_id == country_id)
+    return regions
+
+
+def get_centres(country_id=None):
+    """Return the centres, optionally only those of a country."""
+    centres = get_reference_data().centres
+    if country_id is not None:
+        centres = tuple(centre for centre in centres if centre.region.country_id == country_id)
+    return centres
+
+
+def get_categories():
+    return get_reference_data().categories
+
+
+def get_subcategories(category_id):
+    """Return the subcategories of a category."""
+    return tuple(get_reference_data().subcategories_by_category.get(str(category_id), ()))
@@ -0,0 +1,108 @@
+from django.db.models.query import BaseIterable, ValuesListIterable
+from django.utils import timezone
+
+
+def format_ticket_age(date_submitted, now):
+    """Return how long ago a ticket was submitted, e.g. "3 days ago"."""
+    age = now - date_submitted
+    if age.days >= 1:
+        return f"{age.days} days ago"
+    hours, remainder = divmod(age.seconds, 3600)
+    if hours > 0:
+        return f"{hours} hrs ago"
+    return f"{remainder // 60} mins ago"
+
+
+class TicketRow:
+    """
+    Read-only support ticket holding only the columns shown by the ticket
+    lists. The related names are joined in SQL and the age is worked out
+    when the row is loaded, so templates never touch the database.
+    """
+
+    # Field paths loaded for each row, in the order __init__ unpacks them
+    FIELDS = (
+        "id",
+        "ticket_number",
+        "title",
+        "status",
+        "priority",
+        "date_submitted",
+        "date_resolved",
+        "centre__acronym",
+        "centre__name",
+        "submitted_by_id",
+        "submitted_by__username",
+        "resolved_by_id",
+        "resolved_by__first_name",
+        "resolved_by__last_name",
+    )
+
+    __slots__ = (
+        "id",
+        "ticket_number",
+        "title",
+        "status",
+        "priority",
+        "date_submitted",
+        "date_resolved",
+        "centre",
+        "submitted_by_id",
+        "submitted_by",
+        "resolved_by",
+        "ticket_age",
+    )
+
+    def __init__(self, values, now):
+        (
+            self.id,
+            self.ticket_number,
+            self.title,
+            self.status,
+            self.priority,
+            self.date_submitted,
+            self.date_resolved,
+            centre_acronym,
+            centre_name,
+            self.submitted_by_id,
+            self.submitted_by,
+            resolved_by_id,
+            resolved_by_first_name,
+            resolved_by_last_name,
+        ) = values
+        # Rendered like Centre.__str__ and User.get_full_name
+        self.centre = f"{centre_acronym} - {centre_name}"
+        self.resolved_by = None
+        if resolved_by_id is not None:
+            self.resolved_by = f"{resolved_by_first_name} {resolved_by_last_name}".strip()
+        self.ticket_age = format_ticket_age(self.date_submitted, now)
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+    def __eq__(self, other):
+        return isinstance(other, TicketRow) and self.id == other.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def __repr__(self):
+        return f"<TicketRow {self.ticket_number}>"
+
+    def refresh_age(self, now=None):
+        """Work out the age again, e.g. for rows kept in a cache."""
+        self.ticket_age = format_ticket_age(self.date_submitted, now or timezone.now())
+
+
+class TicketRowIterable(BaseIterable):
+    """Yield a TicketRow for each row of a values_list(*TicketRow.FIELDS) queryset."""
+
+    def __iter__(self):
+        now = timezone.now()
+        rows = ValuesListIterable(self.queryset, self.chunked_fetch, self.chunk_size)
+        for values in rows:
+            yield TicketRow(values, now)
@@ -0,0 +1,285 @@
+import functools
+import re
+import sqlite3
+from contextlib import closing
+
+from django.db import connections, DEFAULT_DB_ALIAS
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+
+class BaseSearchBackend:
+    """
+    Base class for the support ticket search backends.
+
+    A backend indexes the searchable text of a ticket (its title and the
+    names of its category, subcategory, centre, region and submitter) in the
+    database, keeps the index in sync when tickets are saved and filters
+    ticket querysets against it.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    @staticmethod
+    def get_terms(query):
+        """Split a search query into the words to match."""
+        return re.findall(r"\w+", query)
+
+    def install(self):
+        """Create the database structures used by the backend."""
+
+    def index_ticket(self, ticket):
+        """Update the search index for a single ticket."""
+
+    def remove_ticket(self, ticket):
+        """Remove a single ticket from the search index."""
+
+    def rebuild(self):
+        """Rebuild the search index for every ticket."""
+
+    def reindex_related(self, model, pks):
+        """
+        Update the search index for every ticket whose searchable text holds
+        the name of one of the given categories, subcategories, centres,
+        regions or users, such as after they were renamed.
+        """
+
+    def search(self, queryset, query, rank=False):
+        """
+        Filter the tickets in queryset by the search query.
+
+        A query made only of digits is looked up on the unique ticket number.
+        When rank is True the tickets are annotated with a search_rank and
+        ordered by it, best match first.
+        """
+        query = query.strip()
+        if query.isdigit():
+            return queryset.filter(ticket_number=int(query))
+
+        terms = self.get_terms(query)
+        if not terms:
+            return queryset.none()
+        return self.filter(queryset, terms, rank)
+
+    def filter(self, queryset, terms, rank):
+        raise NotImplementedError
+
+    def _document_sql(self):
+        """
+        Return the FROM clause joining a ticket to the names that make up its
+        searchable text.
+        """
+        from .models import Category, SubCategory, Centre, Region, User, SupportTicket
+
+        qn = self.connection.ops.quote_name
+        return (
+            f"{qn(SupportTicket._meta.db_table)} t "
+            f"INNER JOIN {qn(Category._meta.db_table)} c ON c.id = t.category_id "
+            f"INNER JOIN {qn(SubCategory._meta.db_table)} s ON s.id = t.subcategory_id "
+            f"INNER JOIN {qn(Centre._meta.db_table)} ce ON ce.id = t.centre_id "
+            f"INNER JOIN {qn(Region._meta.db_table)} r ON r.id = ce.region_id "
+            f"INNER JOIN {qn(User._meta.db_table)} u ON u.id = t.submitted_by_id"
+        )
+
+    def _related_where(self, model, pks):
+        """
+        Return the WHERE clause and parameters matching the tickets joined to
+        the given objects in the FROM clause of _document_sql().
+        """
+        columns = {
+            "category": "t.category_id",
+            "subcategory": "t.subcategory_id",
+            "centre": "t.centre_id",
+            "region": "ce.region_id",
+            "user": "t.submitted_by_id",
+        }
+        placeholders = ", ".join(["%s"] * len(pks))
+        params = [model._meta.pk.get_db_prep_value(pk, self.connection) for pk in pks]
+        return f"WHERE {columns[model._meta.model_name]} IN ({placeholders})", params
+
+    def _ticket_id(self, ticket):
+        """Return the primary key of a ticket as stored in the database."""
+        return ticket._meta.pk.get_db_prep_value(ticket.pk, self.connection)
+
+
+class LikeSearchBackend(BaseSearchBackend):
+    """
+    Fallback backend for databases without full-text search support. Every
+    term must appear somewhere in the ticket's searchable text.
+    """
+
+    def filter(self, queryset, terms, rank):
+        for term in terms:
+            queryset = queryset.filter(
+                Q(title__icontains=term)
+                | Q(category__name__icontains=term)
+                | Q(subcategory__name__icontains=term)
+                | Q(centre__name__icontains=term)
+                | Q(centre__region__name__icontains=term)
+                | Q(submitted_by__username__icontains=term)
+            )
+        return queryset
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """
+    Search backend for PostgreSQL, backed by the search_vector column and GIN
+    index that SupportTicket declares on PostgreSQL.
+    """
+
+    column = "search_vector"
+    config = "simple"
+
+    def _table(self):
+        from .models import SupportTicket
+
+        return self.connection.ops.quote_name(SupportTicket._meta.db_table)
+
+    def _update_sql(self, where=""):
+        # The title weighs more than the category names, which weigh more
+        # than the location and submitter names.
+        return (
+            f"UPDATE {self._table()} SET {self.column} = d.document "
+            f"FROM (SELECT t.id, "
+            f"setweight(to_tsvector('{self.config}', coalesce(t.title, '')), 'A') || "
+            f"setweight(to_tsvector('{self.config}', c.name || ' ' || s.name), 'B') || "
+            f"setweight(to_tsvector('{self.config}', "
+            f"ce.name || ' ' || r.name || ' ' || u.username), 'C') AS document "
+            f"FROM {self._document_sql()} {where}) d "
+            f"WHERE {self._table()}.id = d.id"
+        )
+
+    def index_ticket(self, ticket):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                self._update_sql() + " AND d.id = %s", [self._ticket_id(ticket)]
+            )
+
+    def rebuild(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(self._update_sql())
+
+    def reindex_related(self, model, pks):
+        if not pks:
+            return
+        where, params = self._related_where(model, pks)
+        with self.connection.cursor() as cursor:
+            cursor.execute(self._update_sql(where), params)
+
+    def filter(self, queryset, terms, rank):
+        tsquery = " & ".join(f"{term}:*" for term in terms)
+        vector = f"{self._table()}.{self.column}"
+        queryset = queryset.annotate(
+            search_match=RawSQL(
+                f"{vector} @@ to_tsquery('{self.config}', %s)",
+                [tsquery],
+                output_field=BooleanField(),
+            )
+        ).filter(search_match=True)
+        if rank:
+            queryset = queryset.annotate(
+                search_rank=RawSQL(
+                    f"ts_rank({vector}, to_tsquery('{self.config}', %s))",
+                    [tsquery],
+                    output_field=FloatField(),
+                )
+            ).order_by("-search_rank")
+        return queryset
+
+
+class SQLiteSearchBackend(BaseSearchBackend):
+    """
+    Search backend for SQLite, backed by an FTS5 shadow table holding the
+    searchable text of each ticket. The rowid of the shadow table is the
+    ticket number, so index updates and lookups go through integer keys.
+    """
+
+    table = "techsupport_supportticket_fts"
+    columns = ("title", "category", "subcategory", "centre", "region", "submitted_by")
+    # bm25() weights for the indexed columns
+    weights = (10, 5, 5, 2, 2, 1)
+
+    def install(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} "
+                f"USING fts5({', '.join(self.columns)})"
+            )
+
+    def _insert_sql(self, verb="INSERT"):
+        return (
+            f"{verb} INTO {self.table} (rowid, {', '.join(self.columns)}) "
+            f"SELECT t.ticket_number, coalesce(t.title, ''), c.name, s.name, "
+            f"ce.name, r.name, u.username FROM {self._document_sql()}"
+        )
+
+    def index_ticket(self, ticket):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {self.table} WHERE rowid = %s", [ticket.ticket_number]
+            )
+            cursor.execute(
+                self._insert_sql() + " WHERE t.id = %s", [self._ticket_id(ticket)]
+            )
+
+    def remove_ticket(self, ticket):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {self.table} WHERE rowid = %s", [ticket.ticket_number]
+            )
+
+    def rebuild(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table}")
+            cursor.execute(self._insert_sql())
+
+    def reindex_related(self, model, pks):
+        if not pks:
+            return
+        where, params = self._related_where(model, pks)
+        # The index rows share the ticket numbers as rowids, so REPLACE
+        # swaps them in place
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"{self._insert_sql('INSERT OR REPLACE')} {where}", params)
+
+    def filter(self, queryset, terms, rank):
+        match = " ".join(f'"{term}"*' for term in terms)
+        queryset = queryset.filter(
+            ticket_number__in=RawSQL(
+                f"SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s",
+                [match],
+            )
+        )
+        if rank:
+            # bm25() scores better matches lower, so negate it to rank them first
+            weights = ", ".join(str(weight) for weight in self.weights)
+            table = self.connection.ops.quote_name(queryset.model._meta.db_table)
+            queryset = queryset.annotate(
+                search_rank=RawSQL(
+                    f"SELECT -bm25({self.table}, {weights}) FROM {self.table} "
+                    f"WHERE {self.table} MATCH %s "
+                    f"AND rowid = {table}.ticket_number",
+                    [match],
+                    output_field=FloatField(),
+                )
+            ).order_by("-search_rank")
+        return queryset
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def is_supported():
+        """Check whether the SQLite library was compiled with FTS5."""
+        with closing(sqlite3.connect(":memory:")) as connection:
+            options = connection.execute("PRAGMA compile_options").fetchall()
+        return ("ENABLE_FTS5",) in options
+
+
+def get_search_backend(using=DEFAULT_DB_ALIAS):
+    """Return the search backend for the given database connection."""
+    connection = connections[using]
+    if connection.vendor == "postgresql":
+        return PostgresSearchBackend(connection)
+    if connection.vendor == "sqlite" and SQLiteSearchBackend.is_supported():
+        return SQLiteSearchBackend(connection)
+    return LikeSearchBackend(connection)
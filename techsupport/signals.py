@@ -0,0 +1,135 @@
+from django.contrib.auth.models import Permission
+from django.db.models.signals import m2m_changed, post_delete, post_migrate, post_save
+from django.dispatch import receiver
+
+from . import caching, etags, permissions, reference, visibility
+from .allocators import get_ticket_number_allocator
+from .models import (
+    Category,
+    Centre,
+    Country,
+    Region,
+    SubCategory,
+    SupportTicket,
+    TicketRollup,
+    User,
+)
+from .search import get_search_backend
+
+
+@receiver(post_migrate)
+def install_search_backend(sender, using, **kwargs):
+    """Create the search index structures once the ticket table exists."""
+    if sender.name == "techsupport":
+        get_search_backend(using).install()
+
+
+@receiver(post_migrate)
+def install_ticket_number_allocator(sender, using, **kwargs):
+    """Create the ticket number sequence or counter once the tables exist."""
+    if sender.name == "techsupport":
+        get_ticket_number_allocator(using).install()
+
+
+@receiver(post_delete, sender=SupportTicket)
+def remove_ticket_from_search_index(sender, instance, using, **kwargs):
+    """Remove deleted tickets from the search index."""
+    get_search_backend(using).remove_ticket(instance)
+
+
+# Fields of the related objects whose values are copied into the search index
+SEARCHABLE_FIELDS = {
+    Category: {"name"},
+    SubCategory: {"name"},
+    Centre: {"name", "region"},
+    Region: {"name"},
+    User: {"username"},
+}
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=SubCategory)
+@receiver(post_save, sender=Centre)
+@receiver(post_save, sender=Region)
+@receiver(post_save, sender=User)
+def reindex_related_tickets(sender, instance, created, update_fields, using, **kwargs):
+    """Reindex the tickets whose searchable text holds the name of a changed object."""
+    if created:
+        return
+    # Saves of other fields, such as the last login of a user, change nothing
+    if update_fields is not None and not SEARCHABLE_FIELDS[sender].intersection(update_fields):
+        return
+    get_search_backend(using).reindex_related(sender, [instance.pk])
+
+
+@receiver(post_delete, sender=SupportTicket)
+def remove_ticket_from_rollups(sender, instance, **kwargs):
+    """Stop counting deleted tickets in the ticket rollups."""
+    rollup_key = getattr(instance, "_rollup_key", None) or instance.get_rollup_key()
+    TicketRollup.objects.increment(rollup_key, -1)
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_visibility(sender, instance, **kwargs):
+    """Forget the visible centres of a user whose role or location may have changed."""
+    visibility.invalidate_user(instance.pk)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def bump_users_generation(sender, **kwargs):
+    """Invalidate the pages that show users, such as the technicians of a ticket."""
+    caching.bump_generation(etags.USERS)
+
+
+@receiver(m2m_changed, sender=User.centres.through)
+def invalidate_user_centres_visibility(sender, instance, action, reverse, pk_set, **kwargs):
+    """Forget the visible centres of users whose centres changed."""
+    if not action.startswith("post_"):
+        return
+    if not reverse:
+        visibility.invalidate_user(instance.pk)
+    elif pk_set:
+        for user_id in pk_set:
+            visibility.invalidate_user(user_id)
+    else:
+        # A centre was cleared of all its users
+        visibility.bump_generation()
+
+
+@receiver(post_save, sender=Centre)
+@receiver(post_delete, sender=Centre)
+@receiver(post_save, sender=Region)
+@receiver(post_delete, sender=Region)
+def invalidate_all_visibility(sender, **kwargs):
+    """Forget the visible centres of every user when the centre hierarchy changes."""
+    visibility.bump_generation()
+
+
+@receiver(post_save, sender=Country)
+@receiver(post_delete, sender=Country)
+@receiver(post_save, sender=Region)
+@receiver(post_delete, sender=Region)
+@receiver(post_save, sender=Centre)
+@receiver(post_delete, sender=Centre)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=SubCategory)
+@receiver(post_delete, sender=SubCategory)
+def invalidate_reference_data(sender, **kwargs):
+    """Forget the cached reference data when any of it changes."""
+    reference.invalidate()
+
+
+@receiver(post_delete, sender=SupportTicket)
+def invalidate_deleted_ticket_caches(sender, instance, **kwargs):
+    """Invalidate the data cached from the tickets of a deleted ticket's centre."""
+    caching.bump_ticket_generations([instance.centre_id])
+
+
+@receiver(post_migrate)
+@receiver(post_save, sender=Permission)
+@receiver(post_delete, sender=Permission)
+def invalidate_role_permissions(sender, **kwargs):
+    """Reload the role permissions once a permission changes."""
+    permissions.invalidate()
@@ -0,0 +1,14 @@
+import statistics
+
+
+def summarize(latencies):
+    """Return the mean, median, 95th percentile and max of a list of timings."""
+    latencies = sorted(latencies)
+    if not latencies:
+        return {}
+    return {
+        "mean": statistics.mean(latencies),
+        "p50": latencies[int(0.50 * (len(latencies) - 1))],
+        "p95": latencies[int(0.95 * (len(latencies) - 1))],
+        "max": latencies[-1],
+    }
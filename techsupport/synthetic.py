@@ -0,0 +1,161 @@
+"""
+Reproducible synthetic support tickets for load testing.
+
+Each chunk of tickets is drawn from its own random generator seeded with the
+dataset seed and the chunk index, so the same seed gives the same tickets
+whether the chunks are generated in one process or many. The generators only
+use the standard library, so worker processes need no Django setup.
+"""
+import itertools
+import math
+import random
+import uuid
+from collections import namedtuple
+from datetime import timedelta
+
+# Ticket fields returned by generate_tickets, in order
+FIELDS = (
+    "id",
+    "date_submitted",
+    "date_resolved",
+    "status",
+    "priority",
+    "centre_id",
+    "submitted_by_id",
+    "assigned_to_id",
+    "resolved_by_id",
+    "category_id",
+    "subcategory_id",
+    "title",
+    "description",
+    "resolution_notes",
+)
+
+# Share of tickets in each status by ticket age: new tickets are mostly
+# still open while old ones are mostly resolved or closed
+STATUS_WEIGHTS = [
+    (timedelta(days=2), {"Open": 60, "In Progress": 30, "Resolved": 10, "Closed": 0}),
+    (timedelta(days=14), {"Open": 25, "In Progress": 25, "Resolved": 40, "Closed": 10}),
+    (None, {"Open": 4, "In Progress": 3, "Resolved": 63, "Closed": 30}),
+]
+PRIORITY_WEIGHTS = {"Low": 30, "Medium": 55, "High": 15}
+
+# Most tickets come in on weekdays during office hours
+WEEKEND_SHARE = 0.3
+MEAN_HOUR, HOUR_DEVIATION = 11, 2.5
+# Mean time to resolve a ticket
+MEAN_RESOLUTION_HOURS = 30
+
+TITLES = [
+    "Tablet won't charge",
+    "Screen is cracked",
+    "Kolibri won't load",
+    "No network",
+    "Router offline",
+    "Baseline sync fails",
+    "Laptop overheats",
+    "Forgot password",
+]
+DESCRIPTIONS = [
+    "The tablet does not turn on after charging overnight.",
+    "Learners cannot open the exercises in Kolibri since the last update.",
+    "The router lights are off and no device can connect.",
+    "The baseline results do not upload at the end of the session.",
+    "The laptop switches itself off after a few minutes of use.",
+]
+RESOLUTION_NOTES = [
+    "Replaced the charger.",
+    "Reinstalled Kolibri and resynced the channels.",
+    "Restarted the router and updated its firmware.",
+    "Cleared the app data and synced again.",
+]
+
+_STATUS_CHOICES = [
+    (limit, list(weights), list(itertools.accumulate(weights.values())))
+    for limit, weights in STATUS_WEIGHTS
+]
+_PRIORITIES = list(PRIORITY_WEIGHTS)
+_PRIORITY_WEIGHTS = list(itertools.accumulate(PRIORITY_WEIGHTS.values()))
+
+TicketPlan = namedtuple(
+    "TicketPlan",
+    [
+        "seed",
+        "start",
+        "end",
+        "centre_ids",
+        "centre_weights",
+        "coaches_by_centre",
+        "coach_ids",
+        "technician_ids",
+        "subcategories",
+        "subcategory_weights",
+    ],
+)
+
+
+def zipf_weights(count, exponent=1.0):
+    """
+    Return cumulative weights giving the item of rank n a share proportional
+    to 1 / n ** exponent, so a few items account for most of the draws.
+    """
+    return list(itertools.accumulate(1 / (rank**exponent) for rank in range(1, count + 1)))
+
+
+def _draw_date(rng, plan):
+    # Ticket volume grows over the period, so later dates are more likely
+    date = plan.start + (plan.end - plan.start) * math.sqrt(rng.random())
+    if date.weekday() >= 5 and rng.random() > WEEKEND_SHARE:
+        date -= timedelta(days=date.weekday() - 4)
+    hour = min(max(round(rng.gauss(MEAN_HOUR, HOUR_DEVIATION)), 6), 19)
+    return min(date.replace(hour=hour), plan.end)
+
+
+def generate_tickets(plan, index, count):
+    """Return count tickets of chunk index as tuples of the FIELDS values."""
+    rng = random.Random(f"{plan.seed}:{index}")
+    centre_ids = rng.choices(plan.centre_ids, cum_weights=plan.centre_weights, k=count)
+    subcategories = rng.choices(
+        plan.subcategories, cum_weights=plan.subcategory_weights, k=count
+    )
+    tickets = []
+    for centre_id, (subcategory_id, category_id) in zip(centre_ids, subcategories):
+        date_submitted = _draw_date(rng, plan)
+        age = plan.end - date_submitted
+        statuses, weights = next(
+            (statuses, weights)
+            for limit, statuses, weights in _STATUS_CHOICES
+            if limit is None or age < limit
+        )
+        status = rng.choices(statuses, cum_weights=weights)[0]
+
+        assigned_to_id = resolved_by_id = date_resolved = None
+        resolution_notes = ""
+        if status != "Open" or rng.random() < 0.3:
+            assigned_to_id = rng.choice(plan.technician_ids)
+        if status in ("Resolved", "Closed"):
+            resolved_by_id = assigned_to_id
+            hours = rng.expovariate(1 / MEAN_RESOLUTION_HOURS)
+            date_resolved = min(date_submitted + timedelta(hours=hours), plan.end)
+            resolution_notes = rng.choice(RESOLUTION_NOTES)
+
+        submitters = plan.coaches_by_centre.get(centre_id) or plan.coach_ids
+        tickets.append(
+            (
+                uuid.UUID(int=rng.getrandbits(128), version=4),
+                date_submitted,
+                date_resolved,
+                status,
+                rng.choices(_PRIORITIES, cum_weights=_PRIORITY_WEIGHTS)[0],
+                centre_id,
+                rng.choice(submitters),
+                assigned_to_id,
+                resolved_by_id,
+                category_id,
+                subcategory_id,
+                rng.choice(TITLES),
+                rng.choice(DESCRIPTIONS),
+                resolution_notes,
+            )
+        )
+    return tickets
@@ -18,4 +18,13 @@ def add_class(field, class_name):
         field.field.widget.attrs['class'] += f' {class_name}'
     else:
         field.field.widget.attrs['class'] = class_name
-    return field
\ No newline at end of file
+    return field
+
+@register.simple_tag(takes_context=True)
+def cursor_url(context, cursor):
+    query = context['request'].GET.copy()
+    if cursor:
+        query['cursor'] = cursor
+    else:
+        query.pop('cursor', None)
+    return f'?{query.urlencode()}'
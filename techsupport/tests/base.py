@@ -0,0 +1,57 @@
+from django.core.cache import cache
+from django.test import TestCase
+from techsupport.models import (
+    Country,
+    Region,
+    Centre,
+    Category,
+    SubCategory,
+    SupportTicket,
+)
+
+
+class TicketDataMixin:
+    """
+    Creates a centre and a subcategory to file tickets against. Test cases
+    set cls.user to the default submitter of create_ticket().
+    """
+
+    @classmethod
+    def create_ticket_data(cls):
+        cls.country = Country.objects.create(name="Zambia", code="ZM")
+        cls.region = Region.objects.create(name="Eastern Region", country=cls.country)
+        cls.centre = Centre.objects.create(name="Lumezi Primary", acronym="LDL", region=cls.region)
+        cls.category = Category.objects.create(name="Software", code="SW")
+        cls.subcategory = SubCategory.objects.create(name="Kolibri Issue", category=cls.category)
+
+    @classmethod
+    def create_ticket(cls, **kwargs):
+        kwargs.setdefault("status", SupportTicket.Status.OPEN)
+        kwargs.setdefault("centre", cls.centre)
+        if "submitted_by" not in kwargs:
+            kwargs["submitted_by"] = cls.user
+        kwargs.setdefault("category", cls.category)
+        kwargs.setdefault("subcategory", cls.subcategory)
+        kwargs.setdefault("description", "Description")
+        kwargs.setdefault("title", "Title")
+        return SupportTicket.objects.create(**kwargs)
+
+
+class TicketTestCase(TicketDataMixin, TestCase):
+    """
+    Test case with the ticket data of TicketDataMixin. Subclasses add the
+    users they need in setUpTestData. When login_username is set, that user
+    is logged in before each test, after the cache is cleared.
+    """
+
+    login_username = None
+    login_password = None
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_ticket_data()
+
+    def setUp(self):
+        cache.clear()
+        if self.login_username:
+            self.client.login(username=self.login_username, password=self.login_password)
@@ -0,0 +1,77 @@
+import threading
+from django.db import connection, connections, OperationalError
+from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from techsupport.allocators import CounterTicketNumberAllocator
+from techsupport.models import User, SupportTicket, TicketNumberCounter
+from techsupport.tests.base import TicketDataMixin, TicketTestCase
+
+
+class TicketNumberAllocatorTestCase(TicketTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.user = User.objects.create_user(username="coach1", password="testpassword")
+
+    def test_ticket_numbers_are_sequential(self):
+        first_ticket = self.create_ticket()
+        second_ticket = self.create_ticket()
+        self.assertEqual(second_ticket.ticket_number, first_ticket.ticket_number + 1)
+
+    def test_insert_path_does_not_aggregate(self):
+        with CaptureQueriesContext(connection) as context:
+            self.create_ticket()
+        for query in context.captured_queries:
+            self.assertNotIn("MAX(", query["sql"].upper())
+
+    def test_block_allocation(self):
+        allocator = CounterTicketNumberAllocator(block_size=10)
+        first_number = allocator.allocate()
+        with self.assertNumQueries(0):
+            numbers = [allocator.allocate() for _ in range(9)]
+        self.assertEqual(numbers, list(range(first_number + 1, first_number + 10)))
+        self.assertEqual(
+            TicketNumberCounter.objects.get(name=TicketNumberCounter.TICKET_NUMBER).value,
+            first_number + 9,
+        )
+
+    def test_counter_starts_after_existing_tickets(self):
+        ticket = self.create_ticket()
+        TicketNumberCounter.objects.all().delete()
+        allocator = CounterTicketNumberAllocator()
+        self.assertEqual(allocator.allocate(), ticket.ticket_number + 1)
+
+
+class ConcurrentTicketNumberTestCase(TicketDataMixin, TransactionTestCase):
+    def test_concurrent_inserts_get_unique_numbers(self):
+        self.create_ticket_data()
+        user = User.objects.create_user(username="coach1", password="testpassword")
+        errors = []
+
+        def create_tickets():
+            try:
+                created = 0
+                while created < 25:
+                    try:
+                        self.create_ticket(submitted_by=user)
+                        created += 1
+                    except OperationalError as e:
+                        # The shared cache of the in-memory SQLite test database
+                        # reports lock contention instead of waiting for the lock
+                        if "locked" not in str(e):
+                            raise
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=create_tickets) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        ticket_numbers = list(SupportTicket.objects.values_list("ticket_number", flat=True))
+        self.assertEqual(len(ticket_numbers), 200)
+        self.assertEqual(len(set(ticket_numbers)), 200)
@@ -0,0 +1,84 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from techsupport.api import DEFAULT_FIELDS
+from techsupport.models import Centre, User
+from techsupport.tests.base import TicketTestCase
+
+
+class TicketAPITestCase(TicketTestCase):
+    login_username = "superadmin"
+    login_password = "admin123"
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.other_centre = Centre.objects.create(name="Zwelisha", acronym="ZWE", region=cls.region)
+        cls.admin = User.objects.create_user(
+            username="superadmin", password="admin123", role="super_admin"
+        )
+        cls.coach = User.objects.create_user(username="coach", password="coach123", role="user")
+        cls.coach.centres.add(cls.centre)
+
+        for i in range(5):
+            cls.create_ticket(submitted_by=cls.coach, status="Open" if i % 2 else "Resolved")
+        cls.create_ticket(centre=cls.other_centre, submitted_by=cls.coach)
+
+    def get(self, **params):
+        response = self.client.get(reverse("api_tickets"), params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_default_fields(self):
+        data = self.get()
+        self.assertEqual(len(data["results"]), 6)
+        self.assertEqual(list(data["results"][0]), DEFAULT_FIELDS)
+        self.assertEqual(data["results"][0]["submitted_by"], "coach")
+        self.assertIsNone(data["next"])
+
+    def test_only_requested_fields_are_queried(self):
+        with CaptureQueriesContext(connection) as context:
+            data = self.get(fields="ticket_number,centre")
+        self.assertEqual(list(data["results"][0]), ["ticket_number", "centre"])
+        sql = context.captured_queries[-1]["sql"]
+        self.assertNotIn('"description"', sql)
+        self.assertNotIn('"title"', sql)
+
+    def test_unknown_fields(self):
+        response = self.client.get(reverse("api_tickets"), {"fields": "id,password"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("password", response.json()["error"])
+
+    def test_visibility(self):
+        self.client.login(username="coach", password="coach123")
+        data = self.get(fields="centre")
+        self.assertEqual({row["centre"] for row in data["results"]}, {"Lumezi Primary"})
+
+    def test_filters(self):
+        self.assertEqual(len(self.get(status="Open")["results"]), 3)
+        self.assertEqual(len(self.get(centre="Zwelisha")["results"]), 1)
+        self.assertEqual(len(self.get(region="Eastern Region")["results"]), 6)
+
+    def test_cursor_pagination(self):
+        ticket_numbers = []
+        url = f"{reverse('api_tickets')}?fields=ticket_number&limit=2"
+        while url:
+            data = self.client.get(url).json()
+            ticket_numbers += [row["ticket_number"] for row in data["results"]]
+            url = data["next"]
+        self.assertEqual(len(ticket_numbers), 6)
+        self.assertEqual(ticket_numbers, sorted(ticket_numbers, reverse=True))
+
+        second_page = self.get(fields="ticket_number", limit=2)["next"]
+        previous_page = self.client.get(second_page).json()["previous"]
+        data = self.client.get(previous_page).json()
+        self.assertEqual([row["ticket_number"] for row in data["results"]], ticket_numbers[:2])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse("api_tickets"), {"cursor": "invalid"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_login_required(self):
+        self.client.logout()
+        response = self.client.get(reverse("api_tickets"))
+        self.assertEqual(response.status_code, 302)
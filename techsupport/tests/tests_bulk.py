@@ -0,0 +1,137 @@
+from django.db import connection
+from django.db.models import Sum
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from techsupport.caching import get_scope_version
+from techsupport.models import (
+    Centre,
+    Notification,
+    OutboxMessage,
+    Region,
+    SupportTicket,
+    TicketRollup,
+    User,
+)
+from techsupport.tests.base import TicketTestCase
+
+
+@override_settings(
+    EMAIL_HOST_USER="support@example.com",
+    WEB_HOOK_URL="https://chat.example.com/webhook",
+    NOTIFICATION_COALESCE_WINDOW=0,
+    NOTIFICATION_DIGEST_INTERVAL=0,
+)
+class BulkTicketUpdateTestCase(TicketTestCase):
+    login_username = "technician"
+    login_password = "tech123"
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        other_region = Region.objects.create(name="Southern Region", country=cls.country)
+        cls.other_centre = Centre.objects.create(
+            name="Zwelisha", acronym="ZWE", region=other_region
+        )
+        cls.coach = User.objects.create_user(
+            username="coach", password="coach123", email="coach@example.com"
+        )
+        cls.other_coach = User.objects.create_user(
+            username="other_coach", password="coach123", email="other@example.com"
+        )
+        cls.technician = User.objects.create_user(
+            username="technician", password="tech123", role="technician"
+        )
+        cls.tickets = [
+            cls.create_ticket(submitted_by=cls.coach),
+            cls.create_ticket(submitted_by=cls.coach),
+            cls.create_ticket(centre=cls.other_centre, submitted_by=cls.other_coach),
+        ]
+
+    def post(self, **data):
+        data.setdefault("tickets", [ticket.pk for ticket in self.tickets])
+        return self.client.post(reverse("bulk_update_tickets"), data)
+
+    def rollup_counts(self):
+        rows = TicketRollup.objects.values_list("status").annotate(count=Sum("ticket_count"))
+        return {status: count for status, count in rows if count}
+
+    def test_resolve_in_one_update(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.post(action="status", status="Resolved")
+        self.assertRedirects(response, reverse("dashboard"), fetch_redirect_response=False)
+
+        table = SupportTicket._meta.db_table
+        updates = [q for q in context.captured_queries if q["sql"].startswith(f'UPDATE "{table}"')]
+        self.assertEqual(len(updates), 1)
+        for ticket in SupportTicket.objects.all():
+            self.assertEqual(ticket.status, "Resolved")
+            self.assertEqual(ticket.resolved_by, self.technician)
+            self.assertIsNotNone(ticket.date_resolved)
+            self.assertGreater(ticket.updated_at, self.tickets[0].updated_at)
+
+    def test_rollups_follow_the_status(self):
+        self.post(action="status", status="In Progress", tickets=[self.tickets[0].pk])
+        self.assertEqual(self.rollup_counts(), {"Open": 2, "In Progress": 1})
+        TicketRollup.objects.rebuild()
+        self.assertEqual(self.rollup_counts(), {"Open": 2, "In Progress": 1})
+
+    def test_notifications_are_batched(self):
+        self.post(action="status", status="Resolved")
+        self.assertEqual(Notification.objects.count(), 6)
+        emails = OutboxMessage.objects.filter(channel=OutboxMessage.Channel.EMAIL)
+        self.assertEqual(
+            sorted(emails.values_list("recipient", flat=True)),
+            ["coach@example.com", "other@example.com"],
+        )
+        self.assertEqual(len(emails.get(recipient="coach@example.com").events), 2)
+        webhook = OutboxMessage.objects.get(channel=OutboxMessage.Channel.WEBHOOK)
+        self.assertEqual(len(webhook.events), 3)
+        self.assertFalse(Notification.objects.filter(outbox_message=None).exists())
+
+    def test_priority_change_sends_webhook_only(self):
+        self.post(action="priority", priority="High")
+        self.assertEqual(SupportTicket.objects.filter(priority="High").count(), 3)
+        self.assertEqual(
+            set(OutboxMessage.objects.values_list("channel", flat=True)),
+            {OutboxMessage.Channel.WEBHOOK},
+        )
+
+    def test_other_status_changes_send_no_notifications(self):
+        # Like ticket_details, which only notifies when a ticket is resolved
+        self.post(action="status", status="In Progress")
+        self.assertEqual(SupportTicket.objects.filter(status="In Progress").count(), 3)
+        self.assertFalse(Notification.objects.exists())
+        self.assertFalse(OutboxMessage.objects.exists())
+
+    def test_assign_to_me(self):
+        self.post(action="assign", assigned_to=self.technician.pk)
+        self.assertEqual(SupportTicket.objects.filter(assigned_to=self.technician).count(), 3)
+
+    def test_unchanged_tickets_are_left_alone(self):
+        self.post(action="status", status="Resolved", tickets=[self.tickets[0].pk])
+        Notification.objects.all().delete()
+        self.post(action="status", status="Resolved")
+        self.assertEqual(Notification.objects.filter(ticket=self.tickets[0]).count(), 0)
+        self.assertEqual(Notification.objects.count(), 4)
+
+    def test_cached_scopes_are_invalidated(self):
+        version = get_scope_version([self.centre.pk])
+        self.post(action="priority", priority="High", tickets=[self.tickets[0].pk])
+        self.assertNotEqual(get_scope_version([self.centre.pk]), version)
+
+    def test_tickets_outside_the_scope_are_rejected(self):
+        admin = User.objects.create_user(
+            username="admin", password="admin123", role="admin", region=self.region
+        )
+        self.client.force_login(admin)
+        self.post(action="status", status="Resolved")
+        self.assertEqual(SupportTicket.objects.filter(status="Resolved").count(), 0)
+
+    def test_missing_value(self):
+        self.post(action="priority")
+        self.assertEqual(SupportTicket.objects.exclude(priority="Medium").count(), 0)
+
+    def test_users_cannot_update_in_bulk(self):
+        self.client.login(username="coach", password="coach123")
+        self.assertEqual(self.post(action="status", status="Resolved").status_code, 403)
@@ -0,0 +1,115 @@
+import tempfile
+
+from django.db import connection
+from django.http import QueryDict
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from techsupport.caching import get_dashboard_cache_key, get_scope_version
+from techsupport.models import Centre, SupportTicket, User
+from techsupport.tests.base import TicketTestCase
+from techsupport.visibility import ALL_CENTRES
+
+
+class DashboardCacheTestCase(TicketTestCase):
+    login_username = "coach"
+    login_password = "coach123"
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.other_centre = Centre.objects.create(name="Zwelisha", acronym="ZWE", region=cls.region)
+        cls.user = User.objects.create_user(username="coach", password="coach123", role="user")
+        cls.user.centres.add(cls.centre)
+        cls.other_coach = User.objects.create_user(
+            username="other_coach", password="coach123", role="user"
+        )
+        cls.other_coach.centres.add(cls.centre)
+
+    def get_dashboard(self, data=None):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse("dashboard"), data)
+        self.assertEqual(response.status_code, 200)
+        ticket_table = SupportTicket._meta.db_table
+        ticket_queries = [q for q in context.captured_queries if ticket_table in q["sql"]]
+        return response, len(ticket_queries)
+
+    def test_second_request_is_served_from_the_cache(self):
+        self.create_ticket()
+        response, ticket_queries = self.get_dashboard()
+        self.assertGreater(ticket_queries, 0)
+
+        response, ticket_queries = self.get_dashboard()
+        self.assertEqual(ticket_queries, 0)
+        self.assertEqual(response.context["ticket_statistics"]["total"], 1)
+        self.assertEqual(len(response.context["paginated_tickets"]), 1)
+
+    def test_users_with_the_same_scope_share_the_cache(self):
+        self.get_dashboard()
+        self.client.login(username="other_coach", password="coach123")
+        response, ticket_queries = self.get_dashboard()
+        self.assertEqual(ticket_queries, 0)
+        # The page itself is still rendered for the user
+        self.assertContains(response, "other_coach")
+
+    def test_ticket_change_invalidates_its_centre_only(self):
+        version = get_scope_version([self.centre.pk])
+        other_version = get_scope_version([self.other_centre.pk])
+
+        ticket = self.create_ticket()
+        self.assertNotEqual(get_scope_version([self.centre.pk]), version)
+        self.assertEqual(get_scope_version([self.other_centre.pk]), other_version)
+
+        version = get_scope_version([self.centre.pk])
+        all_centres = get_scope_version(ALL_CENTRES)
+        ticket.delete()
+        self.assertNotEqual(get_scope_version([self.centre.pk]), version)
+        self.assertNotEqual(get_scope_version(ALL_CENTRES), all_centres)
+
+    def test_new_ticket_is_shown(self):
+        self.get_dashboard()
+        self.create_ticket()
+        response, ticket_queries = self.get_dashboard()
+        self.assertGreater(ticket_queries, 0)
+        self.assertEqual(response.context["ticket_statistics"]["total"], 1)
+
+    def test_trends_follow_tickets_outside_the_scope(self):
+        self.get_dashboard()
+        self.create_ticket(centre=self.other_centre)
+        response, ticket_queries = self.get_dashboard()
+        # The scope's own data is still served from the cache
+        self.assertEqual(ticket_queries, 0)
+        self.assertEqual(
+            response.context["ticket_trends"], [{"category__name": "Software", "ticket_count": 1}]
+        )
+
+    def test_filters_have_their_own_key(self):
+        scope = [self.centre.pk]
+        self.assertNotEqual(
+            get_dashboard_cache_key(scope, QueryDict("status=Open")),
+            get_dashboard_cache_key(scope, QueryDict("status=Closed")),
+        )
+        self.assertNotEqual(
+            get_dashboard_cache_key(scope, QueryDict()),
+            get_dashboard_cache_key([self.other_centre.pk], QueryDict()),
+        )
+        self.assertEqual(
+            get_dashboard_cache_key(scope, QueryDict("region=a&centre=b")),
+            get_dashboard_cache_key(scope, QueryDict("centre=b&region=a")),
+        )
+
+    def test_file_based_cache(self):
+        with tempfile.TemporaryDirectory() as location:
+            caches = {
+                "default": {
+                    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                    "LOCATION": location,
+                }
+            }
+            with override_settings(CACHES=caches):
+                self.create_ticket()
+                self.get_dashboard()
+                response, ticket_queries = self.get_dashboard()
+                self.assertEqual(ticket_queries, 0)
+                self.assertEqual(response.context["ticket_statistics"]["total"], 1)
@@ -0,0 +1,60 @@
+from io import StringIO
+
+from django.core.mail import EmailMessage
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from techsupport.benchmark import stub_smtp_server
+from techsupport.emails import EmailDispatcher
+
+
+class EmailDispatcherTestCase(SimpleTestCase):
+    def get_dispatcher(self, server):
+        return EmailDispatcher(
+            backend="django.core.mail.backends.smtp.EmailBackend",
+            host=server.host,
+            port=server.port,
+            username="",
+            password="",
+            use_tls=False,
+            use_ssl=False,
+        )
+
+    def get_messages(self, count):
+        return [
+            EmailMessage(f"Subject {i}", "Body", "support@example.com", ["user@example.com"])
+            for i in range(count)
+        ]
+
+    def test_messages_share_a_connection(self):
+        with stub_smtp_server() as server:
+            dispatcher = self.get_dispatcher(server)
+            self.assertEqual(dispatcher.send_many(self.get_messages(3)), [None] * 3)
+            self.assertEqual(dispatcher.send_many(self.get_messages(2)), [None] * 2)
+            dispatcher.close()
+        self.assertEqual(len(server.messages), 5)
+        self.assertEqual(server.connections, 1)
+
+        stats = dispatcher.stats()
+        self.assertEqual((stats["sent"], stats["errors"], stats["connections_opened"]), (5, 0, 1))
+        self.assertGreater(dispatcher.messages_per_second, 0)
+
+    def test_reconnects_when_the_connection_drops(self):
+        with stub_smtp_server(drop_after=2) as server:
+            dispatcher = self.get_dispatcher(server)
+            errors = dispatcher.send_many(self.get_messages(5))
+            dispatcher.close()
+        self.assertEqual(errors, [None] * 5)
+        self.assertEqual(len(server.messages), 5)
+        self.assertEqual(server.connections, 3)
+
+    def test_unreachable_server_reports_errors(self):
+        with stub_smtp_server() as server:
+            dispatcher = self.get_dispatcher(server)
+        errors = dispatcher.send_many(self.get_messages(2))
+        self.assertEqual(len([e for e in errors if e is not None]), 2)
+        self.assertEqual(dispatcher.stats()["errors"], 2)
+
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command("benchmark_email", messages=5, stdout=out)
+        self.assertIn("Dispatcher: ", out.getvalue())
@@ -0,0 +1,145 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.urls import reverse
+from django.utils.http import http_date
+from techsupport import reference
+from techsupport.models import Centre, SubCategory, SupportTicket, User
+from techsupport.tests.base import TicketTestCase
+
+
+class ConditionalRequestsTestCase(TicketTestCase):
+    login_username = "superadmin"
+    login_password = "admin123"
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.user = User.objects.create_user(
+            username="superadmin", password="admin123", role="super_admin"
+        )
+
+    def setUp(self):
+        super().setUp()
+        reference.invalidate()
+
+    def assertNotModified(self, url, data=None):
+        # Pages with a form set the CSRF cookie on the first visit
+        self.client.get(url, data)
+        response = self.client.get(url, data)
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+        response = self.client.get(url, data, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        return etag
+
+    def test_updated_at_changes_on_save(self):
+        ticket = self.create_ticket()
+        SupportTicket.objects.filter(pk=ticket.pk).update(
+            updated_at=ticket.updated_at - timedelta(days=1)
+        )
+        ticket.refresh_from_db()
+        updated_at = ticket.updated_at
+        ticket.save()
+        self.assertGreater(ticket.updated_at, updated_at)
+
+        updated_at = ticket.updated_at
+        ticket.priority = "high"
+        ticket.save(update_fields=["priority"])
+        ticket.refresh_from_db()
+        self.assertGreater(ticket.updated_at, updated_at)
+
+    def test_dashboard(self):
+        self.create_ticket()
+        etag = self.assertNotModified(reverse("dashboard"))
+
+        # Other filters and other tickets change the ETag
+        response = self.client.get(
+            reverse("dashboard"), {"status": "Open"}, HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 200)
+        self.create_ticket()
+        response = self.client.get(reverse("dashboard"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_dashboard_changes_with_tickets_outside_the_scope(self):
+        coach = User.objects.create_user(username="coach", password="coach123", role="user")
+        coach.centres.add(self.centre)
+        other_centre = Centre.objects.create(
+            name="Zwelisha", acronym="ZWE", region=self.centre.region
+        )
+        self.client.login(username="coach", password="coach123")
+        etag = self.assertNotModified(reverse("dashboard"))
+
+        # The ticket trends count the tickets of every centre
+        SupportTicket.objects.create(
+            status=SupportTicket.Status.OPEN,
+            centre=other_centre,
+            submitted_by=self.user,
+            category=self.category,
+            subcategory=self.subcategory,
+            description="Description",
+            title="Title",
+        )
+        response = self.client.get(reverse("dashboard"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_dashboard_changes_as_ticket_ages(self):
+        self.create_ticket()
+        etag = self.client.get(reverse("dashboard"))["ETag"]
+        with mock.patch("techsupport.etags.time.time", return_value=10**10):
+            response = self.client.get(reverse("dashboard"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_ticket_details(self):
+        ticket = self.create_ticket()
+        url = reverse("ticket_details", args=[ticket.id])
+        etag = self.assertNotModified(url)
+
+        response = self.client.get(url)
+        self.assertEqual(response["Last-Modified"], http_date(ticket.updated_at.timestamp()))
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+        self.assertEqual(response.status_code, 304)
+
+        ticket.status = SupportTicket.Status.IN_PROGRESS
+        ticket.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_ticket_details_of_another_user(self):
+        ticket = self.create_ticket()
+        url = reverse("ticket_details", args=[ticket.id])
+        etag = self.client.get(url)["ETag"]
+
+        technician = User.objects.create_user(
+            username="technician", password="tech123", role="technician"
+        )
+        self.client.force_login(technician)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_get_subcategories(self):
+        url = reverse("get_subcategories")
+        data = {"category_id": str(self.category.id)}
+        etag = self.assertNotModified(url, data)
+
+        SubCategory.objects.create(name="Tablet Issue", category=self.category)
+        response = self.client.get(url, data, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["subcategories"]), 2)
+
+    def test_pending_messages_are_shown(self):
+        self.create_ticket()
+        etag = self.client.get(reverse("dashboard"))["ETag"]
+        # Resolving a ticket redirects to the dashboard with a message
+        ticket = self.create_ticket()
+        self.client.post(
+            reverse("ticket_details", args=[ticket.id]),
+            {"status": "In Progress", "resolution_notes": "Looking into it"},
+        )
+        response = self.client.get(reverse("dashboard"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("ETag", response)
+        self.assertContains(response, "Support ticket status has been updated.")
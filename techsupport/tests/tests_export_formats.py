@@ -0,0 +1,128 @@
+import json
+import zipfile
+from datetime import datetime, timezone as dt_timezone
+from io import BytesIO, StringIO
+from xml.etree import ElementTree
+
+import openpyxl
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from techsupport.export_formats import (
+    EXPORT_COLUMNS,
+    CSVFormat,
+    JSONLinesFormat,
+    XLSXFormat,
+)
+
+NS = {"s": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+
+
+def make_rows(count):
+    for number in range(1, count + 1):
+        yield (
+            number,
+            datetime(2024, 1, 2, 3, 4, 5, tzinfo=dt_timezone.utc),
+            "Open",
+            "High",
+            "Lumezi Primary",
+            "coach1",
+            "Hardware",
+            "Tablet Issues",
+            "Tablet <broken> & \x01 won't charge",
+            f"Title {number}",
+            "",
+            None,
+        )
+
+
+class ExportFormatsTestCase(SimpleTestCase):
+    def export(self, export_format, count):
+        return b"".join(export_format.iter_bytes(make_rows(count)))
+
+    def test_csv(self):
+        lines = self.export(CSVFormat(), 2).decode().splitlines()
+        self.assertEqual(lines[0], ",".join(column.header for column in EXPORT_COLUMNS))
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[1].startswith("1,2024-01-02 03:04:05+00:00,Open,High,"))
+
+    def test_json_lines(self):
+        lines = self.export(JSONLinesFormat(), 2).decode().splitlines()
+        self.assertEqual(len(lines), 2)
+        row = json.loads(lines[1])
+        self.assertEqual(list(row), [column.key for column in EXPORT_COLUMNS])
+        self.assertEqual(row["ticket_number"], 2)
+        self.assertEqual(row["date_submitted"], "2024-01-02T03:04:05Z")
+        self.assertIsNone(row["assigned_to"])
+
+    def read_sheets(self, content):
+        archive = zipfile.ZipFile(BytesIO(content))
+        self.assertIsNone(archive.testzip())
+        workbook = ElementTree.fromstring(archive.read("xl/workbook.xml"))
+        sheets = []
+        for number in range(1, len(workbook.findall("s:sheets/s:sheet", NS)) + 1):
+            sheet = ElementTree.fromstring(archive.read(f"xl/worksheets/sheet{number}.xml"))
+            sheets.append(sheet.findall("s:sheetData/s:row", NS))
+        return sheets
+
+    def test_xlsx(self):
+        (rows,) = self.read_sheets(self.export(XLSXFormat(), 2))
+        self.assertEqual(len(rows), 3)
+        header = [cell.findtext("s:is/s:t", namespaces=NS) for cell in rows[0]]
+        self.assertEqual(header, [column.header for column in EXPORT_COLUMNS])
+
+        cells = list(rows[1])
+        self.assertEqual(cells[0].findtext("s:v", namespaces=NS), "1")
+        # Dates are stored as days since 1899-12-30 with a date style
+        self.assertEqual(cells[1].get("s"), str(XLSXFormat.DATE_STYLE))
+        self.assertAlmostEqual(float(cells[1].findtext("s:v", namespaces=NS)), 45293.128, places=3)
+        self.assertEqual(
+            cells[8].findtext("s:is/s:t", namespaces=NS), "Tablet <broken> &  won't charge"
+        )
+
+    def test_xlsx_continues_on_new_worksheets(self):
+        export_format = XLSXFormat()
+        export_format.max_rows = 3
+        sheets = self.read_sheets(self.export(export_format, 5))
+        self.assertEqual([len(rows) for rows in sheets], [3, 3, 2])
+
+    def test_xlsx_opens_in_spreadsheet_reader(self):
+        export_format = XLSXFormat()
+        export_format.max_rows = 3
+        workbook = openpyxl.load_workbook(BytesIO(self.export(export_format, 3)))
+        self.assertEqual(workbook.sheetnames, ["Support Tickets", "Support Tickets 2"])
+        header, first_row, second_row = workbook["Support Tickets"].iter_rows()
+        self.assertEqual([cell.value for cell in header], [c.header for c in EXPORT_COLUMNS])
+        self.assertTrue(header[0].font.b)
+        self.assertEqual(
+            [cell.value for cell in first_row],
+            [
+                1,
+                datetime(2024, 1, 2, 3, 4, 5),
+                "Open",
+                "High",
+                "Lumezi Primary",
+                "coach1",
+                "Hardware",
+                "Tablet Issues",
+                "Tablet <broken> &  won't charge",
+                "Title 1",
+                None,
+                None,
+            ],
+        )
+        self.assertEqual(first_row[1].number_format, "yyyy-mm-dd hh:mm:ss")
+        self.assertEqual(second_row[0].value, 2)
+        rows = list(workbook["Support Tickets 2"].values)
+        self.assertEqual([row[0] for row in rows], ["Ticket Number", 3])
+
+    def test_formats_stream_rows(self):
+        # Every format has sent output before it reads the last row
+        for export_format in (CSVFormat(), JSONLinesFormat(), XLSXFormat()):
+            chunks = export_format.iter_bytes(make_rows(3))
+            self.assertTrue(next(chunks))
+
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command("benchmark_exports", rows=[10], stdout=out)
+        for name in ("csv", "jsonl", "xlsx"):
+            self.assertIn(f"{name}        10 rows:", out.getvalue())
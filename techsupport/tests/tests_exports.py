@@ -0,0 +1,163 @@
+import gzip
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from techsupport.export_formats import XLSXFormat
+from techsupport.exports import CLAIM_TIMEOUT, claim_job, purge_expired_jobs
+from techsupport.models import User, ExportJob
+from techsupport.tests.base import TicketTestCase
+
+
+class ExportJobTestCase(TicketTestCase):
+    login_username = "superadmin"
+    login_password = "admin123"
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.user = User.objects.create_user(
+            username="superadmin", password="admin123", role="super_admin"
+        )
+        cls.technician = User.objects.create_user(
+            username="technician", password="tech123", role="technician"
+        )
+        cls.coach = User.objects.create_user(username="coach", password="coach123", role="user")
+        for i in range(3):
+            cls.create_ticket(title=f"Title {i}")
+
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def request_export(self):
+        response = self.client.post(
+            reverse("export_tickets_csv"),
+            {"start_date": "2000-01-01", "end_date": "2100-01-01", "background": "1"},
+        )
+        job = ExportJob.objects.order_by("-created_at").first()
+        self.assertRedirects(response, reverse("export_job", args=[job.id]))
+        return job
+
+    def test_export_job_writes_compressed_file(self):
+        job = self.request_export()
+        progress = self.client.get(reverse("export_job_progress", args=[job.id])).json()
+        self.assertEqual((progress["status"], progress["download_url"]), ("Pending", None))
+
+        call_command("run_export_jobs", stdout=StringIO())
+        job.refresh_from_db()
+        self.assertEqual(job.status, ExportJob.Status.FINISHED)
+        self.assertEqual((job.total_rows, job.rows_written), (3, 3))
+        with gzip.open(job.file.path, "rt") as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(lines[0].startswith("Ticket Number,"))
+
+        progress = self.client.get(reverse("export_job_progress", args=[job.id])).json()
+        self.assertEqual(progress["progress"], 100)
+        self.assertEqual(progress["download_url"], reverse("export_job_download", args=[job.id]))
+
+    def test_download_supports_ranges(self):
+        job = self.request_export()
+        call_command("run_export_jobs", stdout=StringIO())
+        job.refresh_from_db()
+        with open(job.file.path, "rb") as f:
+            content = f.read()
+        url = reverse("export_job_download", args=[job.id])
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertEqual(b"".join(response.streaming_content), content)
+
+        response = self.client.get(url, HTTP_RANGE="bytes=0-9")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"], f"bytes 0-9/{len(content)}")
+        first = b"".join(response.streaming_content)
+        response = self.client.get(url, HTTP_RANGE="bytes=10-", HTTP_IF_RANGE=response["ETag"])
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(first + b"".join(response.streaming_content), content)
+
+        response = self.client.get(url, HTTP_RANGE="bytes=-5")
+        self.assertEqual(b"".join(response.streaming_content), content[-5:])
+
+        response = self.client.get(url, HTTP_RANGE=f"bytes={len(content)}-")
+        self.assertEqual(response.status_code, 416)
+
+        # A stale If-Range gets the whole file
+        response = self.client.get(url, HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE='"stale"')
+        self.assertEqual(response.status_code, 200)
+
+    def test_abandoned_jobs_are_claimed_again(self):
+        job = self.request_export()
+        self.assertEqual(claim_job(), job)
+        # The job is running, so no other worker claims it
+        self.assertIsNone(claim_job())
+
+        # Its worker died without renewing the claim
+        expired = timezone.now() - timedelta(seconds=CLAIM_TIMEOUT + 1)
+        ExportJob.objects.filter(pk=job.pk).update(claimed_at=expired)
+        self.assertEqual(claim_job(), job)
+        job.refresh_from_db()
+        self.assertEqual(job.status, ExportJob.Status.RUNNING)
+        self.assertGreater(job.claimed_at, expired)
+
+    @override_settings(EXPORT_RETENTION=0)
+    def test_abandoned_jobs_are_purged(self):
+        def create_job(claimed_at):
+            return ExportJob.objects.create(
+                requested_by=self.user,
+                start_date="2000-01-01",
+                end_date="2100-01-01",
+                status=ExportJob.Status.RUNNING,
+                claimed_at=claimed_at,
+            )
+
+        running = create_job(timezone.now())
+        create_job(timezone.now() - timedelta(seconds=CLAIM_TIMEOUT + 1))
+        self.assertEqual(purge_expired_jobs(), 1)
+        self.assertEqual(list(ExportJob.objects.all()), [running])
+
+    def test_identical_exports_are_reused(self):
+        job = self.request_export()
+        call_command("run_export_jobs", stdout=StringIO())
+        self.assertEqual(self.request_export(), job)
+
+        # Technicians see the same tickets, so they share the export too
+        self.client.login(username="technician", password="tech123")
+        self.assertEqual(self.request_export(), job)
+
+        # Changing a ticket invalidates the export
+        self.create_ticket(title="Title 3")
+        self.assertNotEqual(self.request_export(), job)
+
+    def test_export_job_formats(self):
+        response = self.client.post(
+            reverse("export_tickets_csv"),
+            {"start_date": "2000-01-01", "end_date": "2100-01-01", "background": "1", "format": "xlsx"},
+        )
+        job = ExportJob.objects.get()
+        self.assertEqual(job.format, "xlsx")
+        call_command("run_export_jobs", stdout=StringIO())
+        job.refresh_from_db()
+        # XLSX files are zip archives already, so they are not gzipped
+        self.assertTrue(job.file.name.endswith(f"{job.id}.xlsx"))
+
+        response = self.client.get(reverse("export_job_download", args=[job.id]))
+        self.assertEqual(response["Content-Type"], XLSXFormat.content_type)
+        self.assertIn(".xlsx", response["Content-Disposition"])
+
+    def test_other_users_cannot_access_export(self):
+        job = self.request_export()
+        self.client.login(username="coach", password="coach123")
+        response = self.client.get(reverse("export_job_progress", args=[job.id]))
+        self.assertEqual(response.status_code, 404)
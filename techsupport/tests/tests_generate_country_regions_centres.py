@@ -0,0 +1,93 @@
+import csv
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from techsupport.models import Category, Centre, Country, Region, SubCategory, SupportTicket, User
+from techsupport.search import get_search_backend
+
+CSV_FIELDS = ["country_name", "country_code", "region_name", "centre_name", "centre_acronym"]
+
+
+class GenerateCountryRegionsCentresTestCase(TestCase):
+    def write_csv(self, rows):
+        handle, path = tempfile.mkstemp(suffix=".csv")
+        self.addCleanup(os.remove, path)
+        with os.fdopen(handle, "w", newline="") as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(CSV_FIELDS)
+            writer.writerows(rows)
+        return path
+
+    def roster(self, count):
+        return [
+            ["Zambia", "ZM", f"Region {i % 3}", f"Centre {i}", f"C{i}"] for i in range(count)
+        ]
+
+    def generate(self, rows, *args):
+        stdout = StringIO()
+        call_command("generate_country_regions_centres", self.write_csv(rows), *args, stdout=stdout)
+        return stdout.getvalue()
+
+    def test_import(self):
+        stdout = self.generate(self.roster(6) + [["South Africa", "ZA", "Mpumalanga", "Zwelisha", "WRZ"]])
+        self.assertIn("Countries: 2 created, 0 updated, 0 unchanged", stdout)
+        self.assertIn("Regions: 4 created", stdout)
+        self.assertIn("Centres: 7 created", stdout)
+        self.assertIn("Successfully imported 7 rows", stdout)
+
+        centre = Centre.objects.get(name="Zwelisha")
+        self.assertEqual(centre.acronym, "WRZ")
+        self.assertEqual(centre.region.name, "Mpumalanga")
+        self.assertEqual(centre.region.country.code, "ZA")
+
+    def test_existing_rows_are_updated(self):
+        self.generate(self.roster(3))
+        rows = self.roster(4)
+        rows[0][0] = "Republic of Zambia"
+        rows[1][4] = "NEW"
+        stdout = self.generate(rows)
+        self.assertIn("Countries: 0 created, 1 updated", stdout)
+        self.assertIn("Centres: 1 created, 1 updated, 2 unchanged", stdout)
+        self.assertEqual(Country.objects.get().name, "Republic of Zambia")
+        self.assertEqual(Centre.objects.get(name="Centre 1").acronym, "NEW")
+
+    def test_moved_centres_are_reindexed(self):
+        self.generate(self.roster(2))
+        category = Category.objects.create(name="Hardware", code="HW")
+        SupportTicket.objects.create(
+            status=SupportTicket.Status.OPEN,
+            centre=Centre.objects.get(name="Centre 0"),
+            submitted_by=User.objects.create_user(username="coach"),
+            category=category,
+            subcategory=SubCategory.objects.create(name="Tablet Issues", category=category),
+            description="Description",
+            title="Title",
+        )
+        rows = self.roster(2)
+        rows[0][2] = "Northern"
+        self.generate(rows)
+        tickets = get_search_backend().search(SupportTicket.objects.all(), "northern")
+        self.assertEqual(tickets.count(), 1)
+
+    def test_queries_do_not_grow_with_rows(self):
+        with CaptureQueriesContext(connection) as small:
+            self.generate(self.roster(3))
+        Centre.objects.all().delete()
+        Region.objects.all().delete()
+        Country.objects.all().delete()
+        with CaptureQueriesContext(connection) as large:
+            self.generate(self.roster(30))
+        self.assertEqual(len(large), len(small))
+
+    def test_stream(self):
+        stdout = self.generate(self.roster(10), "--stream", "--batch-size=4")
+        self.assertIn("Read 4 rows", stdout)
+        self.assertIn("Read 10 rows", stdout)
+        self.assertEqual(Country.objects.count(), 1)
+        self.assertEqual(Region.objects.count(), 3)
+        self.assertEqual(Centre.objects.count(), 10)
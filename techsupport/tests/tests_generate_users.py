@@ -0,0 +1,117 @@
+import csv
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth.models import Group
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from techsupport.models import Centre, Country, Region, User, UserProfile
+
+CSV_FIELDS = [
+    "first_name",
+    "last_name",
+    "username",
+    "email",
+    "role",
+    "groups",
+    "country_code",
+    "region_name",
+    "centre_name",
+]
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class GenerateUsersTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        country = Country.objects.create(name="Zambia", code="ZM")
+        region = Region.objects.create(name="Eastern Region", country=country)
+        cls.centre = Centre.objects.create(name="Lumezi Primary", acronym="LDL", region=region)
+
+    def write_csv(self, rows):
+        handle, path = tempfile.mkstemp(suffix=".csv")
+        self.addCleanup(os.remove, path)
+        with os.fdopen(handle, "w", newline="") as csvfile:
+            writer = csv.DictWriter(csvfile, CSV_FIELDS)
+            writer.writeheader()
+            for row in rows:
+                writer.writerow({field: row.get(field, "") for field in CSV_FIELDS})
+        return path
+
+    def coaches(self, count):
+        return [
+            {
+                "first_name": "Coach",
+                "last_name": str(i),
+                "username": f"coach{i}",
+                "email": f"coach{i}@example.com",
+                "role": "manager",
+                "groups": "manager, coach",
+                "country_code": "ZM",
+                "region_name": "Eastern Region",
+                "centre_name": "Lumezi Primary",
+            }
+            for i in range(count)
+        ]
+
+    def generate_users(self, rows, *args):
+        stdout, stderr = StringIO(), StringIO()
+        call_command(
+            "generate_users", self.write_csv(rows), "--workers=1", *args, stdout=stdout, stderr=stderr
+        )
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_import(self):
+        rows = self.coaches(3) + [{"username": "tech", "role": "technician", "groups": "technician"}]
+        stdout, stderr = self.generate_users(rows)
+        self.assertIn("4 users created and 0 updated", stdout)
+        self.assertEqual(stderr, "")
+
+        coach = User.objects.get(username="coach1")
+        self.assertEqual(coach.region.name, "Eastern Region")
+        self.assertEqual(list(coach.centres.all()), [self.centre])
+        self.assertEqual(sorted(coach.groups.values_list("name", flat=True)), ["coach", "manager"])
+        self.assertEqual(coach.profile.bio, "Coach 1")
+        self.assertTrue(coach.password.startswith("md5$"))
+        self.assertTrue(User.objects.get(username="tech").is_superuser)
+
+    def test_existing_users_are_updated(self):
+        self.generate_users(self.coaches(2))
+        rows = self.coaches(3)
+        rows[0]["last_name"] = "Renamed"
+        stdout, _ = self.generate_users(rows)
+        self.assertIn("1 users created and 2 updated", stdout)
+        self.assertEqual(User.objects.filter(username__startswith="coach").count(), 3)
+        self.assertEqual(UserProfile.objects.get(user__username="coach0").bio, "Coach Renamed")
+
+    def test_invalid_rows_are_reported(self):
+        rows = self.coaches(2)
+        rows[0]["centre_name"] = "Unknown"
+        rows[1]["role"] = "unknown"
+        _, stderr = self.generate_users(rows)
+        self.assertIn("Country, Region, or Centre not found for user: coach0", stderr)
+        self.assertIn("Invalid role for user: coach1", stderr)
+        self.assertFalse(User.objects.get(username="coach0").centres.exists())
+
+    def test_dry_run(self):
+        stdout, _ = self.generate_users(self.coaches(3), "--dry-run")
+        self.assertIn("Dry run, nothing was saved", stdout)
+        self.assertFalse(User.objects.exists())
+
+    def test_queries_do_not_grow_with_rows(self):
+        Group.objects.bulk_create([Group(name="manager"), Group(name="coach")])
+        with CaptureQueriesContext(connection) as small:
+            self.generate_users(self.coaches(2))
+        User.objects.all().delete()
+        with CaptureQueriesContext(connection) as large:
+            self.generate_users(self.coaches(20))
+        self.assertEqual(len(large), len(small))
+
+    def test_hashing_in_worker_processes(self):
+        self.generate_users(self.coaches(4), "--workers=2", "--chunk-size=2")
+        passwords = User.objects.values_list("password", flat=True)
+        self.assertEqual(len(set(passwords)), 4)
+        self.assertTrue(all(password.startswith("md5$") for password in passwords))
@@ -1,4 +1,9 @@
+import pickle
+from unittest import skipUnless
+from uuid import uuid4
+from django.db import connection
 from django.test import TestCase
+from django.utils import timezone
 from django.contrib.auth.models import Permission
 from techsupport.models import (
     Country,
@@ -11,6 +16,7 @@ from techsupport.models import (
     SubCategory,
     SupportTicket,
 )
+from techsupport.pagination import CursorPaginator
 
 
 class ModelsTestCase(TestCase):
@@ -117,3 +123,72 @@ class ModelsTestCase(TestCase):
         # Retrieve the support ticket with the description 'Test description' and verify its status is 'OPEN'
         support_ticket = SupportTicket.objects.get(description="Test description")
         self.assertEqual(support_ticket.status, SupportTicket.Status.OPEN)
+
+    def test_ticket_statistics(self):
+        # Add a ticket in progress and check all counts come from a single query
+        SupportTicket.objects.create(
+            status=SupportTicket.Status.IN_PROGRESS,
+            centre=self.centre,
+            submitted_by=self.user,
+            category=self.category,
+            subcategory=self.subcategory,
+            description="Second description",
+            title="Second title",
+        )
+        with self.assertNumQueries(1):
+            statistics = SupportTicket.objects.all().ticket_statistics()
+        self.assertEqual(
+            statistics,
+            {"total": 2, "open": 1, "in_progress": 1, "resolved": 0, "closed": 0},
+        )
+
+    def test_ticket_rows(self):
+        ticket = SupportTicket.objects.get(description="Test description")
+        with self.assertNumQueries(1):
+            rows = list(SupportTicket.objects.list_rows())
+        self.assertEqual(len(rows), 1)
+        row = rows[0]
+        self.assertEqual(row.id, ticket.id)
+        self.assertEqual(row.centre, str(ticket.centre))
+        self.assertEqual(row.submitted_by, ticket.submitted_by.username)
+        self.assertEqual(row.ticket_age, ticket.ticket_age())
+        self.assertFalse(hasattr(row, "__dict__"))
+        # Rows are cached with the dashboard data
+        self.assertEqual(pickle.loads(pickle.dumps(row)).centre, row.centre)
+
+    def test_ticket_rows_are_paginated(self):
+        page = CursorPaginator(SupportTicket.objects.list_rows(), 10).page()
+        self.assertEqual([row.title for row in page], ["Test title"])
+
+
+@skipUnless(connection.vendor == "sqlite", "Query plans are checked on SQLite")
+class SupportTicketIndexesTestCase(TestCase):
+    def assertUsesIndex(self, queryset, index_name):
+        self.assertIn(f"INDEX {index_name}", queryset.explain())
+
+    def test_status_pages_use_status_index(self):
+        tickets = SupportTicket.objects.list_projection().filter(status="Resolved")
+        self.assertUsesIndex(
+            CursorPaginator(tickets, 10).queryset[:11], "ticket_status_date_idx"
+        )
+
+    def test_dashboard_uses_date_index(self):
+        tickets = SupportTicket.objects.list_projection()
+        self.assertUsesIndex(
+            CursorPaginator(tickets, 10).queryset[:11], "ticket_date_submitted_idx"
+        )
+
+    def test_centre_dashboard_uses_centre_status_index(self):
+        tickets = SupportTicket.objects.list_projection().filter(
+            centre_id=uuid4(), status="Open"
+        )
+        self.assertUsesIndex(
+            CursorPaginator(tickets, 10).queryset[:11], "ticket_centre_status_date_idx"
+        )
+
+    def test_export_uses_date_index(self):
+        now = timezone.now()
+        tickets = SupportTicket.objects.list_projection().filter(
+            date_submitted__range=(now - timezone.timedelta(days=365), now)
+        )
+        self.assertUsesIndex(tickets, "ticket_date_submitted_idx")
@@ -0,0 +1,226 @@
+import json
+from datetime import timedelta
+from unittest import mock
+
+import requests
+from django.core import mail
+from django.test import override_settings
+from django.utils import timezone
+from techsupport.models import User, SupportTicket, Notification, OutboxMessage
+from techsupport.outbox import claim_messages, deliver_messages, get_retry_delay
+from techsupport.tests.base import TicketTestCase
+
+
+class OutboxTestCase(TicketTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.user = User.objects.create_user(
+            username="coach1", password="testpassword", email="coach1@example.com"
+        )
+        cls.technician = User.objects.create_user(username="tech1", password="testpassword")
+        cls.ticket = cls.create_ticket(title="Broken tablet")
+
+
+@override_settings(
+    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+    EMAIL_HOST_USER="support@example.com",
+    WEB_HOOK_URL="https://chat.example.com/webhook",
+    NOTIFICATION_COALESCE_WINDOW=0,
+    NOTIFICATION_DIGEST_INTERVAL=0,
+)
+class NotificationOutboxTestCase(OutboxTestCase):
+    def test_notifications_are_queued_not_sent(self):
+        with mock.patch("requests.post") as post:
+            Notification.send_email_notification(
+                self.ticket, Notification.MessageType.TICKET_CREATION
+            )
+            Notification.send_webhook_notification(
+                self.ticket, Notification.MessageType.TICKET_CREATION, self.user
+            )
+        post.assert_not_called()
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(
+            set(Notification.objects.values_list("notification_status", flat=True)),
+            {"Pending"},
+        )
+        self.assertEqual(
+            OutboxMessage.objects.filter(status=OutboxMessage.Status.PENDING).count(), 2
+        )
+
+    def test_assignment_notifications_render(self):
+        self.ticket.assigned_to = self.technician
+        notification = Notification.send_email_notification(
+            self.ticket, Notification.MessageType.ASSIGNMENT
+        )
+        message = notification.outbox_message
+        self.assertIn("tech1", message.body)
+
+        notification = Notification.send_webhook_notification(
+            self.ticket, Notification.MessageType.ASSIGNMENT, self.user
+        )
+        message = notification.outbox_message
+        self.assertIn("tech1", json.loads(message.body)["text"])
+
+    def test_worker_delivers_messages(self):
+        email = Notification.send_email_notification(
+            self.ticket, Notification.MessageType.TICKET_CREATION
+        )
+        webhook = Notification.send_webhook_notification(
+            self.ticket, Notification.MessageType.TICKET_CREATION, self.user
+        )
+
+        with mock.patch("requests.Session.post") as post:
+            results = deliver_messages()
+        self.assertEqual(results, {"claimed": 2, "sent": 2, "retried": 0, "failed": 0})
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ["coach1@example.com"])
+        self.assertEqual(post.call_args[0][0], "https://chat.example.com/webhook")
+
+        for notification in (email, webhook):
+            notification.refresh_from_db()
+            self.assertEqual(notification.notification_status, "Successful")
+        self.assertFalse(
+            OutboxMessage.objects.exclude(status=OutboxMessage.Status.SENT).exists()
+        )
+
+        # Nothing is left to deliver
+        self.assertEqual(deliver_messages()["claimed"], 0)
+
+    def test_failed_delivery_is_retried_with_backoff(self):
+        notification = Notification.send_webhook_notification(
+            self.ticket, Notification.MessageType.TICKET_CREATION, self.user
+        )
+        message = notification.outbox_message
+
+        with mock.patch(
+            "requests.Session.post", side_effect=requests.ConnectionError("Refused")
+        ):
+            results = deliver_messages(max_attempts=2)
+            self.assertEqual(results["retried"], 1)
+            message.refresh_from_db()
+            self.assertEqual(message.status, OutboxMessage.Status.PENDING)
+            self.assertEqual(message.attempts, 1)
+            self.assertEqual(message.last_error, "Refused")
+            self.assertGreater(message.next_attempt_at, timezone.now())
+
+            # The message is not due again until the backoff has passed
+            self.assertEqual(deliver_messages(max_attempts=2)["claimed"], 0)
+
+            OutboxMessage.objects.update(next_attempt_at=timezone.now() - timedelta(seconds=1))
+            results = deliver_messages(max_attempts=2)
+            self.assertEqual(results["failed"], 1)
+
+        message.refresh_from_db()
+        self.assertEqual(message.status, OutboxMessage.Status.FAILED)
+        notification.refresh_from_db()
+        self.assertEqual(notification.notification_status, "Failed")
+
+    def test_retry_delay_is_exponential_and_capped(self):
+        self.assertEqual(
+            [get_retry_delay(attempts) for attempts in range(1, 5)], [30, 60, 120, 240]
+        )
+        self.assertEqual(get_retry_delay(20), 60 * 60)
+
+
+@override_settings(
+    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+    EMAIL_HOST_USER="support@example.com",
+    WEB_HOOK_URL="https://chat.example.com/webhook",
+    NOTIFICATION_COALESCE_WINDOW=60,
+    NOTIFICATION_DIGEST_INTERVAL=0,
+)
+class NotificationCoalescingTestCase(OutboxTestCase):
+    def make_due(self):
+        OutboxMessage.objects.update(next_attempt_at=timezone.now() - timedelta(seconds=1))
+
+    def test_events_for_a_ticket_are_coalesced(self):
+        self.ticket.assigned_to = self.technician
+        notifications = [
+            Notification.send_email_notification(self.ticket, Notification.MessageType.ASSIGNMENT),
+            Notification.send_webhook_notification(
+                self.ticket, Notification.MessageType.ASSIGNMENT, self.technician
+            ),
+        ]
+        self.ticket.status = SupportTicket.Status.RESOLVED
+        notifications += [
+            Notification.send_email_notification(self.ticket, Notification.MessageType.RESOLUTION),
+            Notification.send_webhook_notification(
+                self.ticket, Notification.MessageType.RESOLUTION, self.technician
+            ),
+        ]
+        self.assertEqual(OutboxMessage.objects.count(), 2)
+
+        email = OutboxMessage.objects.get(channel=OutboxMessage.Channel.EMAIL)
+        self.assertEqual(email.subject, f"Support Ticket #{self.ticket.ticket_number} Updated")
+        self.assertIn("was assigned to tech1", email.body)
+        self.assertIn("was resolved", email.body)
+        webhook = OutboxMessage.objects.get(channel=OutboxMessage.Channel.WEBHOOK)
+        self.assertIn("was assigned to tech1", json.loads(webhook.body)["text"])
+
+        # Nothing is sent until the coalescing window has passed
+        self.assertEqual(deliver_messages()["claimed"], 0)
+        self.make_due()
+        with mock.patch("requests.Session.post"):
+            self.assertEqual(deliver_messages()["sent"], 2)
+        self.assertEqual(len(mail.outbox), 1)
+        for notification in notifications:
+            notification.refresh_from_db()
+            self.assertEqual(notification.notification_status, "Successful")
+
+    def test_events_are_not_merged_into_claimed_messages(self):
+        Notification.send_email_notification(self.ticket, Notification.MessageType.ASSIGNMENT)
+        self.make_due()
+        self.assertEqual(len(claim_messages(10)), 1)
+
+        Notification.send_email_notification(self.ticket, Notification.MessageType.RESOLUTION)
+        self.assertEqual(OutboxMessage.objects.filter(claimed_at__isnull=True).count(), 1)
+        self.assertEqual(OutboxMessage.objects.count(), 2)
+
+    def test_events_are_not_merged_into_messages_claimed_meanwhile(self):
+        Notification.send_email_notification(self.ticket, Notification.MessageType.ASSIGNMENT)
+        message = OutboxMessage.objects.get()
+        render = OutboxMessage.render
+
+        def claim_then_render(self):
+            # A worker claims the message after the event was read into it
+            OutboxMessage.objects.filter(pk=message.pk).update(claimed_at=timezone.now())
+            render(self)
+
+        with mock.patch.object(OutboxMessage, "render", claim_then_render):
+            Notification.send_email_notification(self.ticket, Notification.MessageType.RESOLUTION)
+        message.refresh_from_db()
+        self.assertEqual(len(message.events), 1)
+        self.assertEqual(OutboxMessage.objects.count(), 2)
+
+    @override_settings(NOTIFICATION_DIGEST_INTERVAL=3600)
+    def test_bulk_events_are_not_merged_into_digests_claimed_meanwhile(self):
+        Notification.send_email_notification(self.ticket, Notification.MessageType.RESOLUTION)
+        digest = OutboxMessage.objects.get()
+        render = OutboxMessage.render
+
+        def claim_then_render(self):
+            OutboxMessage.objects.filter(pk=digest.pk).update(claimed_at=timezone.now())
+            render(self)
+
+        with mock.patch.object(OutboxMessage, "render", claim_then_render):
+            message = OutboxMessage.objects.enqueue_many(
+                digest.channel, digest.recipient, digest.events * 2
+            )
+        digest.refresh_from_db()
+        self.assertEqual(len(digest.events), 1)
+        self.assertNotEqual(message, digest)
+        self.assertEqual(len(message.events), 2)
+
+    @override_settings(NOTIFICATION_DIGEST_INTERVAL=3600)
+    def test_digest_merges_events_for_a_recipient(self):
+        other_ticket = self.create_ticket(title="Slow laptop")
+        Notification.send_email_notification(self.ticket, Notification.MessageType.RESOLUTION)
+        Notification.send_email_notification(other_ticket, Notification.MessageType.RESOLUTION)
+
+        email = OutboxMessage.objects.get()
+        self.assertEqual(email.subject, "Support Ticket Updates (2)")
+        self.assertIn(f"Support Ticket #{self.ticket.ticket_number} was resolved", email.body)
+        self.assertIn(f"Support Ticket #{other_ticket.ticket_number} was resolved", email.body)
+        self.assertGreater(email.next_attempt_at, timezone.now() + timedelta(minutes=59))
@@ -0,0 +1,58 @@
+from django.utils import timezone
+from techsupport.models import User, SupportTicket
+from techsupport.pagination import CursorPaginator, InvalidCursor
+from techsupport.tests.base import TicketTestCase
+
+
+class CursorPaginatorTestCase(TicketTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.user = User.objects.create_user(username="testuser", password="testpassword")
+
+        # Give pairs of tickets the same submission date to exercise the id tie-breaker
+        now = timezone.now()
+        for i in range(25):
+            cls.create_ticket(
+                description=f"Description {i}",
+                title=f"Title {i}",
+                date_submitted=now - timezone.timedelta(minutes=i // 2),
+            )
+
+    def test_pages_cover_all_tickets_in_order(self):
+        paginator = CursorPaginator(SupportTicket.objects.all(), 10)
+        page = paginator.page()
+        self.assertFalse(page.has_previous())
+        seen = list(page)
+        while page.has_next():
+            page = paginator.page(page.next_cursor)
+            seen.extend(page)
+        expected = list(SupportTicket.objects.order_by("-date_submitted", "-id"))
+        self.assertEqual(seen, expected)
+        self.assertEqual(paginator.count, 25)
+
+    def test_previous_cursor_returns_previous_page(self):
+        paginator = CursorPaginator(SupportTicket.objects.all(), 10)
+        first_page = paginator.page()
+        second_page = paginator.page(first_page.next_cursor)
+        third_page = paginator.page(second_page.next_cursor)
+        self.assertEqual(len(third_page), 5)
+        self.assertFalse(third_page.has_next())
+
+        previous_page = paginator.page(third_page.previous_cursor)
+        self.assertEqual(list(previous_page), list(second_page))
+        previous_page = paginator.page(previous_page.previous_cursor)
+        self.assertEqual(list(previous_page), list(first_page))
+        self.assertFalse(previous_page.has_previous())
+
+    def test_page_without_count_runs_a_single_query(self):
+        paginator = CursorPaginator(SupportTicket.objects.all(), 10, with_count=False)
+        with self.assertNumQueries(1):
+            page = paginator.page()
+            self.assertEqual(len(page), 10)
+        self.assertIsNone(paginator.count)
+
+    def test_invalid_cursor(self):
+        paginator = CursorPaginator(SupportTicket.objects.all(), 10)
+        with self.assertRaises(InvalidCursor):
+            paginator.page("not-a-cursor")
@@ -0,0 +1,68 @@
+import time
+from unittest import mock
+
+from django.contrib.auth.models import Group, Permission
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase
+from techsupport import permissions
+from techsupport.models import User
+
+
+class RolePermissionsTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        content_type = ContentType.objects.get_for_model(User)
+        cls.can_read = Permission.objects.create(
+            codename="user_can_read", name="Can read users", content_type=content_type
+        )
+        cls.can_filter = Permission.objects.create(
+            codename="user_can_filter", name="Can filter", content_type=content_type
+        )
+        cls.coach = User.objects.create_user(username="coach", password="coach123", role="user")
+        cls.technician = User.objects.create_user(
+            username="technician", password="tech123", role="technician"
+        )
+
+    def setUp(self):
+        permissions.invalidate()
+
+    def test_role_permissions(self):
+        self.assertEqual(self.coach.get_role_permissions(), frozenset({"techsupport.user_can_read"}))
+        self.assertTrue(self.coach.has_perm("techsupport.user_can_read"))
+        # Permission objects are not permission names
+        self.assertFalse(self.coach.has_perm(self.can_read))
+        self.assertEqual(
+            self.technician.get_role_permissions(),
+            frozenset({"techsupport.user_can_read", "techsupport.user_can_filter"}),
+        )
+
+    def test_role_permissions_are_cached(self):
+        self.coach.has_perm("techsupport.user_can_read")
+        with self.assertNumQueries(0):
+            for _ in range(10):
+                self.assertTrue(self.coach.has_perm("techsupport.user_can_read"))
+                self.assertTrue(self.technician.has_perm("techsupport.user_can_filter"))
+
+    def test_role_permissions_expire(self):
+        self.assertTrue(self.coach.has_perm("techsupport.user_can_read"))
+        # Changes made by processes that do not share the cache send no signal here
+        Permission.objects.filter(pk=self.can_read.pk).update(codename="user_can_write")
+        self.assertTrue(self.coach.has_perm("techsupport.user_can_read"))
+        later = time.monotonic() + permissions.PERMISSIONS_CACHE_TIMEOUT
+        with mock.patch("time.monotonic", return_value=later):
+            self.assertFalse(self.coach.has_perm("techsupport.user_can_read"))
+
+    def test_role_named_groups_only_apply_to_members(self):
+        group = Group.objects.create(name="user")
+        group.permissions.add(self.can_filter)
+        self.assertNotIn("techsupport.user_can_filter", self.coach.get_role_permissions())
+        self.assertFalse(self.coach.has_perm("techsupport.user_can_filter"))
+
+        member = User.objects.create_user(username="member", password="member123", role="user")
+        member.groups.add(group)
+        self.assertTrue(member.has_perm("techsupport.user_can_filter"))
+
+    def test_deleted_permissions_are_forgotten(self):
+        self.assertTrue(self.coach.get_role_permissions())
+        self.can_read.delete()
+        self.assertEqual(self.coach.get_role_permissions(), frozenset())
@@ -0,0 +1,98 @@
+import time
+from unittest import mock
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from techsupport import reference
+from techsupport.models import Category, Centre, Country, Region, SubCategory, User
+from techsupport.tests.base import TicketTestCase
+
+REFERENCE_TABLES = [
+    model._meta.db_table for model in (Country, Region, Centre, Category, SubCategory)
+]
+
+
+class ReferenceDataTestCase(TicketTestCase):
+    login_username = "superadmin"
+    login_password = "admin123"
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.other_country = Country.objects.create(name="Malawi", code="MW")
+        cls.other_region = Region.objects.create(name="Central Region", country=cls.other_country)
+        Centre.objects.create(name="Kasungu", acronym="KSG", region=cls.other_region)
+        cls.other_category = Category.objects.create(name="Hardware", code="HW")
+        SubCategory.objects.create(name="Broken Screen", category=cls.other_category)
+        cls.user = User.objects.create_user(
+            username="superadmin", password="admin123", role="super_admin"
+        )
+
+    def setUp(self):
+        super().setUp()
+        reference.invalidate()
+
+    def count_reference_queries(self, url, data=None):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, data)
+            self.assertEqual(response.status_code, 200)
+        # The centres of the user are user data rather than reference data
+        return len([
+            query for query in context.captured_queries
+            if any(f'FROM "{table}"' in query["sql"] for table in REFERENCE_TABLES)
+            and "techsupport_user_centres" not in query["sql"]
+        ])
+
+    def test_reference_data_is_loaded_once(self):
+        with self.assertNumQueries(5):
+            data = reference.get_reference_data()
+        with self.assertNumQueries(0):
+            self.assertIs(reference.get_reference_data(), data)
+        self.assertEqual([c.name for c in data.categories], ["Hardware", "Software"])
+        self.assertEqual(reference.get_subcategories(self.category.pk), (self.subcategory,))
+        self.assertEqual(reference.get_regions(self.country.pk), (self.region,))
+        self.assertEqual(reference.get_centres(self.country.pk), (self.centre,))
+
+    def test_shared_cache_fallback(self):
+        data = reference.warm_up()
+        # Another process starts with an empty in-process cache
+        reference._reference_data.clear()
+        with self.assertNumQueries(0):
+            self.assertEqual(reference.get_reference_data(), data)
+
+    def test_reference_data_expires(self):
+        reference.get_reference_data()
+        # Changes made by processes that do not share the cache send no signal here
+        Category.objects.filter(pk=self.category.pk).update(name="Apps")
+        later = reference.REFERENCE_CACHE_TIMEOUT + 1
+        monotonic = mock.patch("time.monotonic", return_value=time.monotonic() + later)
+        wall_clock = mock.patch("time.time", return_value=time.time() + later)
+        with monotonic, wall_clock:
+            self.assertEqual([c.name for c in reference.get_categories()], ["Apps", "Hardware"])
+
+    def test_changes_invalidate_the_reference_data(self):
+        reference.get_reference_data()
+        Category.objects.create(name="Network", code="NW")
+        self.assertEqual(len(reference.get_categories()), 3)
+        self.centre.delete()
+        self.assertNotIn(self.centre, reference.get_centres())
+
+    def test_steady_state_pages_make_no_reference_queries(self):
+        for url in (reverse("dashboard"), reverse("create_ticket")):
+            self.count_reference_queries(url)
+            self.assertEqual(self.count_reference_queries(url), 0, url)
+
+        url = reverse("get_subcategories")
+        data = {"category_id": str(self.category.pk)}
+        self.assertEqual(self.count_reference_queries(url, data), 0)
+        response = self.client.get(url, data)
+        self.assertEqual(
+            response.json(),
+            {"subcategories": [{"id": str(self.subcategory.pk), "name": "Kolibri Issue"}]},
+        )
+
+    def test_create_ticket_form_choices(self):
+        response = self.client.get(reverse("create_ticket"))
+        self.assertContains(response, "LDL - Lumezi Primary")
+        self.assertContains(response, f'value="{self.category.pk}"')
@@ -0,0 +1,74 @@
+from io import StringIO
+from django.core.management import call_command
+from django.utils import timezone
+from techsupport.models import Category, SubCategory, SupportTicket, TicketRollup, User
+from techsupport.tests.base import TicketTestCase
+
+
+class TicketRollupTestCase(TicketTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.user = User.objects.create_user(username="coach1", password="testpassword")
+        cls.hardware = Category.objects.create(name="Hardware", code="HW")
+        cls.tablet = SubCategory.objects.create(name="Tablet Issues", category=cls.hardware)
+
+    def rollup_counts(self):
+        return {
+            (row.date, row.subcategory_id, row.status): row.ticket_count
+            for row in TicketRollup.objects.filter(ticket_count__gt=0)
+        }
+
+    def test_rollups_follow_ticket_changes(self):
+        ticket = self.create_ticket()
+        self.create_ticket()
+        today = timezone.localdate()
+        self.assertEqual(
+            self.rollup_counts(), {(today, self.subcategory.id, "Open"): 2}
+        )
+
+        ticket = SupportTicket.objects.get(pk=ticket.pk)
+        ticket.status = SupportTicket.Status.RESOLVED
+        ticket.save()
+        self.assertEqual(
+            self.rollup_counts(),
+            {(today, self.subcategory.id, "Open"): 1, (today, self.subcategory.id, "Resolved"): 1},
+        )
+
+        ticket.delete()
+        self.assertEqual(self.rollup_counts(), {(today, self.subcategory.id, "Open"): 1})
+
+    def test_rebuild_matches_incremental_rollups(self):
+        self.create_ticket(category=self.hardware, subcategory=self.tablet)
+        self.create_ticket(date_submitted=timezone.now() - timezone.timedelta(days=3))
+        ticket = self.create_ticket()
+        ticket.status = SupportTicket.Status.IN_PROGRESS
+        ticket.save()
+        incremental_counts = self.rollup_counts()
+
+        call_command("rebuild_ticket_rollups", stdout=StringIO())
+        self.assertEqual(self.rollup_counts(), incremental_counts)
+
+    def test_add_counts(self):
+        ticket = self.create_ticket()
+        resolved_key = ticket.get_rollup_key()[:-1] + ("Resolved",)
+        TicketRollup.objects.add_counts({ticket.get_rollup_key(): 2, resolved_key: 3})
+        today = timezone.localdate()
+        self.assertEqual(
+            self.rollup_counts(),
+            {(today, self.subcategory.id, "Open"): 3, (today, self.subcategory.id, "Resolved"): 3},
+        )
+
+    def test_top_categories(self):
+        self.create_ticket(category=self.hardware, subcategory=self.tablet)
+        self.create_ticket()
+        self.create_ticket(status=SupportTicket.Status.CLOSED)
+        with self.assertNumQueries(1):
+            top_categories = list(TicketRollup.objects.top("category__name"))
+        self.assertEqual(
+            top_categories,
+            [
+                {"category__name": "Software", "ticket_count": 2},
+                {"category__name": "Hardware", "ticket_count": 1},
+            ],
+        )
@@ -0,0 +1,88 @@
+from unittest import skipUnless
+
+from django.db import connection
+from techsupport.models import Category, SubCategory, SupportTicket, User
+from techsupport.search import get_search_backend, LikeSearchBackend, SQLiteSearchBackend
+from techsupport.tests.base import TicketTestCase
+
+
+class SearchBackendTestCase(TicketTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.user = User.objects.create_user(username="coach1", password="testpassword")
+        cls.hardware = Category.objects.create(name="Hardware", code="HW")
+        cls.tablet = SubCategory.objects.create(name="Tablet Issues", category=cls.hardware)
+        cls.tablet_ticket = cls.create_ticket(
+            title="Broken screen",
+            description="Broken screen",
+            category=cls.hardware,
+            subcategory=cls.tablet,
+        )
+        cls.kolibri_ticket = cls.create_ticket(title="Kolibri sync", description="Kolibri sync")
+
+    def search(self, query, **kwargs):
+        return list(get_search_backend().search(SupportTicket.objects.all(), query, **kwargs))
+
+    def test_sqlite_uses_fts5_backend(self):
+        if connection.vendor == "sqlite" and SQLiteSearchBackend.is_supported():
+            self.assertIsInstance(get_search_backend(), SQLiteSearchBackend)
+
+    @skipUnless(connection.vendor == "postgresql", "PostgreSQL only")
+    def test_postgres_search_vector_is_declared_on_the_model(self):
+        field = SupportTicket._meta.get_field("search_vector")
+        self.assertEqual(field.db_type(connection), "tsvector")
+        self.assertIn("ticket_search_gin", [index.name for index in SupportTicket._meta.indexes])
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(
+                cursor, SupportTicket._meta.db_table
+            )
+        self.assertEqual(constraints["ticket_search_gin"]["type"], "gin")
+
+    def test_search_by_prefix_of_title_and_related_names(self):
+        self.assertEqual(self.search("scre"), [self.tablet_ticket])
+        self.assertEqual(self.search("tablet"), [self.tablet_ticket])
+        self.assertCountEqual(self.search("lumezi"), [self.tablet_ticket, self.kolibri_ticket])
+        self.assertEqual(self.search("eastern kolibri"), [self.kolibri_ticket])
+        self.assertEqual(self.search("coach1 printer"), [])
+
+    def test_numeric_query_looks_up_ticket_number(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                self.search(str(self.kolibri_ticket.ticket_number)), [self.kolibri_ticket]
+            )
+
+    def test_index_is_updated_on_save_and_delete(self):
+        self.tablet_ticket.title = "Cracked charger"
+        self.tablet_ticket.save()
+        self.assertEqual(self.search("screen"), [])
+        self.assertEqual(self.search("charger"), [self.tablet_ticket])
+        self.tablet_ticket.delete()
+        self.assertEqual(self.search("charger"), [])
+
+    def test_index_follows_renamed_related_objects(self):
+        self.tablet.name = "Screen Issues"
+        self.tablet.save()
+        self.assertEqual(self.search("tablet"), [])
+        self.assertEqual(self.search("issues screen"), [self.tablet_ticket])
+
+        region = self.centre.region
+        region.name = "Northern Region"
+        region.save()
+        self.assertEqual(self.search("eastern"), [])
+        self.assertEqual(len(self.search("northern")), 2)
+
+        self.user.username = "coach9"
+        self.user.save()
+        self.assertEqual(len(self.search("coach9")), 2)
+
+    def test_ranking_orders_best_match_first(self):
+        other_ticket = self.create_ticket(title="Tablet charger", description="Tablet charger")
+        results = self.search("tablet", rank=True)
+        # The title match weighs more than the subcategory match
+        self.assertEqual(results, [other_ticket, self.tablet_ticket])
+
+    def test_like_backend_matches_all_terms(self):
+        backend = LikeSearchBackend(None)
+        results = backend.search(SupportTicket.objects.all(), "hardware lumezi")
+        self.assertEqual(list(results), [self.tablet_ticket])
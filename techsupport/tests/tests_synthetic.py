@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta, timezone
+from io import StringIO
+
+from django.core.management import call_command
+from django.db.models import Sum
+from django.test import SimpleTestCase, TestCase
+from techsupport.models import Centre, SupportTicket, TicketRollup, User
+from techsupport.synthetic import FIELDS, TicketPlan, generate_tickets, zipf_weights
+
+
+class GenerateDummyDataTestCase(TestCase):
+    def generate(self, *args):
+        stdout = StringIO()
+        call_command(
+            "generate_dummy_data", "--until=2024-06-01", *args, stdout=stdout, stderr=StringIO()
+        )
+        return stdout.getvalue()
+
+    def ticket_values(self):
+        return list(
+            SupportTicket.objects.order_by("ticket_number").values_list(*FIELDS[1:])
+        )
+
+    def test_scaled_dataset(self):
+        self.generate("--tickets=300", "--centres=30", "--users=60", "--seed=7", "--chunk-size=100")
+        self.assertEqual(Centre.objects.count(), 30)
+        self.assertEqual(User.objects.count(), 60)
+        self.assertEqual(SupportTicket.objects.count(), 300)
+        self.assertEqual(
+            SupportTicket.objects.values("ticket_number").distinct().count(), 300
+        )
+        self.assertEqual(TicketRollup.objects.aggregate(total=Sum("ticket_count"))["total"], 300)
+
+        # Old tickets are mostly resolved and few tickets are high priority
+        old_tickets = SupportTicket.objects.filter(date_submitted__lt=datetime(2024, 5, 1, tzinfo=timezone.utc))
+        resolved = old_tickets.filter(status__in=["Resolved", "Closed"]).count()
+        self.assertGreater(resolved, old_tickets.count() * 0.8)
+        self.assertLess(SupportTicket.objects.filter(priority="High").count(), 100)
+        for ticket in SupportTicket.objects.filter(status="Resolved"):
+            self.assertGreaterEqual(ticket.date_resolved, ticket.date_submitted)
+            self.assertEqual(ticket.resolved_by.role, "technician")
+
+    def test_same_seed_same_tickets(self):
+        self.generate("--tickets=50", "--seed=3", "--chunk-size=20")
+        first = self.ticket_values()
+        SupportTicket.objects.all().delete()
+        self.generate("--tickets=50", "--seed=3", "--chunk-size=20", "--workers=2")
+        self.assertEqual(self.ticket_values(), first)
+
+
+
+class GenerateTicketsTestCase(SimpleTestCase):
+    def setUp(self):
+        end = datetime(2024, 6, 1, tzinfo=timezone.utc)
+        self.plan = TicketPlan(
+            seed=1,
+            start=end - timedelta(days=30),
+            end=end,
+            centre_ids=["a", "b", "c"],
+            centre_weights=zipf_weights(3),
+            coaches_by_centre={"a": [1]},
+            coach_ids=[2, 3],
+            technician_ids=[4],
+            subcategories=[("x", "hardware"), ("y", "software")],
+            subcategory_weights=zipf_weights(2),
+        )
+
+    def test_chunks_are_reproducible(self):
+        self.assertEqual(generate_tickets(self.plan, 4, 10), generate_tickets(self.plan, 4, 10))
+        self.assertNotEqual(generate_tickets(self.plan, 4, 10), generate_tickets(self.plan, 5, 10))
+
+    def test_submitters_belong_to_the_centre(self):
+        for ticket in generate_tickets(self.plan, 0, 100):
+            values = dict(zip(FIELDS, ticket))
+            expected = [1] if values["centre_id"] == "a" else [2, 3]
+            self.assertIn(values["submitted_by_id"], expected)
+            self.assertTrue(self.plan.start <= values["date_submitted"] <= self.plan.end)
@@ -1,6 +1,17 @@
+from django.core.cache import cache
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
 from django.urls import reverse
-from techsupport.models import SupportTicket, User, Category, SubCategory, Centre
+from techsupport.models import (
+    SupportTicket,
+    User,
+    Category,
+    SubCategory,
+    Centre,
+    Country,
+    Region,
+)
 from uuid import uuid4
 import json
 from django.utils import timezone
@@ -22,6 +33,7 @@ class ViewsTestCase(TestCase):
         cls.user = User.objects.create_user(username="admin", password="admin123")
 
     def setUp(self):
+        cache.clear()
         # Log in the test user for each test
         self.client.login(username="admin", password="admin123")
 
@@ -43,3 +55,133 @@ class ViewsTestCase(TestCase):
 
         
 
+    def test_dashboard_ticket_statistics(self):
+        response = self.client.get(reverse("dashboard"))
+        self.assertEqual(response.context["ticket_statistics"]["total"], 0)
+
+    def test_all_tickets_ticket_statistics(self):
+        response = self.client.get(reverse("all_tickets"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["ticket_statistics"]["open"], 0)
+
+
+class TicketListQueriesTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="superadmin", password="admin123", role="super_admin"
+        )
+        cls.country = Country.objects.create(name="Zambia", code="ZM")
+        cls.region = Region.objects.create(name="Eastern Region", country=cls.country)
+        cls.centre = Centre.objects.create(
+            name="Lumezi Primary", acronym="LDL", region=cls.region
+        )
+        cls.category = Category.objects.create(name="Software", code="SW")
+        cls.subcategory = SubCategory.objects.create(
+            name="Kolibri Issue", category=cls.category
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client.login(username="superadmin", password="admin123")
+
+    def create_tickets(self, count):
+        for i in range(count):
+            SupportTicket.objects.create(
+                status=SupportTicket.Status.OPEN,
+                centre=self.centre,
+                submitted_by=self.user,
+                assigned_to=self.user,
+                category=self.category,
+                subcategory=self.subcategory,
+                description=f"Description {i}",
+                title=f"Title {i}",
+            )
+
+    def count_queries(self, method, url, data=None):
+        with CaptureQueriesContext(connection) as context:
+            response = getattr(self.client, method)(url, data)
+            # Consume streamed responses so that lazy queries are counted too
+            if response.streaming:
+                b"".join(response.streaming_content)
+            self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def assertConstantQueries(self, method, url, data=None):
+        self.create_tickets(1)
+        queries_for_one_ticket = self.count_queries(method, url, data)
+        self.create_tickets(9)
+        self.assertEqual(self.count_queries(method, url, data), queries_for_one_ticket)
+
+    def test_dashboard_queries_are_constant(self):
+        self.assertConstantQueries("get", reverse("dashboard"))
+
+    def test_open_tickets_queries_are_constant(self):
+        self.assertConstantQueries("get", reverse("open_tickets"))
+
+    def test_dashboard_invalid_cursor_shows_first_page(self):
+        self.create_tickets(1)
+        response = self.client.get(reverse("dashboard"), {"cursor": "invalid"})
+        self.assertEqual(len(response.context["paginated_tickets"]), 1)
+
+    def test_all_tickets_shows_submitter_username(self):
+        coach = User.objects.create_user(username="lumezi_coach", password="coach123")
+        SupportTicket.objects.create(
+            status=SupportTicket.Status.OPEN,
+            centre=self.centre,
+            submitted_by=coach,
+            assigned_to=self.user,
+            category=self.category,
+            subcategory=self.subcategory,
+            description="Description",
+            title="Title",
+        )
+        response = self.client.get(reverse("all_tickets"))
+        self.assertContains(response, "lumezi_coach")
+
+    def test_export_tickets_csv_queries_are_constant(self):
+        self.assertConstantQueries(
+            "post",
+            reverse("export_tickets_csv"),
+            {"start_date": "2000-01-01", "end_date": "2100-01-01"},
+        )
+
+    def test_export_tickets_csv_streams_visible_tickets(self):
+        self.create_tickets(2)
+        other_centre = Centre.objects.create(name="Zwelisha", acronym="ZWE", region=self.region)
+        coach = User.objects.create_user(username="coach", password="coach123", role="user")
+        coach.centres.add(other_centre)
+        SupportTicket.objects.create(
+            status=SupportTicket.Status.OPEN,
+            centre=other_centre,
+            submitted_by=coach,
+            category=self.category,
+            subcategory=self.subcategory,
+            description="Description",
+            title="Coach ticket",
+        )
+        data = {"start_date": "2000-01-01", "end_date": "2100-01-01"}
+
+        response = self.client.post(reverse("export_tickets_csv"), data)
+        self.assertTrue(response.streaming)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0].split(",")[:3], ["Ticket Number", "Date Submitted", "Status"])
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(lines[1].endswith(",Title 0,,superadmin"))
+
+        self.client.login(username="coach", password="coach123")
+        response = self.client.post(reverse("export_tickets_csv"), data)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertIn("Zwelisha,coach", lines[1])
+
+    def test_export_tickets_csv_rejects_invalid_dates(self):
+        for data in [
+            {"start_date": "", "end_date": "2100-01-01"},
+            {"start_date": "2000-01-01", "end_date": "2100-13-45"},
+        ]:
+            response = self.client.post(reverse("export_tickets_csv"), data)
+            self.assertFalse(response.streaming)
+            self.assertEqual(response.status_code, 200)
+            self.assertContains(response, "Please enter a valid start and end date.")
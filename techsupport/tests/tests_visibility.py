@@ -0,0 +1,96 @@
+import time
+from unittest import mock
+
+from django.urls import reverse
+from techsupport.models import Country, Region, Centre, User, SupportTicket
+from techsupport.tests.base import TicketTestCase
+from techsupport.visibility import (
+    ALL_CENTRES,
+    VISIBILITY_CACHE_TIMEOUT,
+    get_visible_centre_ids,
+)
+
+
+class VisibilityTestCase(TicketTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.south_africa = Country.objects.create(name="South Africa", code="ZA")
+        cls.mpumalanga = Region.objects.create(name="Mpumalanga", country=cls.south_africa)
+        cls.zwelisha = Centre.objects.create(name="Zwelisha", acronym="WRZ", region=cls.mpumalanga)
+
+        cls.coach = User.objects.create_user(username="coach", password="coach123")
+        cls.coach.centres.add(cls.centre)
+        cls.manager = User.objects.create_user(
+            username="manager", password="manager123", role="manager", country=cls.country
+        )
+        cls.technician = User.objects.create_user(
+            username="technician", password="tech123", role="technician"
+        )
+
+        cls.lumezi_ticket, cls.zwelisha_ticket = [
+            cls.create_ticket(centre=centre, submitted_by=cls.coach)
+            for centre in [cls.centre, cls.zwelisha]
+        ]
+
+    def test_tickets_visible_to_each_role(self):
+        self.assertEqual(list(SupportTicket.objects.visible_to(self.coach)), [self.lumezi_ticket])
+        self.assertEqual(list(SupportTicket.objects.visible_to(self.manager)), [self.lumezi_ticket])
+        self.assertCountEqual(
+            SupportTicket.objects.visible_to(self.technician),
+            [self.lumezi_ticket, self.zwelisha_ticket],
+        )
+
+    def test_visible_centres_are_cached(self):
+        self.assertEqual(get_visible_centre_ids(self.manager), [self.centre.id])
+        self.assertEqual(get_visible_centre_ids(self.technician), ALL_CENTRES)
+        with self.assertNumQueries(0):
+            get_visible_centre_ids(self.manager)
+            get_visible_centre_ids(self.technician)
+
+    def test_visible_centres_expire(self):
+        get_visible_centre_ids(self.manager)
+        later = time.time() + VISIBILITY_CACHE_TIMEOUT + 1
+        with mock.patch("time.time", return_value=later), self.assertNumQueries(1):
+            get_visible_centre_ids(self.manager)
+
+    def test_cache_is_invalidated_when_user_centres_change(self):
+        self.assertEqual(get_visible_centre_ids(self.coach), [self.centre.id])
+        self.coach.centres.add(self.zwelisha)
+        self.assertCountEqual(get_visible_centre_ids(self.coach), [self.centre.id, self.zwelisha.id])
+        self.zwelisha.users.remove(self.coach)
+        self.assertEqual(get_visible_centre_ids(self.coach), [self.centre.id])
+
+    def test_cache_is_invalidated_when_user_country_changes(self):
+        self.assertEqual(get_visible_centre_ids(self.manager), [self.centre.id])
+        self.manager.country = self.south_africa
+        self.manager.save()
+        self.assertEqual(get_visible_centre_ids(self.manager), [self.zwelisha.id])
+
+    def test_cache_is_invalidated_when_centres_change(self):
+        self.assertEqual(get_visible_centre_ids(self.manager), [self.centre.id])
+        self.zwelisha.region = self.region
+        self.zwelisha.save()
+        self.assertCountEqual(get_visible_centre_ids(self.manager), [self.centre.id, self.zwelisha.id])
+
+    def test_all_tickets_keeps_submitted_tickets_outside_scope(self):
+        self.client.login(username="coach", password="coach123")
+        response = self.client.get(reverse("all_tickets"))
+        self.assertCountEqual(
+            [row.id for row in response.context["user_and_centre_tickets"]],
+            [self.lumezi_ticket.id, self.zwelisha_ticket.id],
+        )
+
+        self.zwelisha_ticket.submitted_by = self.manager
+        self.zwelisha_ticket.save()
+        self.client.login(username="manager", password="manager123")
+        response = self.client.get(reverse("all_tickets"))
+        self.assertEqual(
+            [row.id for row in response.context["user_and_centre_tickets"]],
+            [self.zwelisha_ticket.id],
+        )
+
+    def test_ticket_details_hides_tickets_outside_scope(self):
+        self.client.login(username="coach", password="coach123")
+        response = self.client.get(reverse("ticket_details", args=[self.zwelisha_ticket.id]))
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,54 @@
+from io import StringIO
+
+import requests
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from techsupport.benchmark import stub_http_server
+from techsupport.webhooks import WebhookTransport
+
+
+class WebhookTransportTestCase(SimpleTestCase):
+    def test_post_reuses_connections(self):
+        with stub_http_server() as server:
+            transport = WebhookTransport()
+            for i in range(5):
+                transport.post(server.url, f'{{"text": "{i}"}}')
+            transport.close()
+        self.assertEqual(server.requests, 5)
+        self.assertEqual(server.connections, 1)
+        self.assertEqual(server.bodies[0], b'{"text": "0"}')
+
+        stats = transport.stats()
+        self.assertEqual((stats["sent"], stats["errors"]), (5, 0))
+        self.assertLessEqual(stats["p50"], stats["max"])
+
+    def test_read_timeout(self):
+        with stub_http_server(delay=0.5) as server:
+            transport = WebhookTransport(read_timeout=0.05)
+            with self.assertRaises(requests.Timeout):
+                transport.post(server.url, "{}")
+            transport.close()
+        self.assertEqual(transport.stats()["errors"], 1)
+
+    def test_error_status_raises(self):
+        with stub_http_server(status=500) as server:
+            transport = WebhookTransport()
+            errors = transport.send_many([(server.url, "{}")])
+            transport.close()
+        self.assertIsInstance(errors[0], requests.HTTPError)
+
+    def test_send_many_bounds_concurrency(self):
+        with stub_http_server(delay=0.02) as server:
+            transport = WebhookTransport(max_concurrency=3)
+            errors = transport.send_many([(server.url, "{}")] * 12)
+            transport.close()
+        self.assertEqual(errors, [None] * 12)
+        self.assertEqual(server.requests, 12)
+        self.assertLessEqual(server.max_in_flight, 3)
+        self.assertLessEqual(server.connections, 3)
+
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command("benchmark_webhooks", requests=5, delay=0, stdout=out)
+        self.assertIn("Unpooled:", out.getvalue())
+        self.assertIn("Pooled:", out.getvalue())
@@ -6,6 +6,7 @@ from .views import (
     profile,
     ticket_details,
     create_ticket,
+    bulk_update_tickets,
     all_tickets,
     # settings_view,
     assign_ticket,
@@ -13,7 +14,11 @@ from .views import (
     resolved_tickets,
     tickets_in_progress,
     get_subcategories,
+    api_tickets,
     export_tickets_csv,
+    export_job,
+    export_job_progress,
+    export_job_download,
 )
 from django.conf import settings
 from django.conf.urls.static import static
@@ -26,7 +31,11 @@ urlpatterns = [
     path("profile/", profile, name="profile"),
     path("ticket_details/<uuid:ticket_id>/", ticket_details, name="ticket_details"),
     path("create_ticket/", create_ticket, name="create_ticket"),
+    path("tickets/bulk_update/", bulk_update_tickets, name="bulk_update_tickets"),
     path("export_tickets_csv/", export_tickets_csv, name="export_tickets_csv"),
+    path("export_jobs/<uuid:job_id>/", export_job, name="export_job"),
+    path("export_jobs/<uuid:job_id>/progress/", export_job_progress, name="export_job_progress"),
+    path("export_jobs/<uuid:job_id>/download/", export_job_download, name="export_job_download"),
     path("all_tickets/", all_tickets, name="all_tickets"),
     # path("settings/", settings_view, name="settings"),
     path("assign_ticket/", assign_ticket, name="assign_ticket"),
@@ -34,6 +43,7 @@ urlpatterns = [
     path("resolved_tickets/", resolved_tickets, name="resolved_tickets"),
     path("tickets_in_progress/", tickets_in_progress, name="tickets_in_progress"),
     path("get_subcategories/", get_subcategories, name="get_subcategories"),
+    path("api/tickets/", api_tickets, name="api_tickets"),
 ]
 
 urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
@@ -1,14 +1,20 @@
 from django.shortcuts import render, redirect, get_object_or_404
-from django.http import JsonResponse, HttpResponse
+from django.http import Http404, JsonResponse, HttpResponse, StreamingHttpResponse
 from django.contrib import messages
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.views import LoginView
 from django.contrib.auth.models import Group
+from django.core.exceptions import PermissionDenied
+from django.urls import reverse
+from django.views.decorators.http import condition, require_POST
 from django.utils import timezone
-from django.db.models import Q, Count
-from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
+from django.utils.dateparse import parse_date
+from django.utils.http import url_has_allowed_host_and_scheme
+from django.db import transaction
+from django.db.models import Q
 from django.conf import settings
+from django.core.cache import cache
 import smtplib
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
@@ -18,7 +24,6 @@ from django.core.mail import send_mail
 import ssl
 import requests
 import logging
-import csv
 import uuid
 from .forms import (
     SupportTicketForm,
@@ -26,18 +31,65 @@ from .forms import (
     TicketResolutionForm,
     TicketAssignmentForm,
     TicketPriorityForm,
+    BulkTicketUpdateForm,
 )
 from .models import (
     Region,
     Centre,
     SubCategory,
     SupportTicket,
+    TicketRollup,
     Notification,
+    ExportJob,
     UserProfile,
     User,
 )
+from .downloads import ranged_file_response
+from .export_formats import EXPORT_FORMATS, get_export_format
+from .caching import (
+    DASHBOARD_CACHE_TIMEOUT,
+    get_dashboard_cache_key,
+    get_ticket_widgets_cache_key,
+)
+from .exports import get_export_rows, get_visibility_key, request_export
+from . import api, etags, reference
+from .pagination import CursorPage, CursorPaginator, InvalidCursor
+from .search import get_search_backend
+from .visibility import get_visible_centre_ids
 logger = logging.getLogger(__name__)
 
+TICKETS_PER_PAGE = 10
+
+
+def paginate_tickets(request, tickets, with_count=True):
+    """Return the page of tickets selected by the request's cursor."""
+    paginator = CursorPaginator(tickets, TICKETS_PER_PAGE, with_count=with_count)
+    try:
+        return paginator.page(request.GET.get("cursor"))
+    except InvalidCursor:
+        return paginator.page()
+
+
+def filter_tickets(tickets, params):
+    """
+    Filter tickets by the search query, status, region and centre names
+    given in the request parameters of the dashboard.
+    """
+    search_query = params.get("search_query", "").strip()
+    status = params.get("status")
+    selected_regions = params.getlist("region")
+    selected_centres = params.getlist("centre")
+
+    if search_query:
+        tickets = get_search_backend().search(tickets, search_query)
+    if status:
+        tickets = tickets.filter(status=status)
+    if selected_regions:
+        tickets = tickets.filter(centre__region__name__in=selected_regions)
+    if selected_centres:
+        tickets = tickets.filter(centre__name__in=selected_centres)
+    return tickets
+
 
 def user_login(request):
     error_message = None
@@ -61,13 +113,14 @@ def user_logout(request):
 
 
 @login_required
+@condition(etag_func=etags.dashboard_etag)
 def dashboard(request):
-    # Retrieve all support tickets
-    tickets = SupportTicket.objects.all().order_by("-date_submitted")
+    # Retrieve the support tickets visible to the user's role
+    tickets = SupportTicket.objects.visible_to(request.user).order_by("-date_submitted")
 
     # Retrieve user's role using custom user model
     user_role = None
-    user = User.objects.get(pk=request.user.pk)
+    user = request.user
     if user.is_super_admin():
         user_role = "super_admin"
     elif user.is_admin():
@@ -79,109 +132,64 @@ def dashboard(request):
     elif user.is_user():
         user_role = "user"
 
-    # Modify the tickets query based on the user's role
-    if user_role == "super_admin":
-        tickets = SupportTicket.objects.all()
-    elif user_role == "admin":
-        admin_country = request.user.country
-        admin_region = request.user.region
-        tickets = SupportTicket.objects.filter(
-            Q(centre__region__country=admin_country) |
-            Q(centre__region=admin_region)
-        )
-    elif user_role == "manager":
-        manager_country = request.user.country
-        manager_region = request.user.region
-        tickets = SupportTicket.objects.filter(
-            Q(centre__region__country=manager_country) |
-            Q(centre__region=manager_region)
-        )
-    elif user_role == "technician":
-        tickets = SupportTicket.objects.all()
-    elif user_role == "user":
-        user_centres = request.user.centres.all()
-        tickets = SupportTicket.objects.filter(centre__in=user_centres)
-
     # Retrieve search parameters from the request
     search_query = request.GET.get("search_query", "").strip()
-    status = request.GET.get("status")
-
-    if search_query:
-        tickets = tickets.filter(
-            Q(title__icontains=search_query)
-            | Q(category__name__icontains=search_query)
-            | Q(subcategory__name__icontains=search_query)
-            | Q(centre__name__icontains=search_query)
-            | Q(centre__region__name__icontains=search_query)
-            | Q(submitted_by__username__icontains=search_query)
-        )
-
-    if status:
-        tickets = tickets.filter(status=status)
-    
-    # retrieve ticket trends data
-    ticket_trends = SupportTicket.objects.values("category__name").annotate(
-        ticket_count=Count("id")
-    )
-
-    open_tickets_count = tickets.filter(status="Open").count()
-    in_progress_tickets_count = tickets.filter(status="In Progress").count()
-    resolved_tickets_count = tickets.filter(status="Resolved").count()
-
-    def get_ticket_insights():
-        common_ticket_trends = (
-            SupportTicket.objects.values("category__name")
-            .annotate(ticket_count=Count("id"))
-            .order_by("-ticket_count")[:5]
-        )
-        frequent_issues = (
-            SupportTicket.objects.values("subcategory__name")
-            .annotate(ticket_count=Count("id"))
-            .order_by("-ticket_count")[:5]
-        )
-        return {
-            "common_ticket_trends": common_ticket_trends,
-            "frequent_issues": frequent_issues,
+    selected_regions = request.GET.getlist("region")
+    selected_centres = request.GET.getlist("centre")
+    tickets = filter_tickets(tickets, request.GET)
+
+    # Reuse the dashboard data of users with the same visibility scope and
+    # parameters until a ticket in one of their centres changes
+    cache_key = get_dashboard_cache_key(get_visible_centre_ids(user), request.GET)
+    dashboard_data = cache.get(cache_key)
+    if dashboard_data is None:
+        # The status widgets already show the totals, so skip the COUNT query
+        page = paginate_tickets(request, tickets.list_rows(), with_count=False)
+        dashboard_data = {
+            # Count the tickets per status in a single query
+            "ticket_statistics": tickets.ticket_statistics(),
+            "page": (page.object_list, page.next_cursor, page.previous_cursor),
         }
+        cache.set(cache_key, dashboard_data, DASHBOARD_CACHE_TIMEOUT)
+
+    # The trends and insights sum the tickets of every centre, so they are
+    # cached apart from the data of the user's scope
+    widgets_cache_key = get_ticket_widgets_cache_key()
+    ticket_widgets = cache.get(widgets_cache_key)
+    if ticket_widgets is None:
+        ticket_widgets = {
+            # retrieve ticket trends data from the daily rollups
+            "ticket_trends": list(TicketRollup.objects.top("category__name", limit=None)),
+            "ticket_insights": {
+                "common_ticket_trends": list(TicketRollup.objects.top("category__name")),
+                "frequent_issues": list(TicketRollup.objects.top("subcategory__name")),
+            },
+        }
+        cache.set(widgets_cache_key, ticket_widgets, DASHBOARD_CACHE_TIMEOUT)
 
-    tickets_per_page = 10
-
-    paginator = Paginator(tickets, tickets_per_page)
-
-    page = request.GET.get("page")
-
-    try:
-        paginated_tickets = paginator.page(page)
-    except PageNotAnInteger:
-        paginated_tickets = paginator.page(1)
-    except EmptyPage:
-        paginated_tickets = paginator.page(paginator.num_pages)
+    object_list, next_cursor, previous_cursor = dashboard_data["page"]
+    # The tickets keep ageing while their rows are cached
+    now = timezone.now()
+    for row in object_list:
+        row.refresh_age(now)
+    paginator = CursorPaginator(tickets, TICKETS_PER_PAGE, with_count=False)
+    paginated_tickets = CursorPage(object_list, paginator, next_cursor, previous_cursor)
 
+    # The filter dropdowns come from the cached reference data
     if user_role == "technician" or "admin" or "super_admin":
-        regions = Region.objects.all()
-        centres = Centre.objects.all()
+        regions = reference.get_regions()
+        centres = reference.get_centres()
     else:
-        manager_country = request.user.country
-        regions = Region.objects.filter(country=manager_country)
-        centres = Centre.objects.filter(region__country=manager_country)
-
-    selected_regions = request.GET.getlist("region")
-    selected_centres = request.GET.getlist("centre")
-
-    if selected_regions:
-        tickets = tickets.filter(centre__region__name__in=selected_regions)
-    if selected_centres:
-        tickets = tickets.filter(centre__name__in=selected_centres)
+        regions = reference.get_regions(request.user.country_id)
+        centres = reference.get_centres(request.user.country_id)
 
     context = {
         "user_role": user_role,
         "tickets": tickets,
-        "open_tickets_count": open_tickets_count,
-        "in_progress_tickets_count": in_progress_tickets_count,
-        "resolved_tickets_count": resolved_tickets_count,
+        "ticket_statistics": dashboard_data["ticket_statistics"],
         "search_query": search_query,
-        "ticket_trends": ticket_trends,
-        "ticket_insights": get_ticket_insights(),
+        "ticket_trends": ticket_widgets["ticket_trends"],
+        "ticket_insights": ticket_widgets["ticket_insights"],
         "regions": regions,
         "centres": centres,
         "selected_regions": selected_regions,
@@ -195,52 +203,39 @@ def dashboard(request):
 def export_tickets_csv(request):
     # Define the time period for which you want to extract data
     if request.method == "POST":
-        start_date = request.POST.get("start_date")
-        end_date = request.POST.get("end_date")
+        # Validate the dates up front, as a streamed export cannot report an
+        # error once its headers are sent
+        try:
+            start_date = parse_date(request.POST.get("start_date") or "")
+            end_date = parse_date(request.POST.get("end_date") or "")
+        except ValueError:
+            start_date = end_date = None
+        if not (start_date and end_date):
+            messages.error(request, "Please enter a valid start and end date.")
+            return render(
+                request,
+                "support_ticket/export_tickets_csv.html",
+                {"export_formats": EXPORT_FORMATS},
+            )
 
-        tickets = SupportTicket.objects.filter(
-            date_submitted__range=(start_date, end_date)
+        # Long exports are written to a file by the run_export_jobs worker
+        if request.POST.get("background"):
+            job = request_export(
+                request.user, start_date, end_date, request.POST.get("format", "csv")
+            )
+            return redirect("export_job", job_id=job.id)
+
+        # Stream the rows as they are read so that memory use stays flat and
+        # the first bytes are sent straight away
+        export_format = get_export_format(request.POST.get("format", "csv"))
+        rows = get_export_rows(request.user, start_date, end_date)
+        response = StreamingHttpResponse(
+            export_format.iter_bytes(rows), content_type=export_format.content_type
         )
-
-        response = HttpResponse(content_type="text/csv")
-        response["Content-Disposition"] = 'attachment; filename="support_tickets.csv"'
-
-        csv_writer = csv.writer(response)
-        csv_writer.writerow(
-            [
-                "Ticket Number",
-                "Date Submitted",
-                "Status",
-                "Priority",
-                "Centre",
-                "Submitted By",
-                "Category",
-                "Subcategory",
-                "Description",
-                "Title",
-                "Resolution Notes",
-                "Assigned To",
-            ]
+        response["Content-Disposition"] = (
+            f'attachment; filename="support_tickets.{export_format.extension}"'
         )
 
-        # Write ticket data to the CSV file
-        for ticket in tickets:
-            csv_writer.writerow(
-                [
-                    ticket.ticket_number,
-                    ticket.date_submitted,
-                    ticket.status,
-                    ticket.priority,
-                    ticket.centre.name,
-                    ticket.submitted_by.username,
-                    ticket.category.name,
-                    ticket.subcategory.name,
-                    ticket.description,
-                    ticket.title,
-                    ticket.resolution_notes,
-                    ticket.assigned_to.username if ticket.assigned_to else "",
-                ]
-            )
         messages.success(request, "Support Ticket Data extracted successfully!")
 
         return response
@@ -248,7 +243,55 @@ def export_tickets_csv(request):
         # Provide an empty queryset for the initial GET request
         tickets = SupportTicket.objects.none()
 
-        return render(request, "support_ticket/export_tickets_csv.html")
+        return render(
+            request, "support_ticket/export_tickets_csv.html", {"export_formats": EXPORT_FORMATS}
+        )
+
+
+def get_export_job(request, job_id):
+    """Return an export job of the user, or of a user who sees the same tickets."""
+    job = get_object_or_404(ExportJob, id=job_id)
+    if job.requested_by_id != request.user.pk and job.visibility_key != get_visibility_key(
+        request.user
+    ):
+        raise Http404("No ExportJob matches the given query.")
+    return job
+
+
+@login_required
+def export_job(request, job_id):
+    job = get_export_job(request, job_id)
+    return render(request, "support_ticket/export_job.html", {"job": job})
+
+
+@login_required
+def export_job_progress(request, job_id):
+    job = get_export_job(request, job_id)
+    data = {
+        "status": job.status,
+        "rows_written": job.rows_written,
+        "total_rows": job.total_rows,
+        "progress": job.progress,
+        "download_url": None,
+    }
+    if job.status == ExportJob.Status.FINISHED:
+        data["download_url"] = reverse("export_job_download", args=[job.id])
+    return JsonResponse(data)
+
+
+@login_required
+def export_job_download(request, job_id):
+    job = get_export_job(request, job_id)
+    if job.status != ExportJob.Status.FINISHED or not job.file:
+        raise Http404("The export is not ready yet.")
+    export_format = get_export_format(job.format)
+    filename = f"support_tickets_{job.start_date}_{job.end_date}.{export_format.extension}"
+    content_type = export_format.content_type
+    if export_format.compress:
+        filename += ".gz"
+        content_type = "application/gzip"
+    # The file of a job never changes, so its id identifies the content
+    return ranged_file_response(request, job.file.path, content_type, filename, etag=f'"{job.id}"')
 
 
 @login_required
@@ -268,8 +311,11 @@ def profile(request):
 
 
 @login_required
+@condition(etag_func=etags.ticket_etag, last_modified_func=etags.ticket_last_modified)
 def ticket_details(request, ticket_id):
-    ticket = get_object_or_404(SupportTicket, id=ticket_id)
+    ticket = get_object_or_404(
+        SupportTicket.objects.visible_to(request.user).list_projection(), id=ticket_id
+    )
     form_resolution = None
     form_assignment = None
     form_priority = None
@@ -286,13 +332,14 @@ def ticket_details(request, ticket_id):
             if form_assignment.is_valid():
                 assigned_to = form_assignment.cleaned_data["assigned_to"]
                 ticket.assigned_to = assigned_to
-                ticket.save()
+                with transaction.atomic():
+                    ticket.save()
 
-                # Send an email when the ticket is assigned to a technician
-                Notification.send_email_notification(ticket, Notification.MessageType.ASSIGNMENT)
+                    # Send an email when the ticket is assigned to a technician
+                    Notification.send_email_notification(ticket, Notification.MessageType.ASSIGNMENT)
 
-                # Send the webhook message when a ticket is assigned
-                Notification.send_webhook_notification(ticket, Notification.MessageType.ASSIGNMENT, request.user)
+                    # Send the webhook message when a ticket is assigned
+                    Notification.send_webhook_notification(ticket, Notification.MessageType.ASSIGNMENT, request.user)
 
                 messages.info(request, "Support ticket has been assigned.")
                 return redirect("dashboard")
@@ -301,26 +348,28 @@ def ticket_details(request, ticket_id):
             if form_resolution.is_valid():
                 ticket = form_resolution.save(commit=False)
                 status = form_resolution.cleaned_data.get("status")
-                if status == "Resolved":
-                    ticket.status = "Resolved"
-                    ticket.resolved_by = request.user
+                with transaction.atomic():
+                    if status == "Resolved":
+                        ticket.status = "Resolved"
+                        ticket.resolved_by = request.user
 
-                    # Send an email when the ticket is resolved
-                    Notification.send_email_notification(ticket, Notification.MessageType.RESOLUTION)
+                        # Send an email when the ticket is resolved
+                        Notification.send_email_notification(ticket, Notification.MessageType.RESOLUTION)
 
-                    # Send the webhook message when the status changes to 'Resolved'
-                    Notification.send_webhook_notification(ticket, Notification.MessageType.RESOLUTION, request.user)
+                        # Send the webhook message when the status changes to 'Resolved'
+                        Notification.send_webhook_notification(ticket, Notification.MessageType.RESOLUTION, request.user)
 
-                ticket.save()
+                    ticket.save()
                 messages.info(request, "Support ticket status has been updated.")
                 return redirect("dashboard")
 
             form_priority = TicketPriorityForm(request.POST, instance=ticket)
             if form_priority.is_valid():
-                form_priority.save()
+                with transaction.atomic():
+                    form_priority.save()
 
-                # Send the webhook message when ticket priority is changed
-                Notification.send_webhook_notification(ticket, Notification.MessageType.STATUS_CHANGE, request.user)
+                    # Send the webhook message when ticket priority is changed
+                    Notification.send_webhook_notification(ticket, Notification.MessageType.STATUS_CHANGE, request.user)
 
                 messages.info(request, "Support ticket priority has been updated.")
                 return redirect("dashboard")
@@ -353,6 +402,27 @@ def ticket_details(request, ticket_id):
     return render(request, "support_ticket/ticket_details.html", context)
 
 
+@login_required
+@require_POST
+def bulk_update_tickets(request):
+    """Assign, re-prioritise or change the status of the selected tickets at once."""
+    if request.user.role not in ["technician", "admin", "super_admin"]:
+        raise PermissionDenied
+
+    form = BulkTicketUpdateForm(request.POST, user=request.user)
+    if form.is_valid():
+        changed = form.save(request.user)
+        messages.info(request, f"{changed} support tickets have been updated.")
+    else:
+        for errors in form.errors.values():
+            messages.error(request, " ".join(errors))
+
+    next_url = request.POST.get("next")
+    if not url_has_allowed_host_and_scheme(next_url, allowed_hosts={request.get_host()}):
+        next_url = reverse("dashboard")
+    return redirect(next_url)
+
+
 @login_required
 def create_ticket(request):
     form = SupportTicketForm(request.POST or None, user=request.user)
@@ -360,13 +430,17 @@ def create_ticket(request):
     if request.method == "POST" and form.is_valid():
         support_ticket = form.save(commit=False)
         support_ticket.submitted_by = request.user
-        support_ticket.save()
 
-        # Send email notification
-        Notification.send_email_notification(support_ticket, Notification.MessageType.TICKET_CREATION)
+        # Save the ticket and queue its notifications in one transaction; the
+        # deliver_notifications worker sends them
+        with transaction.atomic():
+            support_ticket.save()
 
-        # Send webhook notification
-        Notification.send_webhook_notification(support_ticket, Notification.MessageType.TICKET_CREATION, request.user)
+            # Send email notification
+            Notification.send_email_notification(support_ticket, Notification.MessageType.TICKET_CREATION)
+
+            # Send webhook notification
+            Notification.send_webhook_notification(support_ticket, Notification.MessageType.TICKET_CREATION, request.user)
 
         messages.success(request, "Support ticket created successfully.")
         return redirect("dashboard")
@@ -377,6 +451,7 @@ def create_ticket(request):
 
 
 @login_required
+@condition(etag_func=etags.subcategories_etag)
 def get_subcategories(request):
     category_id = request.GET.get("category_id")
 
@@ -389,10 +464,49 @@ def get_subcategories(request):
     except (TypeError, ValueError):
         return JsonResponse({"subcategories": []})
 
-    subcategories = SubCategory.objects.filter(category_id=category_id).values(
-        "id", "name"
+    subcategories = [
+        {"id": subcategory.id, "name": subcategory.name}
+        for subcategory in reference.get_subcategories(category_id)
+    ]
+    return JsonResponse({"subcategories": subcategories})
+
+
+@login_required
+def api_tickets(request):
+    """
+    Return a page of the tickets visible to the user as JSON. The fields
+    parameter chooses the returned fields, limit the page size and cursor
+    the page; the tickets are filtered like the dashboard.
+    """
+    try:
+        fields = api.parse_fields(request.GET.get("fields"))
+    except api.InvalidFields as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    tickets = filter_tickets(SupportTicket.objects.visible_to(request.user), request.GET)
+    paginator = CursorPaginator(
+        api.project(tickets, fields),
+        api.parse_page_size(request.GET.get("limit")),
+        with_count=False,
     )
-    return JsonResponse({"subcategories": list(subcategories)})
+    try:
+        page = paginator.page(request.GET.get("cursor"))
+    except InvalidCursor:
+        return JsonResponse({"error": "Invalid cursor"}, status=400)
+
+    def page_url(cursor):
+        if cursor is None:
+            return None
+        params = request.GET.copy()
+        params["cursor"] = cursor
+        return f"{request.path}?{params.urlencode()}"
+
+    data = {
+        "results": api.serialize_rows(page, fields),
+        "next": page_url(page.next_cursor),
+        "previous": page_url(page.previous_cursor),
+    }
+    return JsonResponse(data, json_dumps_params=api.JSON_DUMPS_PARAMS)
 
 
 @login_required
@@ -400,40 +514,24 @@ def all_tickets(request):
     user = request.user
     context = {}
 
-    if user.is_user():
-        # If the user is a regular user, filter tickets based on their assigned center
-        user_tickets = user.submitted_issues.all()
-        center = user.centres.first()
-        
-        # Fetch all tickets at the user's center (including those submitted by others)
-        centre_tickets = SupportTicket.objects.filter(centre=center)
-        
-        # Combine the user's tickets and center tickets into a single queryset
-        user_and_centre_tickets = user_tickets | centre_tickets
-    elif user.is_technician():
-        # If the user is a technician, they should only see tickets assigned to them and submitted by them
-        user_and_centre_tickets = SupportTicket.objects.filter(assigned_to=user, submitted_by=user)
-    elif user.is_manager():
-        # If the user is a manager, they should only see tickets submitted by them
-        user_and_centre_tickets = SupportTicket.objects.filter(submitted_by=user)
-    elif user.is_admin():
-        # If the user is an admin, they should only see tickets submitted by them
-        user_and_centre_tickets = SupportTicket.objects.filter(submitted_by=user)
-    else:
-        # Handle other roles as needed
-        user_and_centre_tickets = None
+    # Start from the tickets visible to the user's role, and the tickets they
+    # submitted at any centre
+    visible_tickets = SupportTicket.objects.visible_to(user)
+    user_and_centre_tickets = visible_tickets | SupportTicket.objects.filter(submitted_by=user)
 
-    total_tickets_count = user_and_centre_tickets.count()
-    open_tickets_count = user_and_centre_tickets.filter(status="Open").count()
-    in_progress_tickets_count = user_and_centre_tickets.filter(status="In Progress").count()
-    resolved_tickets_count = user_and_centre_tickets.filter(status="Resolved").count()
+    if user.role != User.RoleType.USER:
+        # Users above the user role only see the tickets they submitted or
+        # that are assigned to them
+        user_and_centre_tickets = user_and_centre_tickets.filter(
+            Q(submitted_by=user) | Q(assigned_to=user)
+        )
+
+    # Count the tickets per status in a single query
+    ticket_statistics = user_and_centre_tickets.ticket_statistics()
 
     context.update({
-        "user_and_centre_tickets": user_and_centre_tickets,
-        "total_tickets_count": total_tickets_count,
-        "open_tickets_count": open_tickets_count,
-        "in_progress_tickets_count": in_progress_tickets_count,
-        "resolved_tickets_count": resolved_tickets_count,
+        "user_and_centre_tickets": paginate_tickets(request, user_and_centre_tickets.list_rows()),
+        "ticket_statistics": ticket_statistics,
     })
 
     return render(request, "support_ticket/all_tickets.html", context)
@@ -480,22 +578,39 @@ def assign_ticket(request, ticket_id):
         return render(request, "support_ticket/assign_ticket.html", context)
 
 
+@login_required
 def open_tickets(request):
     # Retrieve open tickets from the database
-    tickets = SupportTicket.objects.filter(status="Open")
-    context = {"tickets": tickets}
+    tickets = (
+        SupportTicket.objects.visible_to(request.user)
+        .filter(status="Open")
+        .list_rows()
+    )
+    context = {"tickets": paginate_tickets(request, tickets)}
     return render(request, "support_ticket/open_tickets.html", context)
 
 
+@login_required
 def resolved_tickets(request):
     # Retrieve resolved tickets from the database
-    tickets = SupportTicket.objects.filter(status="Resolved")
-    context = {"tickets": tickets}
+    tickets = (
+        SupportTicket.objects.visible_to(request.user)
+        .filter(status="Resolved")
+        .list_rows()
+    )
+    context = {"tickets": paginate_tickets(request, tickets)}
     return render(request, "support_ticket/resolved_tickets.html", context)
 
 
+@login_required
 def tickets_in_progress(request):
-    tickets = SupportTicket.objects.filter(status="In Progress")
+    tickets = (
+        SupportTicket.objects.visible_to(request.user)
+        .filter(status="In Progress")
+        .list_rows()
+    )
     return render(
-        request, "support_ticket/tickets_in_progress.html", {"tickets": tickets}
+        request,
+        "support_ticket/tickets_in_progress.html",
+        {"tickets": paginate_tickets(request, tickets)},
     )
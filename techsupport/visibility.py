@@ -0,0 +1,73 @@
+from django.core.cache import cache
+from django.db.models import Q
+
+# Marker cached for users who can see the tickets of every centre
+ALL_CENTRES = "all"
+
+# Seconds the visible centres of a user are kept in the cache
+VISIBILITY_CACHE_TIMEOUT = 5 * 60
+
+GENERATION_KEY = "techsupport:visibility:generation"
+
+
+def get_generation():
+    """
+    Return the current generation of the centre hierarchy. It is bumped
+    whenever a centre or region changes, which invalidates the visible
+    centres cached for every user at once.
+    """
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, 1, None)
+        generation = cache.get(GENERATION_KEY, 1)
+    return generation
+
+
+def bump_generation():
+    """Invalidate the visible centres cached for every user."""
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.add(GENERATION_KEY, 1, None)
+
+
+def _cache_key(user_id):
+    return f"techsupport:visibility:{get_generation()}:{user_id}"
+
+
+def invalidate_user(user_id):
+    """Invalidate the visible centres cached for a single user."""
+    cache.delete(_cache_key(user_id))
+
+
+def _resolve_visible_centre_ids(user):
+    """Work out which centres' tickets the user is allowed to see."""
+    from .models import Centre, User
+
+    if user.role in [User.RoleType.SUPER_ADMIN, User.RoleType.TECHNICIAN]:
+        return ALL_CENTRES
+    if user.role in [User.RoleType.ADMIN, User.RoleType.MANAGER]:
+        centres = Centre.objects.filter(
+            Q(region__country_id=user.country_id) | Q(region_id=user.region_id)
+        )
+    else:
+        centres = user.centres.all()
+    return sorted(centres.values_list("id", flat=True))
+
+
+def get_visible_centre_ids(user):
+    """
+    Return the ids of the centres whose tickets the user can see, or
+    ALL_CENTRES when the user can see the tickets of every centre. The
+    result is cached per user until their centres, country, region or role
+    change, the centre hierarchy changes or VISIBILITY_CACHE_TIMEOUT passes.
+    """
+    if not user.is_authenticated or not user.is_active:
+        return []
+
+    key = _cache_key(user.pk)
+    centre_ids = cache.get(key)
+    if centre_ids is None:
+        centre_ids = _resolve_visible_centre_ids(user)
+        cache.set(key, centre_ids, VISIBILITY_CACHE_TIMEOUT)
+    return centre_ids
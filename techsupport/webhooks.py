@@ -0,0 +1,123 @@
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+from .stats import summarize
+
+logger = logging.getLogger(__name__)
+
+# Number of recent request latencies kept for the transport statistics
+LATENCY_SAMPLES = 1000
+
+
+class WebhookTransport:
+    """
+    Shared HTTP client for delivering webhooks.
+
+    Requests go through a single keep-alive session whose connection pool
+    holds up to max_concurrency connections per host, so consecutive webhooks
+    to the same endpoint reuse an open TCP/TLS connection. Every request is
+    bounded by a connect and a read timeout, so a hung endpoint cannot block
+    a worker forever, and the latency of each request is recorded.
+    """
+
+    def __init__(self, connect_timeout=3.05, read_timeout=10, max_concurrency=4):
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_concurrency = max(int(max_concurrency), 1)
+        self.session = requests.Session()
+        self.session.headers["Content-Type"] = "application/json; charset=UTF-8"
+        adapter = HTTPAdapter(
+            pool_connections=self.max_concurrency,
+            pool_maxsize=self.max_concurrency,
+            pool_block=True,
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._latencies = deque(maxlen=LATENCY_SAMPLES)
+        self._lock = threading.Lock()
+        self.sent = 0
+        self.errors = 0
+
+    def post(self, url, body):
+        """
+        Post a JSON body to url and return the response. Raises a
+        requests.RequestException when the request fails or the endpoint
+        answers with an error status.
+        """
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        with self._slots:
+            start = time.perf_counter()
+            try:
+                response = self.session.post(url, data=body, timeout=self.timeout)
+                response.raise_for_status()
+            except requests.RequestException:
+                self._record(time.perf_counter() - start, failed=True)
+                raise
+            self._record(time.perf_counter() - start)
+        return response
+
+    def send_many(self, requests_to_send):
+        """
+        Post a list of (url, body) pairs, at most max_concurrency at a time.
+        Returns the exception raised by each request, or None when it
+        succeeded, in the order of the requests.
+        """
+
+        def send(request):
+            try:
+                self.post(*request)
+            except requests.RequestException as e:
+                return e
+            return None
+
+        requests_to_send = list(requests_to_send)
+        if len(requests_to_send) <= 1:
+            return [send(request) for request in requests_to_send]
+        workers = min(self.max_concurrency, len(requests_to_send))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(send, requests_to_send))
+
+    def _record(self, latency, failed=False):
+        with self._lock:
+            self._latencies.append(latency)
+            if failed:
+                self.errors += 1
+            else:
+                self.sent += 1
+        logger.debug(f"Webhook request took {latency * 1000:.1f}ms")
+
+    def stats(self):
+        """Return the request counts and the latency of recent requests in seconds."""
+        with self._lock:
+            latencies = list(self._latencies)
+            stats = {"sent": self.sent, "errors": self.errors}
+        stats.update(summarize(latencies))
+        return stats
+
+    def close(self):
+        self.session.close()
+
+
+_transport = None
+_transport_lock = threading.Lock()
+
+
+def get_webhook_transport():
+    """Return the per-process webhook transport configured in the settings."""
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = WebhookTransport(
+                connect_timeout=getattr(settings, "WEBHOOK_CONNECT_TIMEOUT", 3.05),
+                read_timeout=getattr(settings, "WEBHOOK_READ_TIMEOUT", 10),
+                max_concurrency=getattr(settings, "WEBHOOK_MAX_CONCURRENCY", 4),
+            )
+        return _transport
@@ -64,12 +64,13 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    "django.middleware.cache.UpdateCacheMiddleware",
-    "django.middleware.common.CommonMiddleware",
-    "django.middleware.cache.FetchFromCacheMiddleware",
 ]
 
-CACHE_MIDDLEWARE_SECONDS = 0
+# Cache shared by the processes of a deployment, e.g. memcache:// or
+# rediscache://, or filecache:///var/tmp/techsupport on a single host. The
+# default in-memory cache is private to each process.
+CACHES = {"default": env.cache_url("TSUPPORT_CACHE_URL", default="locmemcache://")}
+
 ROOT_URLCONF = "techsupport_management.urls"
 
 TEMPLATES = [
@@ -185,6 +186,11 @@ STATICFILES_DIRS = [
 
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 
+# Background ticket exports are reused for identical requests made within
+# EXPORT_CACHE_TIMEOUT seconds and deleted after EXPORT_RETENTION seconds
+EXPORT_CACHE_TIMEOUT = env.int("EXPORT_CACHE_TIMEOUT", default=60 * 60)
+EXPORT_RETENTION = env.int("EXPORT_RETENTION", default=24 * 60 * 60)
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/3.2/ref/settings/#default-auto-field
 
@@ -198,9 +204,26 @@ AUTHENTICATION_BACKENDS = [
 ]
 
 
+# Number of support ticket numbers each worker reserves at a time. Values
+# above 1 save a database round trip per ticket but leave gaps in the
+# numbering when a worker exits before using up its block.
+TICKET_NUMBER_BLOCK_SIZE = env.int("TICKET_NUMBER_BLOCK_SIZE", default=1)
+
 # Webhook URL to post notifications on Google Chat
 WEB_HOOK_URL = env("GOOGLE_CHAT_WEB_HOOK_URL")
 
+# Webhook delivery: connect and read timeouts in seconds, and the number of
+# webhooks sent at once over the pooled keep-alive connections
+WEBHOOK_CONNECT_TIMEOUT = env.float("WEBHOOK_CONNECT_TIMEOUT", default=3.05)
+WEBHOOK_READ_TIMEOUT = env.float("WEBHOOK_READ_TIMEOUT", default=10)
+WEBHOOK_MAX_CONCURRENCY = env.int("WEBHOOK_MAX_CONCURRENCY", default=4)
+
+# Notifications about the same ticket and recipient within this many seconds
+# are merged into one message. When the digest interval is set, each
+# recipient instead gets one summary of all their notifications per interval.
+NOTIFICATION_COALESCE_WINDOW = env.int("NOTIFICATION_COALESCE_WINDOW", default=30)
+NOTIFICATION_DIGEST_INTERVAL = env.int("NOTIFICATION_DIGEST_INTERVAL", default=0)
+
 # Email settings for Gmail
 EMAIL_BACKEND = env("EMAIL_BACKEND")
 EMAIL_HOST = env("EMAIL_HOST")